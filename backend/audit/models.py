@@ -17,5 +17,13 @@ class AuditLog(models.Model):
     details = models.TextField(blank=True)
     timestamp = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Dashboard: actions within a time range
+            models.Index(fields=['action', 'timestamp'], name='audit_action_ts_idx'),
+            # Professional history, newest first
+            models.Index(fields=['target_model', 'target_id', 'timestamp'], name='audit_target_ts_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user} - {self.action} - {self.timestamp}"
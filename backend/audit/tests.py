@@ -1,3 +1,42 @@
-from django.test import TestCase
+import pytest
+from datetime import timedelta
+from django.utils import timezone
+from audit.models import AuditLog
 
-# Create your tests here.
+
+def make_logs(count=50):
+    AuditLog.objects.bulk_create([
+        AuditLog(
+            action=['CREATE', 'STATUS_CHANGE', 'UPDATE', 'VIEW'][i % 4],
+            target_model='Professional',
+            target_id=str(i % 10),
+        )
+        for i in range(count)
+    ])
+
+@pytest.mark.django_db
+class TestAuditQueryPlans:
+    def test_analyzed_this_month_uses_action_timestamp_index(self):
+        from professionals.dashboard import analyzed_logs
+        make_logs()
+        plan = analyzed_logs(timezone.now()).explain()
+        assert 'audit_action_ts_idx' in plan
+
+    def test_history_uses_target_timestamp_index(self):
+        make_logs()
+        plan = AuditLog.objects.filter(
+            target_model='Professional', target_id='3'
+        ).order_by('-timestamp').explain()
+        assert 'audit_target_ts_idx' in plan
+
+    def test_analyzed_this_month_range_is_half_open(self):
+        from professionals.dashboard import analyzed_logs, month_starts
+        now = timezone.now()
+        month_start, next_month_start = month_starts(now, now)
+        make_logs(4)
+        AuditLog.objects.filter(action='STATUS_CHANGE').update(timestamp=month_start)
+        AuditLog.objects.filter(action='UPDATE').update(timestamp=next_month_start)
+        AuditLog.objects.filter(action='CREATE').update(timestamp=month_start - timedelta(microseconds=1))
+
+        logs = analyzed_logs(now)
+        assert list(logs.values_list('action', flat=True)) == ['STATUS_CHANGE']
@@ -194,9 +194,81 @@ CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
         'LOCATION': 'unique-snowflake',
-    }
+    },
+    # CNPJ lookups (CNPJ_CACHE_ALIAS). LocMemCache is per process: with several gunicorn workers
+    # the validate-cnpj call and the registration submit may land on different workers and look
+    # the CNPJ up twice. Point it at a shared backend in production, e.g.
+    # CNPJ_CACHE_BACKEND=django.core.cache.backends.db.DatabaseCache CNPJ_CACHE_LOCATION=cnpj_cache
+    # (after `manage.py createcachetable`) or django.core.cache.backends.redis.RedisCache.
+    'cnpj': {
+        'BACKEND': os.environ.get('CNPJ_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CNPJ_CACHE_LOCATION', 'cnpj-lookups'),
+    },
 }
 
+# Admin dashboard payload cache (invalidated on professional / status-change writes)
+DASHBOARD_CACHE_TTL = int(os.environ.get('DASHBOARD_CACHE_TTL', 30)) # seconds
+# dashboard-stats service: incremental rollup refresh interval and full rebuild interval
+DASHBOARD_STATS_REFRESH_SECONDS = int(os.environ.get('DASHBOARD_STATS_REFRESH_SECONDS', 300))
+DASHBOARD_STATS_FULL_REFRESH_SECONDS = int(os.environ.get('DASHBOARD_STATS_FULL_REFRESH_SECONDS', 24 * 3600))
+
+# Background exports: identical filter sets reuse a finished artifact within this window
+EXPORT_JOB_REUSE_SECONDS = int(os.environ.get('EXPORT_JOB_REUSE_SECONDS', 600))
+EXPORT_WORKER_POLL_SECONDS = int(os.environ.get('EXPORT_WORKER_POLL_SECONDS', 5))
+# A job pending or running for longer is treated as abandoned: not reused, and claimed again by a worker
+EXPORT_JOB_TIMEOUT_SECONDS = int(os.environ.get('EXPORT_JOB_TIMEOUT_SECONDS', 30 * 60))
+
+# CNPJ lookup cache: active companies for hours, NOT_FOUND / inactive situations for less.
+# Transient failures (TIMEOUT, ERROR, EXCEPTION) are never cached.
+CNPJ_CACHE_TTL_ACTIVE = int(os.environ.get('CNPJ_CACHE_TTL_ACTIVE', 6 * 3600)) # seconds
+CNPJ_CACHE_TTL_NEGATIVE = int(os.environ.get('CNPJ_CACHE_TTL_NEGATIVE', 30 * 60)) # seconds
+CNPJ_CACHE_ALIAS = os.environ.get('CNPJ_CACHE_ALIAS', 'cnpj')
+
+# BrasilAPI client: pooled keep-alive connections and a circuit breaker that fails fast
+# after consecutive timeouts / 5xx instead of holding every registration for the timeout
+CNPJ_PROVIDER_TIMEOUT = float(os.environ.get('CNPJ_PROVIDER_TIMEOUT', 5)) # seconds
+CNPJ_HTTP_POOL_SIZE = int(os.environ.get('CNPJ_HTTP_POOL_SIZE', 10))
+CNPJ_CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get('CNPJ_CIRCUIT_FAILURE_THRESHOLD', 5))
+CNPJ_CIRCUIT_RESET_SECONDS = float(os.environ.get('CNPJ_CIRCUIT_RESET_SECONDS', 30))
+
+# Ordered CNPJ providers (comma-separated import paths). With more than one, a lookup
+# that has not answered within CNPJ_HEDGE_AFTER_SECONDS is also sent to the next provider.
+CNPJ_PROVIDERS = os.environ.get(
+    'CNPJ_PROVIDERS', 'core.services.cnpj.providers.BrasilAPICNPJProvider'
+).split(',')
+CNPJ_HEDGE_AFTER_SECONDS = float(os.environ.get('CNPJ_HEDGE_AFTER_SECONDS', 0.8))
+CNPJ_HEDGE_MAX_WORKERS = int(os.environ.get('CNPJ_HEDGE_MAX_WORKERS', 16))
+
+# Local Receita snapshot (ingest_cnpj_snapshot) read by LocalSnapshotCNPJProvider. Misses are
+# transient by default so a hedged chain falls through to an online provider.
+CNPJ_SNAPSHOT_PATH = os.environ.get('CNPJ_SNAPSHOT_PATH', str(BASE_DIR / 'var' / 'cnpj_snapshot.bin'))
+CNPJ_SNAPSHOT_AUTHORITATIVE_MISSES = os.environ.get('CNPJ_SNAPSHOT_AUTHORITATIVE_MISSES', 'False') == 'True'
+
+# Admin bulk validation (validate-cnpj/bulk/): parallel lookups per request and list size cap.
+# Bulk runs use their own provider circuit breakers; keep the concurrency low so they do not
+# eat the provider rate budget of public registrations.
+CNPJ_BULK_CONCURRENCY = int(os.environ.get('CNPJ_BULK_CONCURRENCY', 3))
+CNPJ_BULK_MAX_ITEMS = int(os.environ.get('CNPJ_BULK_MAX_ITEMS', 5000))
+
+# Direct-to-S3 document uploads (documents/presign/ + documents/finalize/)
+DOCUMENT_PRESIGN_EXPIRES_SECONDS = int(os.environ.get('DOCUMENT_PRESIGN_EXPIRES_SECONDS', 600))
+
+# Document file layout: 'per_professional' (documents/<shard>/<professional id>/<file>) or 'content_addressed', where
+# identical uploads share one blob (documents/blobs/<aa>/<sha256>) and gc_document_blobs removes
+# blobs left unreferenced for DOCUMENT_BLOB_GC_GRACE_SECONDS
+DOCUMENT_STORAGE_LAYOUT = os.environ.get('DOCUMENT_STORAGE_LAYOUT', 'per_professional')
+DOCUMENT_BLOB_GC_GRACE_SECONDS = int(os.environ.get('DOCUMENT_BLOB_GC_GRACE_SECONDS', 24 * 3600))
+
+# Image document variants (process_document_variants): longest side in pixels and thumbnail format
+DOCUMENT_PREVIEW_MAX_SIDE = int(os.environ.get('DOCUMENT_PREVIEW_MAX_SIDE', 1600))
+DOCUMENT_THUMBNAIL_MAX_SIDE = int(os.environ.get('DOCUMENT_THUMBNAIL_MAX_SIDE', 320))
+DOCUMENT_THUMBNAIL_FORMAT = os.environ.get('DOCUMENT_THUMBNAIL_FORMAT', 'WEBP') # WEBP or JPEG
+DOCUMENT_VARIANTS_POLL_SECONDS = int(os.environ.get('DOCUMENT_VARIANTS_POLL_SECONDS', 5))
+# Documents left PROCESSING longer than this (dead worker) are claimed again
+DOCUMENT_VARIANTS_TIMEOUT_SECONDS = int(os.environ.get('DOCUMENT_VARIANTS_TIMEOUT_SECONDS', 10 * 60))
+# Images decoding to more pixels than this are not rendered (decompression bombs in anonymous uploads)
+DOCUMENT_VARIANTS_MAX_PIXELS = int(os.environ.get('DOCUMENT_VARIANTS_MAX_PIXELS', 50_000_000))
+
 # JWT Config
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
@@ -0,0 +1,59 @@
+import pytest
+from django.core.cache import caches
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Cached payloads (dashboard, CNPJ lookups) must not leak between tests."""
+    for cache in caches.all():
+        cache.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_cnpj_breakers():
+    """Provider circuit breakers are process-wide; failures must not open them for later tests."""
+    from core.services.cnpj.providers import reset_breakers
+    reset_breakers()
+    yield
+
+
+@pytest.fixture
+def make_professional(db):
+    """
+    Creates a PF professional with valid defaults; keyword arguments override them.
+    `days_ago` backdates submission_date (auto_now_add ignores values passed to create).
+    """
+    from datetime import date, timedelta
+    from django.utils import timezone
+    from professionals.models import Professional
+
+    def make(days_ago=None, **overrides):
+        data = dict(
+            person_type='PF',
+            name='Profissional',
+            cpf='12345678909',
+            email='prof@test.com',
+            phone='11999999999',
+            birth_date=date(1990, 1, 1),
+            zip_code='12345678',
+            street='Rua',
+            number='1',
+            neighborhood='Bairro',
+            city='Cidade',
+            state='SP',
+            education='Enfermeiro',
+            institution='USP',
+            graduation_year=2020,
+            council_name='COREN',
+            council_number='123',
+            experience_years=5
+        )
+        data.update(overrides)
+        professional = Professional.objects.create(**data)
+        if days_ago is not None:
+            professional.submission_date = timezone.now() - timedelta(days=days_ago)
+            Professional.objects.filter(pk=professional.pk).update(submission_date=professional.submission_date)
+        return professional
+
+    return make
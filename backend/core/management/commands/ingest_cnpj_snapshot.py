@@ -0,0 +1,64 @@
+import csv
+import io
+import os
+import time
+import zipfile
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from core.services.cnpj.snapshot import SORT_RUN_SIZE, write_snapshot
+
+# Receita "Estabelecimentos" layout: CNPJ básico, ordem, DV, ..., situação cadastral
+CNPJ_BASE, CNPJ_ORDER, CNPJ_DV, SITUATION = 0, 1, 2, 5
+
+
+class Command(BaseCommand):
+    help = (
+        'Builds the local CNPJ snapshot from Receita Federal "Estabelecimentos" files '
+        '(.zip as published or extracted CSV) and atomically replaces the current one'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='+', help='Estabelecimentos*.zip or extracted CSV files')
+        parser.add_argument('--output', default=None, help='Defaults to settings.CNPJ_SNAPSHOT_PATH')
+        parser.add_argument('--run-size', type=int, default=SORT_RUN_SIZE, help='Records sorted in memory per run')
+
+    def handle(self, *args, **options):
+        output = options['output'] or settings.CNPJ_SNAPSHOT_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        self.skipped = 0
+        started = time.perf_counter()
+        try:
+            count = write_snapshot(self._rows(options['files']), output, run_size=options['run_size'])
+        except (OSError, zipfile.BadZipFile) as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f'{count} CNPJs written to {output} in {time.perf_counter() - started:.1f}s '
+            f'({self.skipped} malformed rows skipped)'
+        ))
+
+    def _rows(self, paths):
+        for path in paths:
+            self.stdout.write(f'Reading {path}...')
+            for fh in self._open(path):
+                # The dump is ';'-separated, fully quoted and Latin-1 encoded
+                for row in csv.reader(fh, delimiter=';', quotechar='"'):
+                    try:
+                        cnpj = row[CNPJ_BASE] + row[CNPJ_ORDER] + row[CNPJ_DV]
+                        code = int(row[SITUATION])
+                    except (IndexError, ValueError):
+                        self.skipped += 1
+                        continue
+                    if len(cnpj) != 14 or not 0 <= code <= 255:
+                        self.skipped += 1
+                        continue
+                    yield cnpj.upper(), code
+
+    def _open(self, path):
+        if zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path) as archive:
+                for member in archive.namelist():
+                    with archive.open(member) as raw:
+                        yield io.TextIOWrapper(raw, encoding='latin-1', newline='')
+        else:
+            with open(path, encoding='latin-1', newline='') as fh:
+                yield fh
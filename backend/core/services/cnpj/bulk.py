@@ -0,0 +1,69 @@
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from core.validators import clean_cnpj
+from .interfaces import CNPJResult
+
+# Uploaded lists may use newlines, commas, semicolons or whitespace between CNPJs;
+# mask characters (. / -) are kept and stripped by clean_cnpj
+_LIST_SEPARATORS = re.compile(r'[\s,;]+')
+
+# Upper bound of one list entry in an uploaded file: masked CNPJ, quotes, separator and CRLF
+MAX_BYTES_PER_ITEM = 24
+
+
+def max_upload_size(max_items):
+    return max_items * MAX_BYTES_PER_ITEM
+
+
+def parse_cnpj_list(text):
+    return [token.strip('"\'') for token in _LIST_SEPARATORS.split(text) if token.strip('"\'')]
+
+
+def unique_cnpjs(values):
+    """Cleaned CNPJs in first-seen order, duplicates (also differently masked ones) dropped."""
+    seen = {}
+    for value in values:
+        cnpj = clean_cnpj(str(value))
+        if cnpj and cnpj not in seen:
+            seen[cnpj] = None
+    return list(seen)
+
+
+def validate_many(service, cnpjs, concurrency):
+    """
+    Yields (cnpj, CNPJResult) as lookups finish. At most `concurrency` lookups are in
+    flight; the rest are only submitted as earlier ones complete.
+    """
+    pending = {}
+    remaining = iter(cnpjs)
+    executor = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix='cnpj-bulk')
+
+    def submit_next():
+        cnpj = next(remaining, None)
+        if cnpj is not None:
+            pending[executor.submit(service.validate_cnpj, cnpj)] = cnpj
+
+    try:
+        for _ in range(max(1, concurrency)):
+            submit_next()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                cnpj = pending.pop(future)
+                submit_next()
+                yield cnpj, _result(future)
+    finally:
+        # Also reached when the client disconnects mid-stream
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _result(future):
+    try:
+        return future.result()
+    except Exception as e:
+        return CNPJResult(
+            valid=False,
+            status='EXCEPTION',
+            message='Erro interno na validação do CNPJ.',
+            details={'error': str(e)}
+        )
@@ -0,0 +1,85 @@
+import logging
+import threading
+from dataclasses import asdict
+from django.conf import settings
+from django.core.cache import caches
+from .interfaces import CNPJProvider, CNPJResult
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = 'cnpj:result:{cnpj}'
+
+# Answers from the Receita registry that are worth remembering for a shorter time
+NEGATIVE_STATUSES = {'NOT_FOUND', 'BAIXADA', 'SUSPENSA', 'INAPTA', 'NULA'}
+
+
+class CacheStats:
+    """Per-process hit/miss counters of the CNPJ lookup cache."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+cache_stats = CacheStats()
+
+
+def lookup_cache():
+    """CNPJ_CACHE_ALIAS cache; a shared backend lets every worker reuse a lookup."""
+    return caches[settings.CNPJ_CACHE_ALIAS]
+
+
+def cache_ttl(result: CNPJResult):
+    """Seconds to keep `result`, or None when it must not be cached (transient failures)."""
+    if result.status == 'ATIVA':
+        return settings.CNPJ_CACHE_TTL_ACTIVE
+    if result.status in NEGATIVE_STATUSES:
+        return settings.CNPJ_CACHE_TTL_NEGATIVE
+    return None
+
+
+class CachedCNPJProvider(CNPJProvider):
+    """
+    Wraps a provider with the Django cache, so the frontend's validate-cnpj call
+    and the registration submit that follows it hit the external API once.
+    """
+
+    def __init__(self, provider: CNPJProvider):
+        self.provider = provider
+
+    def validate(self, cnpj: str) -> CNPJResult:
+        key = CACHE_KEY.format(cnpj=cnpj)
+        cache = lookup_cache()
+        cached = cache.get(key)
+        if cached is not None:
+            cache_stats.record(hit=True)
+            return CNPJResult(**cached)
+
+        cache_stats.record(hit=False)
+        result = self.provider.validate(cnpj)
+        ttl = cache_ttl(result)
+        if ttl:
+            cache.set(key, asdict(result), ttl)
+        else:
+            logger.info(
+                "CNPJ lookup not cached",
+                extra={"event": "cnpj_cache_skip", "status": result.status}
+            )
+        return result
@@ -0,0 +1,149 @@
+import bisect
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from django.conf import settings
+from .interfaces import CNPJProvider, CNPJResult
+
+logger = logging.getLogger(__name__)
+
+# Answers that say nothing about the CNPJ itself; the next provider is asked instead
+TRANSIENT_STATUSES = {'TIMEOUT', 'ERROR', 'EXCEPTION'}
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram, safe to update from several threads."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total_ms = 0.0
+
+    def observe(self, ms):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, ms)] += 1
+            self.total_ms += ms
+
+    def snapshot(self):
+        with self._lock:
+            labels = [f'le_{bound}' for bound in self.buckets] + ['inf']
+            return {
+                'count': sum(self.counts),
+                'sum_ms': round(self.total_ms, 3),
+                'buckets': dict(zip(labels, self.counts)),
+            }
+
+
+class LatencyHistograms:
+    """Per-provider LatencyHistogram registry."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def get(self, name):
+        with self._lock:
+            if name not in self._histograms:
+                self._histograms[name] = LatencyHistogram()
+            return self._histograms[name]
+
+    def snapshot(self):
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {name: histogram.snapshot() for name, histogram in histograms.items()}
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+provider_latency = LatencyHistograms()
+
+_executor_lock = threading.Lock()
+_executor = None
+
+
+def hedge_executor():
+    """Shared pool for hedged lookups; losing requests finish in the background."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.CNPJ_HEDGE_MAX_WORKERS, thread_name_prefix='cnpj-hedge'
+            )
+        return _executor
+
+
+def provider_name(provider):
+    return getattr(provider, 'name', type(provider).__name__)
+
+
+class HedgedCNPJProvider(CNPJProvider):
+    """
+    Asks an ordered list of providers. The next provider is only called when the
+    previous ones have not answered within `hedge_after` seconds, or answered with a
+    transient failure. The first authoritative answer wins; when every provider fails,
+    the failure of the highest-priority provider is returned.
+    """
+
+    def __init__(self, providers, hedge_after=None, executor=None):
+        if not providers:
+            raise ValueError('HedgedCNPJProvider needs at least one provider.')
+        self.providers = list(providers)
+        self.hedge_after = settings.CNPJ_HEDGE_AFTER_SECONDS if hedge_after is None else hedge_after
+        self.executor = executor or hedge_executor()
+
+    def validate(self, cnpj: str) -> CNPJResult:
+        pending = {}
+        failures = {}
+        queue = list(enumerate(self.providers))
+
+        def launch():
+            index, provider = queue.pop(0)
+            pending[self.executor.submit(self._timed_validate, provider, cnpj)] = index
+
+        launch()
+        while pending:
+            done, _ = wait(pending, timeout=self.hedge_after if queue else None, return_when=FIRST_COMPLETED)
+            if not done:
+                logger.info(
+                    "CNPJ hedged request",
+                    extra={"event": "cnpj_hedge", "provider": provider_name(queue[0][1])}
+                )
+                launch()
+                continue
+
+            for future in done:
+                index = pending.pop(future)
+                result = future.result()
+                if result.status not in TRANSIENT_STATUSES:
+                    return result
+                failures[index] = result
+            # A failed provider is replaced right away instead of after the budget
+            if not pending and queue:
+                launch()
+
+        return failures[min(failures)]
+
+    def _timed_validate(self, provider, cnpj):
+        start = time.perf_counter()
+        try:
+            return provider.validate(cnpj)
+        except Exception as e:
+            logger.error(f"CNPJ provider {provider_name(provider)} raised: {str(e)}")
+            return CNPJResult(
+                valid=False,
+                status='EXCEPTION',
+                message='Erro interno na validação do CNPJ.',
+                details={'error': str(e)}
+            )
+        finally:
+            provider_latency.get(provider_name(provider)).observe((time.perf_counter() - start) * 1000)
@@ -1,17 +1,92 @@
+import threading
 import requests
 import logging
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from core.validators import clean_cnpj as clean_cnpj_value
+from .breaker import CircuitBreaker
 from .interfaces import CNPJProvider, CNPJResult
 
 logger = logging.getLogger(__name__)
 
+_defaults_lock = threading.Lock()
+_session = None
+_breakers = {}
+
+
+def default_session():
+    """Process-wide keep-alive session shared by the HTTP CNPJ providers."""
+    global _session
+    with _defaults_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=settings.CNPJ_HTTP_POOL_SIZE,
+                max_retries=0,
+            )
+            _session.mount('https://', adapter)
+            _session.mount('http://', adapter)
+        return _session
+
+
+def default_breaker(name='brasilapi'):
+    """Process-wide circuit breaker of one external provider."""
+    with _defaults_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(
+                failure_threshold=settings.CNPJ_CIRCUIT_FAILURE_THRESHOLD,
+                reset_timeout=settings.CNPJ_CIRCUIT_RESET_SECONDS,
+            )
+        return _breakers[name]
+
+
+def reset_breakers():
+    with _defaults_lock:
+        for breaker in _breakers.values():
+            breaker.reset()
+
+
 class BrasilAPICNPJProvider(CNPJProvider):
+    name = 'brasilapi'
     BASE_URL = "https://brasilapi.com.br/api/cnpj/v1"
 
+    # Results that mean BrasilAPI itself is unhealthy (they count towards opening the circuit)
+    FAILURE_STATUSES = {'TIMEOUT', 'ERROR', 'EXCEPTION'}
+
+    def __init__(self, base_url=None, session=None, breaker=None, timeout=None):
+        self.base_url = base_url or self.BASE_URL
+        self.session = session or default_session()
+        self.breaker = breaker or default_breaker(self.name)
+        self.timeout = timeout or settings.CNPJ_PROVIDER_TIMEOUT
+
     def validate(self, cnpj: str) -> CNPJResult:
-        clean_cnpj = ''.join(filter(str.isdigit, cnpj))
+        if not self.breaker.allow():
+            logger.warning("CNPJ provider circuit open", extra={"event": "cnpj_circuit_open", "provider": self.name})
+            return CNPJResult(
+                valid=False,
+                status='ERROR',
+                message='Erro ao consultar CNPJ. Tente novamente mais tarde.',
+                details={'circuit': CircuitBreaker.OPEN}
+            )
+
+        result = self._fetch(cnpj)
+        if result.status in self.FAILURE_STATUSES and not self._client_error(result):
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return result
+
+    def _client_error(self, result):
+        # A 4xx other than 429 is an answer about the request, not a sign of an outage
+        status_code = (result.details or {}).get('status_code')
+        return status_code is not None and 400 <= status_code < 500 and status_code != 429
+
+    def _fetch(self, cnpj: str) -> CNPJResult:
+        clean_cnpj = clean_cnpj_value(cnpj)
         
         try:
-            response = requests.get(f"{self.BASE_URL}/{clean_cnpj}", timeout=5)
+            response = self.session.get(f"{self.base_url}/{clean_cnpj}", timeout=self.timeout)
             
             if response.status_code == 200:
                 data = response.json()
@@ -64,3 +139,62 @@ class BrasilAPICNPJProvider(CNPJProvider):
                 message='Erro interno na validação do CNPJ.',
                 details={'error': str(e)}
             )
+
+
+class ReceitaWSCNPJProvider(BrasilAPICNPJProvider):
+    """
+    ReceitaWS public API. Answers 200 with {"status": "OK", "situacao": ...} or
+    {"status": "ERROR", "message": ...}; 429 when the free-tier rate limit is hit.
+    """
+    name = 'receitaws'
+    BASE_URL = "https://receitaws.com.br/v1/cnpj"
+
+    def _fetch(self, cnpj: str) -> CNPJResult:
+        clean_cnpj = clean_cnpj_value(cnpj)
+
+        try:
+            response = self.session.get(f"{self.base_url}/{clean_cnpj}", timeout=self.timeout)
+
+            if response.status_code == 200:
+                data = response.json()
+                if data.get('status') == 'OK':
+                    situation = data.get('situacao', '').upper()
+                    if situation == 'ATIVA':
+                        return CNPJResult(valid=True, status='ATIVA', message='CNPJ Ativo.', details=data)
+                    return CNPJResult(
+                        valid=False,
+                        status=situation,
+                        message=f'CNPJ com situação {situation} na Receita Federal.',
+                        details=data
+                    )
+                # Unknown or rejected CNPJs come back as status=ERROR with a message
+                return CNPJResult(
+                    valid=False,
+                    status='NOT_FOUND',
+                    message='CNPJ não encontrado na base da Receita Federal.',
+                    details=data
+                )
+
+            logger.warning(f"ReceitaWS Error: {response.status_code} - {response.text}")
+            return CNPJResult(
+                valid=False,
+                status='ERROR',
+                message='Erro ao consultar CNPJ. Tente novamente mais tarde.',
+                details={'status_code': response.status_code}
+            )
+
+        except requests.Timeout:
+            logger.error("ReceitaWS Timeout")
+            return CNPJResult(
+                valid=False,
+                status='TIMEOUT',
+                message='Tempo limite excedido na validação do CNPJ.'
+            )
+        except Exception as e:
+            logger.error(f"ReceitaWS Exception: {str(e)}")
+            return CNPJResult(
+                valid=False,
+                status='EXCEPTION',
+                message='Erro interno na validação do CNPJ.',
+                details={'error': str(e)}
+            )
@@ -1,14 +1,58 @@
+from django.conf import settings
+from django.utils.module_loading import import_string
+from core.validators import clean_cnpj, is_valid_cnpj
+from .cache import CachedCNPJProvider
+from .hedged import HedgedCNPJProvider
 from .interfaces import CNPJResult
-from .providers import BrasilAPICNPJProvider
+from .singleflight import SingleFlight
+
+# Lookups in flight in this process, shared by every CNPJService
+inflight_lookups = SingleFlight()
+
+
+def default_provider(breaker_scope=None):
+    """
+    CNPJ_PROVIDERS (hedged when there are several) behind the lookup cache. With a
+    `breaker_scope` the HTTP providers get circuit breakers of their own (named
+    '<provider>-<scope>') instead of the ones public lookups use.
+    """
+    from .providers import BrasilAPICNPJProvider, default_breaker
+
+    providers = []
+    for path in settings.CNPJ_PROVIDERS:
+        if not path.strip():
+            continue
+        provider_class = import_string(path.strip())
+        if breaker_scope and issubclass(provider_class, BrasilAPICNPJProvider):
+            providers.append(provider_class(breaker=default_breaker(f'{provider_class.name}-{breaker_scope}')))
+        else:
+            providers.append(provider_class())
+    provider = providers[0] if len(providers) == 1 else HedgedCNPJProvider(providers)
+    return CachedCNPJProvider(provider)
+
+
+def bulk_provider():
+    """
+    Providers for admin bulk validation: a bulk run tripping its breaker does not
+    fail public registrations (lookup cache still shared).
+    """
+    return default_provider(breaker_scope='bulk')
+
 
 class CNPJService:
     def __init__(self, provider=None):
-        self.provider = provider or BrasilAPICNPJProvider()
+        # Explicit providers are used as given; wrap them in CachedCNPJProvider to cache
+        self.provider = provider or default_provider()
+        # Default services share their configuration, so they coalesce with each other
+        self.flight_key = 'default' if provider is None else id(provider)
 
     def validate_cnpj(self, cnpj: str) -> CNPJResult:
-        # Basic format validation first
-        clean_cnpj = ''.join(filter(str.isdigit, cnpj))
-        if len(clean_cnpj) != 14:
+        # Offline format and check-digit validation first: malformed CNPJs never reach a provider
+        cleaned = clean_cnpj(cnpj)
+        if len(cleaned) != 14:
              return CNPJResult(valid=False, status='INVALID_FORMAT', message='CNPJ deve ter 14 dígitos.')
+        if not is_valid_cnpj(cleaned):
+             return CNPJResult(valid=False, status='INVALID_FORMAT', message='CNPJ inválido.')
              
-        return self.provider.validate(clean_cnpj)
+        # Concurrent lookups of the same CNPJ (double submits, validate + submit) share one call
+        return inflight_lookups.do((self.flight_key, cleaned), lambda: self.provider.validate(cleaned))
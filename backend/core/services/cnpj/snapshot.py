@@ -0,0 +1,238 @@
+"""
+Local CNPJ registry snapshot built from the Receita Federal open-data dump.
+
+File layout (big-endian):
+    header   magic b'CNPJSNP1' | record count (uint64) | built at, unix seconds (uint64)
+    records  key (uint64) | situação cadastral code (uint8), sorted by key
+
+The key is the 12-character CNPJ root (digits or letters) read as a base-36
+number; the two check digits are derived from the root, so they are not stored.
+"""
+import heapq
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from django.conf import settings
+from core.validators import clean_cnpj
+from .interfaces import CNPJProvider, CNPJResult
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'CNPJSNP1'
+HEADER = struct.Struct('>8sQQ')
+RECORD = struct.Struct('>QB')
+
+# Receita "situação cadastral" codes
+SITUATIONS = {1: 'NULA', 2: 'ATIVA', 3: 'SUSPENSA', 4: 'INAPTA', 8: 'BAIXADA'}
+ACTIVE_CODE = 2
+
+# Records sorted in memory per run before the external merge
+SORT_RUN_SIZE = 2_000_000
+
+
+def cnpj_key(cnpj):
+    """uint64 key of a cleaned 14-character CNPJ, or None when it is not well formed."""
+    root = cnpj[:12]
+    try:
+        return int(root, 36) if len(cnpj) == 14 and root.isalnum() and root.isascii() else None
+    except ValueError:
+        return None
+
+
+def _record_key(packed):
+    return packed >> 8
+
+
+def _write_records(fh, records):
+    pack = RECORD.pack
+    for packed in records:
+        fh.write(pack(packed >> 8, packed & 0xFF))
+
+
+def _read_records(path):
+    size = RECORD.size
+    with open(path, 'rb') as fh:
+        while True:
+            chunk = fh.read(size * 4096)
+            if not chunk:
+                return
+            for key, code in RECORD.iter_unpack(chunk):
+                yield key << 8 | code
+
+
+def write_snapshot(rows, path, run_size=SORT_RUN_SIZE):
+    """
+    Writes (cnpj, situação code) rows as a sorted snapshot at `path`.
+    Rows are sorted in runs of `run_size` and merged from temporary files, and the
+    result replaces `path` atomically (readers see the old or the new file, never a
+    partial one). A CNPJ listed twice keeps its last code. Returns the record count.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    runs = []
+    try:
+        batch = []
+        for cnpj, code in rows:
+            key = cnpj_key(cnpj)
+            if key is not None:
+                batch.append(key << 8 | code)
+            if len(batch) >= run_size:
+                runs.append(_spill(batch, directory))
+                batch = []
+        if batch or not runs:
+            runs.append(_spill(batch, directory))
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.cnpj-snapshot-')
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(HEADER.pack(MAGIC, 0, int(time.time())))
+                count = 0
+                pending = None
+                # merge() yields equal keys in run order, so the row read last wins
+                for packed in heapq.merge(*(_read_records(run) for run in runs), key=_record_key):
+                    if pending is not None and packed >> 8 != pending >> 8:
+                        _write_records(fh, (pending,))
+                        count += 1
+                    pending = packed
+                if pending is not None:
+                    _write_records(fh, (pending,))
+                    count += 1
+                fh.seek(0)
+                fh.write(HEADER.pack(MAGIC, count, int(time.time())))
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return count
+    finally:
+        for run in runs:
+            os.unlink(run)
+
+
+def _spill(batch, directory):
+    # Stable sort: for duplicated keys the row read last stays last
+    batch.sort(key=_record_key)
+    fd, run_path = tempfile.mkstemp(dir=directory, prefix='.cnpj-run-')
+    with os.fdopen(fd, 'wb') as fh:
+        _write_records(fh, batch)
+    return run_path
+
+
+class CNPJSnapshot:
+    """Read-only memory-mapped snapshot; lookups are a binary search over the records."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as fh:
+            stat = os.fstat(fh.fileno())
+            self.map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self.identity = (stat.st_ino, stat.st_mtime_ns)
+        magic, self.count, self.built_at = (
+            HEADER.unpack_from(self.map, 0) if len(self.map) >= HEADER.size else (None, 0, 0)
+        )
+        if magic != MAGIC or len(self.map) != HEADER.size + self.count * RECORD.size:
+            self.map.close()
+            raise ValueError(f'{path} is not a CNPJ snapshot.')
+
+    def lookup(self, key):
+        """Situação code of `key`, or None when the CNPJ is not in the snapshot."""
+        data, unpack, base, size = self.map, RECORD.unpack_from, HEADER.size, RECORD.size
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            current, code = unpack(data, base + middle * size)
+            if current < key:
+                low = middle + 1
+            elif current > key:
+                high = middle
+            else:
+                return code
+        return None
+
+
+_snapshots_lock = threading.Lock()
+# path -> (CNPJSnapshot or None, monotonic time of the last stat)
+_snapshots = {}
+
+
+def open_snapshot(path, check_interval=1.0):
+    """
+    Process-wide mapped snapshot of `path`. The file is re-stat'ed at most every
+    `check_interval` seconds and re-mapped when it was replaced; None when missing.
+    """
+    now = time.monotonic()
+    snapshot, checked_at = _snapshots.get(path, (None, None))
+    if checked_at is not None and now - checked_at < check_interval:
+        return snapshot
+    with _snapshots_lock:
+        snapshot, _ = _snapshots.get(path, (None, None))
+        try:
+            stat = os.stat(path)
+            if snapshot is None or snapshot.identity != (stat.st_ino, stat.st_mtime_ns):
+                # The previous map is released once the lookups still holding it finish
+                snapshot = CNPJSnapshot(path)
+        except (OSError, ValueError) as e:
+            logger.error(f"CNPJ snapshot unavailable: {str(e)}")
+            snapshot = None
+        _snapshots[path] = (snapshot, now)
+        return snapshot
+
+
+class LocalSnapshotCNPJProvider(CNPJProvider):
+    """
+    Answers from the local snapshot without network access.
+
+    CNPJs missing from the snapshot may have been opened after it was built, so by
+    default a miss is a transient ERROR (a HedgedCNPJProvider then asks the next
+    provider); with `authoritative_misses` it is NOT_FOUND.
+    """
+    name = 'snapshot'
+
+    def __init__(self, path=None, authoritative_misses=None, check_interval=1.0):
+        self.path = str(path or settings.CNPJ_SNAPSHOT_PATH)
+        self.authoritative_misses = (
+            settings.CNPJ_SNAPSHOT_AUTHORITATIVE_MISSES if authoritative_misses is None else authoritative_misses
+        )
+        self.check_interval = check_interval
+
+    def validate(self, cnpj: str) -> CNPJResult:
+        snapshot = open_snapshot(self.path, self.check_interval)
+        if snapshot is None:
+            return CNPJResult(
+                valid=False,
+                status='ERROR',
+                message='Erro ao consultar CNPJ. Tente novamente mais tarde.',
+                details={'source': self.name, 'error': 'snapshot unavailable'}
+            )
+
+        key = cnpj_key(clean_cnpj(cnpj))
+        code = snapshot.lookup(key) if key is not None else None
+        details = {'source': self.name, 'snapshot_built_at': snapshot.built_at}
+        if code is None:
+            if self.authoritative_misses:
+                return CNPJResult(
+                    valid=False,
+                    status='NOT_FOUND',
+                    message='CNPJ não encontrado na base da Receita Federal.',
+                    details=details
+                )
+            return CNPJResult(
+                valid=False,
+                status='ERROR',
+                message='Erro ao consultar CNPJ. Tente novamente mais tarde.',
+                details={**details, 'error': 'not in snapshot'}
+            )
+
+        situation = SITUATIONS.get(code, f'SITUACAO_{code:02d}')
+        if code == ACTIVE_CODE:
+            return CNPJResult(valid=True, status='ATIVA', message='CNPJ Ativo.', details=details)
+        return CNPJResult(
+            valid=False,
+            status=situation,
+            message=f'CNPJ com situação {situation} na Receita Federal.',
+            details=details
+        )
@@ -0,0 +1,132 @@
+import json
+import threading
+import time
+import pytest
+import requests
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from core.services.cnpj.breaker import CircuitBreaker
+from core.services.cnpj.providers import BrasilAPICNPJProvider
+
+CNPJ_ACTIVE = '11222333000181'
+CNPJ_CLOSED = '11444777000161'
+CNPJ_SLOW = '22333444000100'
+CNPJ_BROKEN = '99888777000100'
+
+
+class StubBrasilAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+
+    def do_GET(self):
+        server = self.server
+        server.requests += 1
+        server.client_ports.add(self.client_address[1])
+        cnpj = self.path.rsplit('/', 1)[-1]
+        if cnpj == CNPJ_SLOW:
+            time.sleep(0.5)
+        if cnpj == CNPJ_BROKEN:
+            return self._reply(503, {'message': 'indisponível'})
+        if cnpj == CNPJ_ACTIVE:
+            return self._reply(200, {'cnpj': cnpj, 'descricao_situacao_cadastral': 'ATIVA'})
+        if cnpj == CNPJ_CLOSED:
+            return self._reply(200, {'cnpj': cnpj, 'descricao_situacao_cadastral': 'BAIXADA'})
+        return self._reply(404, {'message': 'CNPJ não encontrado'})
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubBrasilAPIHandler)
+    # Keep-alive connections stay open until the client session goes away
+    server.daemon_threads = True
+    server.block_on_close = False
+    server.requests = 0
+    server.client_ports = set()
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.01}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestBrasilAPIProviderAgainstStub:
+    def _provider(self, server, **kwargs):
+        kwargs.setdefault('session', requests.Session())
+        kwargs.setdefault('breaker', CircuitBreaker(failure_threshold=3, reset_timeout=30))
+        base_url = f'http://127.0.0.1:{server.server_address[1]}/api/cnpj/v1'
+        return BrasilAPICNPJProvider(base_url=base_url, **kwargs)
+
+    def test_statuses(self, stub_server):
+        provider = self._provider(stub_server)
+        assert provider.validate(CNPJ_ACTIVE).status == 'ATIVA'
+        assert provider.validate(CNPJ_CLOSED).status == 'BAIXADA'
+        assert provider.validate('00000000000191').status == 'NOT_FOUND'
+        assert provider.validate(CNPJ_BROKEN).status == 'ERROR'
+
+    def test_timeout(self, stub_server):
+        provider = self._provider(stub_server, timeout=0.1)
+        assert provider.validate(CNPJ_SLOW).status == 'TIMEOUT'
+
+    def test_connections_are_reused(self, stub_server):
+        provider = self._provider(stub_server)
+        for _ in range(5):
+            assert provider.validate(CNPJ_ACTIVE).valid is True
+        assert stub_server.requests == 5
+        assert len(stub_server.client_ports) == 1
+
+    def test_circuit_opens_after_consecutive_failures(self, stub_server):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30, clock=clock)
+        provider = self._provider(stub_server, breaker=breaker)
+
+        for _ in range(3):
+            assert provider.validate(CNPJ_BROKEN).status == 'ERROR'
+        assert breaker.state == CircuitBreaker.OPEN
+
+        # Fails fast without reaching the server
+        result = provider.validate(CNPJ_ACTIVE)
+        assert result.status == 'ERROR'
+        assert result.details == {'circuit': 'open'}
+        assert stub_server.requests == 3
+
+        # After the reset timeout one trial request closes it again
+        clock.now += 30
+        assert provider.validate(CNPJ_ACTIVE).status == 'ATIVA'
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert stub_server.requests == 4
+
+    def test_failed_trial_reopens_circuit(self, stub_server):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+        provider = self._provider(stub_server, breaker=breaker)
+        provider.validate(CNPJ_BROKEN)
+        provider.validate(CNPJ_BROKEN)
+
+        clock.now += 10
+        assert provider.validate(CNPJ_BROKEN).status == 'ERROR'
+        assert breaker.state == CircuitBreaker.OPEN
+        assert stub_server.requests == 3
+
+    def test_not_found_does_not_count_as_failure(self, stub_server):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+        provider = self._provider(stub_server, breaker=breaker)
+        for _ in range(3):
+            assert provider.validate('00000000000191').status == 'NOT_FOUND'
+        assert breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,76 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from core.services.cnpj.cache import CachedCNPJProvider, cache_stats
+from core.services.cnpj.interfaces import CNPJResult
+from core.services.cnpj.service import CNPJService
+
+
+class StubProvider:
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    def validate(self, cnpj):
+        self.calls += 1
+        return self.result
+
+
+class TestCachedCNPJProvider:
+    def setup_method(self):
+        cache_stats.reset()
+
+    def _lookup_twice(self, status, valid=False):
+        stub = StubProvider(CNPJResult(valid=valid, status=status, message='msg', details={'cnpj': '1'}))
+        service = CNPJService(provider=CachedCNPJProvider(stub))
+        first = service.validate_cnpj('12.345.678/0001-95')
+        second = service.validate_cnpj('12345678000195')
+        return stub, first, second
+
+    def test_active_result_is_cached(self):
+        stub, first, second = self._lookup_twice('ATIVA', valid=True)
+        assert stub.calls == 1
+        assert second == first
+        assert cache_stats.snapshot() == {'hits': 1, 'misses': 1}
+
+    @pytest.mark.parametrize('status', ['NOT_FOUND', 'BAIXADA'])
+    def test_negative_results_are_cached(self, status):
+        stub, _, second = self._lookup_twice(status)
+        assert stub.calls == 1
+        assert second.status == status
+
+    @pytest.mark.parametrize('status', ['TIMEOUT', 'ERROR', 'EXCEPTION'])
+    def test_transient_failures_are_never_cached(self, status):
+        stub, _, _ = self._lookup_twice(status)
+        assert stub.calls == 2
+        assert cache_stats.snapshot() == {'hits': 0, 'misses': 2}
+
+    def test_ttl_depends_on_status(self, settings):
+        settings.CNPJ_CACHE_TTL_ACTIVE = 3600
+        settings.CNPJ_CACHE_TTL_NEGATIVE = 60
+        with patch('core.services.cnpj.cache.lookup_cache') as lookup_cache:
+            mock_cache = lookup_cache.return_value
+            mock_cache.get.return_value = None
+            CachedCNPJProvider(StubProvider(CNPJResult(True, 'ATIVA', 'ok'))).validate('12345678000195')
+            CachedCNPJProvider(StubProvider(CNPJResult(False, 'BAIXADA', 'x'))).validate('12345678000195')
+        assert [call.args[2] for call in mock_cache.set.call_args_list] == [3600, 60]
+
+    @patch('core.services.cnpj.providers.requests.Session.get')
+    def test_default_service_is_cached(self, mock_get):
+        """The registration submit reuses the frontend validate-cnpj lookup."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {'descricao_situacao_cadastral': 'ATIVA'}
+        mock_get.return_value = mock_response
+
+        assert CNPJService().validate_cnpj('12345678000195').valid is True
+        assert CNPJService().validate_cnpj('12345678000195').valid is True
+        assert mock_get.call_count == 1
+
+    def test_results_go_to_the_configured_cache_alias(self, settings):
+        from django.core.cache import caches
+
+        settings.CNPJ_CACHE_ALIAS = 'cnpj'
+        CachedCNPJProvider(StubProvider(CNPJResult(True, 'ATIVA', 'ok'))).validate('12345678000195')
+
+        assert caches['cnpj'].get('cnpj:result:12345678000195')['status'] == 'ATIVA'
+        assert caches['default'].get('cnpj:result:12345678000195') is None
@@ -4,42 +4,42 @@ from core.services.cnpj.service import CNPJService
 from core.services.cnpj.interfaces import CNPJResult
 
 class TestCNPJService:
-    @patch('core.services.cnpj.providers.requests.get')
+    @patch('core.services.cnpj.providers.requests.Session.get')
     def test_cnpj_active_success(self, mock_get):
         """Should return valid result when CNPJ is ATIVA"""
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {
-            'cnpj': '12345678000199',
+            'cnpj': '12345678000195',
             'descricao_situacao_cadastral': 'ATIVA'
         }
         mock_get.return_value = mock_response
 
         service = CNPJService()
-        result = service.validate_cnpj('12345678000199')
+        result = service.validate_cnpj('12345678000195')
 
         assert result.valid is True
         assert result.status == 'ATIVA'
 
-    @patch('core.services.cnpj.providers.requests.get')
+    @patch('core.services.cnpj.providers.requests.Session.get')
     def test_cnpj_inactive_failure(self, mock_get):
         """Should return invalid result when CNPJ is BAIXADA"""
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {
-            'cnpj': '12345678000199',
+            'cnpj': '12345678000195',
             'descricao_situacao_cadastral': 'BAIXADA'
         }
         mock_get.return_value = mock_response
 
         service = CNPJService()
-        result = service.validate_cnpj('12345678000199')
+        result = service.validate_cnpj('12345678000195')
 
         assert result.valid is False
         assert result.status == 'BAIXADA'
         assert 'CNPJ com situação BAIXADA' in result.message
 
-    @patch('core.services.cnpj.providers.requests.get')
+    @patch('core.services.cnpj.providers.requests.Session.get')
     def test_cnpj_not_found_failure(self, mock_get):
         """Should return invalid result when CNPJ is not found"""
         mock_response = MagicMock()
@@ -47,18 +47,18 @@ class TestCNPJService:
         mock_get.return_value = mock_response
 
         service = CNPJService()
-        result = service.validate_cnpj('12345678000199')
+        result = service.validate_cnpj('12345678000195')
 
         assert result.valid is False
         assert result.status == 'NOT_FOUND'
 
-    @patch('core.services.cnpj.providers.requests.get')
+    @patch('core.services.cnpj.providers.requests.Session.get')
     def test_network_error_failure(self, mock_get):
         """Should return invalid result on network exception"""
         mock_get.side_effect = Exception("Network Error")
 
         service = CNPJService()
-        result = service.validate_cnpj('12345678000199')
+        result = service.validate_cnpj('12345678000195')
 
         assert result.valid is False
         assert result.status == 'EXCEPTION'
@@ -0,0 +1,97 @@
+import threading
+import time
+from core.services.cnpj.interfaces import CNPJResult
+from core.services.cnpj.service import CNPJService, inflight_lookups
+from core.services.cnpj.singleflight import SingleFlight
+
+CNPJ = '11222333000181'
+
+
+class BlockingProvider:
+    """Stub provider that holds every call until released."""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+
+    def validate(self, cnpj):
+        self.calls += 1
+        self.release.wait(5)
+        return CNPJResult(valid=True, status='ATIVA', message='CNPJ Ativo.')
+
+
+def wait_for_waiters(flight, key, count, timeout=5):
+    deadline = time.monotonic() + timeout
+    while flight.waiters(key) < count:
+        assert time.monotonic() < deadline, 'waiters did not arrive'
+        time.sleep(0.005)
+
+
+def run_concurrently(target, count):
+    results = [None] * count
+
+    def worker(index):
+        results[index] = target()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+class TestSingleFlight:
+    def test_concurrent_lookups_make_one_provider_call(self):
+        provider = BlockingProvider()
+        concurrent = 10
+
+        threads, results = run_concurrently(lambda: CNPJService(provider=provider).validate_cnpj(CNPJ), concurrent)
+        wait_for_waiters(inflight_lookups, (id(provider), CNPJ), concurrent - 1)
+        provider.release.set()
+        for thread in threads:
+            thread.join()
+
+        assert provider.calls == 1
+        assert all(result.status == 'ATIVA' for result in results)
+
+    def test_different_cnpjs_are_not_coalesced(self):
+        provider = BlockingProvider()
+        provider.release.set()
+        service = CNPJService(provider=provider)
+        service.validate_cnpj(CNPJ)
+        service.validate_cnpj('12345678000195')
+        assert provider.calls == 2
+
+    def test_sequential_lookups_are_not_coalesced(self):
+        provider = BlockingProvider()
+        provider.release.set()
+        service = CNPJService(provider=provider)
+        service.validate_cnpj(CNPJ)
+        service.validate_cnpj(CNPJ)
+        assert provider.calls == 2
+
+    def test_exception_reaches_every_waiter(self):
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def failing():
+            release.wait(5)
+            raise RuntimeError('boom')
+
+        errors = []
+
+        def call():
+            try:
+                flight.do('key', failing)
+            except RuntimeError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        wait_for_waiters(flight, 'key', 3)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(errors) == 4
+        assert flight.waiters('key') == 0
@@ -0,0 +1,106 @@
+import io
+import os
+import zipfile
+import pytest
+from django.core.management import call_command
+from core.services.cnpj.hedged import HedgedCNPJProvider
+from core.services.cnpj.interfaces import CNPJResult
+from core.services.cnpj.snapshot import CNPJSnapshot, LocalSnapshotCNPJProvider, cnpj_key, write_snapshot
+
+ACTIVE = '11222333000181'
+CLOSED = '12345678000195'
+ALPHANUMERIC = '12ABC34501DE35'
+MISSING = '11444777000161'
+
+
+def dump_line(cnpj, situation):
+    # Estabelecimentos layout: básico; ordem; DV; matriz/filial; nome fantasia; situação; ...
+    return f'"{cnpj[:8]}";"{cnpj[8:12]}";"{cnpj[12:]}";"1";"NOME";"{situation:02d}";"20200101"\n'
+
+
+class TestSnapshotFile:
+    def test_write_and_lookup(self, tmp_path):
+        path = tmp_path / 'snapshot.bin'
+        rows = [(CLOSED, 8), (ACTIVE, 2), (ALPHANUMERIC, 2), (CLOSED, 2)]
+        # Tiny runs exercise the external merge; the duplicate keeps its last code
+        assert write_snapshot(rows, str(path), run_size=2) == 3
+
+        snapshot = CNPJSnapshot(str(path))
+        assert snapshot.count == 3
+        assert snapshot.lookup(cnpj_key(ACTIVE)) == 2
+        assert snapshot.lookup(cnpj_key(CLOSED)) == 2
+        assert snapshot.lookup(cnpj_key(ALPHANUMERIC)) == 2
+        assert snapshot.lookup(cnpj_key(MISSING)) is None
+        assert not [name for name in os.listdir(tmp_path) if name.startswith('.cnpj-')]
+
+    def test_empty_snapshot(self, tmp_path):
+        path = tmp_path / 'snapshot.bin'
+        assert write_snapshot([], str(path)) == 0
+        assert CNPJSnapshot(str(path)).lookup(cnpj_key(ACTIVE)) is None
+
+    def test_rejects_foreign_file(self, tmp_path):
+        path = tmp_path / 'snapshot.bin'
+        path.write_bytes(b'not a snapshot at all')
+        with pytest.raises(ValueError):
+            CNPJSnapshot(str(path))
+
+
+class TestLocalSnapshotProvider:
+    @pytest.fixture
+    def snapshot_path(self, tmp_path):
+        path = str(tmp_path / 'snapshot.bin')
+        write_snapshot([(ACTIVE, 2), (CLOSED, 8)], path)
+        return path
+
+    def test_statuses(self, snapshot_path):
+        provider = LocalSnapshotCNPJProvider(path=snapshot_path)
+        assert provider.validate(ACTIVE).valid is True
+        closed = provider.validate(CLOSED)
+        assert closed.status == 'BAIXADA'
+        assert closed.message == 'CNPJ com situação BAIXADA na Receita Federal.'
+
+    def test_miss_is_transient_unless_authoritative(self, snapshot_path):
+        assert LocalSnapshotCNPJProvider(path=snapshot_path).validate(MISSING).status == 'ERROR'
+        authoritative = LocalSnapshotCNPJProvider(path=snapshot_path, authoritative_misses=True)
+        assert authoritative.validate(MISSING).status == 'NOT_FOUND'
+
+    def test_missing_file(self, tmp_path):
+        result = LocalSnapshotCNPJProvider(path=str(tmp_path / 'absent.bin')).validate(ACTIVE)
+        assert result.status == 'ERROR'
+
+    def test_refresh_is_picked_up(self, snapshot_path):
+        provider = LocalSnapshotCNPJProvider(path=snapshot_path, check_interval=0)
+        assert provider.validate(MISSING).status == 'ERROR'
+
+        write_snapshot([(ACTIVE, 2), (CLOSED, 8), (MISSING, 4)], snapshot_path)
+        assert provider.validate(MISSING).status == 'INAPTA'
+
+    def test_miss_falls_through_to_next_provider(self, snapshot_path):
+        class Online:
+            name = 'online'
+
+            def validate(self, cnpj):
+                return CNPJResult(valid=True, status='ATIVA', message='online')
+
+        hedged = HedgedCNPJProvider([LocalSnapshotCNPJProvider(path=snapshot_path), Online()], hedge_after=5)
+        assert hedged.validate(MISSING).message == 'online'
+        assert hedged.validate(ACTIVE).details['source'] == 'snapshot'
+
+
+def test_ingest_command(tmp_path):
+    archive = tmp_path / 'Estabelecimentos0.zip'
+    with zipfile.ZipFile(archive, 'w') as zf:
+        zf.writestr('K3241.ESTABELE', dump_line(ACTIVE, 2) + dump_line(CLOSED, 8) + '"broken"\n')
+    csv_file = tmp_path / 'extra.csv'
+    csv_file.write_text(dump_line(ALPHANUMERIC, 3), encoding='latin-1')
+    output = tmp_path / 'var' / 'snapshot.bin'
+
+    out = io.StringIO()
+    call_command('ingest_cnpj_snapshot', str(archive), str(csv_file), output=str(output), stdout=out)
+
+    assert '3 CNPJs written' in out.getvalue()
+    assert '1 malformed rows skipped' in out.getvalue()
+    provider = LocalSnapshotCNPJProvider(path=str(output))
+    assert provider.validate(ACTIVE).status == 'ATIVA'
+    assert provider.validate(CLOSED).status == 'BAIXADA'
+    assert provider.validate(ALPHANUMERIC).status == 'SUSPENSA'
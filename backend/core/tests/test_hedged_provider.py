@@ -0,0 +1,121 @@
+import threading
+import time
+from unittest.mock import MagicMock
+from core.services.cnpj.breaker import CircuitBreaker
+from core.services.cnpj.cache import CachedCNPJProvider
+from core.services.cnpj.hedged import HedgedCNPJProvider, LatencyHistogram, provider_latency
+from core.services.cnpj.interfaces import CNPJResult
+from core.services.cnpj.providers import BrasilAPICNPJProvider, ReceitaWSCNPJProvider
+from core.services.cnpj.service import CNPJService, default_provider
+
+
+class StubProvider:
+    def __init__(self, name, status='ATIVA', delay=0.0):
+        self.name = name
+        self.status = status
+        self.delay = delay
+        self.calls = 0
+        self.release = threading.Event()
+
+    def validate(self, cnpj):
+        self.calls += 1
+        self.release.wait(self.delay)
+        return CNPJResult(valid=self.status == 'ATIVA', status=self.status, message=self.name)
+
+
+class TestHedgedCNPJProvider:
+    def setup_method(self):
+        provider_latency.reset()
+
+    def teardown_method(self):
+        for provider in getattr(self, 'providers', []):
+            provider.release.set()
+
+    def _hedged(self, *providers, hedge_after=0.05):
+        self.providers = providers
+        return HedgedCNPJProvider(providers, hedge_after=hedge_after)
+
+    def test_fast_primary_is_not_hedged(self):
+        primary, secondary = StubProvider('primary'), StubProvider('secondary')
+        result = self._hedged(primary, secondary).validate('11222333000181')
+        assert result.message == 'primary'
+        assert secondary.calls == 0
+
+    def test_slow_primary_is_hedged(self):
+        primary, secondary = StubProvider('primary', delay=5), StubProvider('secondary')
+        start = time.perf_counter()
+        result = self._hedged(primary, secondary).validate('11222333000181')
+        assert result.message == 'secondary'
+        assert time.perf_counter() - start < 1
+        assert primary.calls == 1
+
+    def test_transient_failure_falls_through_immediately(self):
+        primary, secondary = StubProvider('primary', status='TIMEOUT'), StubProvider('secondary', status='BAIXADA')
+        result = self._hedged(primary, secondary, hedge_after=5).validate('11222333000181')
+        assert result.status == 'BAIXADA'
+
+    def test_all_failing_returns_primary_failure(self):
+        primary, secondary = StubProvider('primary', status='ERROR'), StubProvider('secondary', status='TIMEOUT')
+        result = self._hedged(primary, secondary).validate('11222333000181')
+        assert result.status == 'ERROR'
+        assert result.message == 'primary'
+
+    def test_exception_is_a_transient_failure(self):
+        class Broken:
+            name = 'broken'
+
+            def validate(self, cnpj):
+                raise RuntimeError('boom')
+
+        secondary = StubProvider('secondary')
+        result = HedgedCNPJProvider([Broken(), secondary], hedge_after=5).validate('11222333000181')
+        assert result.message == 'secondary'
+
+    def test_latency_is_recorded_per_provider(self):
+        primary, secondary = StubProvider('primary', delay=0.2), StubProvider('secondary')
+        self._hedged(primary, secondary).validate('11222333000181')
+        primary.release.set()
+        time.sleep(0.05)  # the losing request finishes in the background
+
+        snapshot = provider_latency.snapshot()
+        assert snapshot['primary']['count'] == 1
+        assert snapshot['secondary']['count'] == 1
+        assert snapshot['secondary']['buckets']['le_25'] == 1
+
+
+def test_latency_histogram_buckets():
+    histogram = LatencyHistogram(buckets=(10, 100))
+    for ms in (5, 10, 50, 500):
+        histogram.observe(ms)
+    snapshot = histogram.snapshot()
+    assert snapshot['buckets'] == {'le_10': 2, 'le_100': 1, 'inf': 1}
+    assert snapshot['count'] == 4
+    assert snapshot['sum_ms'] == 565
+
+
+def test_default_provider_from_settings(settings):
+    settings.CNPJ_PROVIDERS = ['core.services.cnpj.providers.BrasilAPICNPJProvider']
+    provider = default_provider()
+    assert isinstance(provider, CachedCNPJProvider)
+    assert isinstance(provider.provider, BrasilAPICNPJProvider)
+
+    settings.CNPJ_PROVIDERS = [
+        'core.services.cnpj.providers.BrasilAPICNPJProvider',
+        'core.services.cnpj.providers.ReceitaWSCNPJProvider',
+    ]
+    hedged = CNPJService().provider.provider
+    assert isinstance(hedged, HedgedCNPJProvider)
+    assert [type(p) for p in hedged.providers] == [BrasilAPICNPJProvider, ReceitaWSCNPJProvider]
+
+
+class TestReceitaWSProvider:
+    def _provider(self, status_code, payload):
+        session = MagicMock()
+        session.get.return_value = MagicMock(status_code=status_code, json=MagicMock(return_value=payload))
+        return ReceitaWSCNPJProvider(session=session, breaker=CircuitBreaker())
+
+    def test_statuses(self):
+        assert self._provider(200, {'status': 'OK', 'situacao': 'ATIVA'}).validate('11222333000181').valid is True
+        assert self._provider(200, {'status': 'OK', 'situacao': 'BAIXADA'}).validate('11222333000181').status == 'BAIXADA'
+        assert self._provider(200, {'status': 'ERROR', 'message': 'CNPJ inválido'}).validate('11222333000181').status == 'NOT_FOUND'
+        assert self._provider(429, {}).validate('11222333000181').status == 'ERROR'
@@ -0,0 +1,131 @@
+import json
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework import status
+from rest_framework.test import APIClient
+from core.services.cnpj.bulk import parse_cnpj_list, unique_cnpjs, validate_many
+from core.services.cnpj.interfaces import CNPJResult
+
+ACTIVE = '11222333000181'
+OTHER = '12345678000195'
+
+
+class CountingService:
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = []
+
+    def validate_cnpj(self, cnpj):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.calls.append(cnpj)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        return CNPJResult(valid=True, status='ATIVA', message='CNPJ Ativo.')
+
+
+def test_parse_and_dedupe():
+    values = parse_cnpj_list('11.222.333/0001-81\n11222333000181;"12345678000195", 12abc34501de35\n\n')
+    assert unique_cnpjs(values) == [ACTIVE, OTHER, '12ABC34501DE35']
+
+
+def test_validate_many_caps_concurrency():
+    service = CountingService()
+    cnpjs = [f'{i:014d}' for i in range(20)]
+    results = dict(validate_many(service, cnpjs, concurrency=3))
+    assert set(results) == set(cnpjs)
+    assert service.max_in_flight <= 3
+    assert len(service.calls) == 20
+
+
+@pytest.mark.django_db
+class TestValidateCNPJBulkEndpoint:
+    url = '/api/validate-cnpj/bulk/'
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_superuser('admin', 'admin@test.com', 'password')
+
+    def _lines(self, response):
+        return [json.loads(line) for line in b''.join(response.streaming_content).decode('utf-8').splitlines()]
+
+    def test_requires_admin(self):
+        response = self.client.post(self.url, {'cnpjs': [ACTIVE]}, format='json')
+        assert response.status_code in (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN)
+
+        user = User.objects.create_user('user', 'user@test.com', 'password')
+        self.client.force_authenticate(user=user)
+        response = self.client.post(self.url, {'cnpjs': [ACTIVE]}, format='json')
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    @patch('core.services.cnpj.providers.BrasilAPICNPJProvider.validate')
+    def test_json_list_is_deduplicated_and_streamed(self, mock_validate):
+        mock_validate.return_value = CNPJResult(valid=True, status='ATIVA', message='CNPJ Ativo.')
+        self.client.force_authenticate(user=self.admin_user)
+
+        response = self.client.post(
+            self.url, {'cnpjs': [ACTIVE, '11.222.333/0001-81', OTHER, '11222333000182']}, format='json'
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'].startswith('application/x-ndjson')
+        assert response['X-Total-Count'] == '3'
+        lines = {line['cnpj']: line for line in self._lines(response)}
+        assert set(lines) == {ACTIVE, OTHER, '11222333000182'}
+        assert lines[ACTIVE]['status'] == 'ATIVA'
+        # Bad check digits are answered offline
+        assert lines['11222333000182']['status'] == 'INVALID_FORMAT'
+        assert mock_validate.call_count == 2
+
+    @patch('core.services.cnpj.providers.BrasilAPICNPJProvider.validate')
+    def test_uploaded_file(self, mock_validate):
+        mock_validate.return_value = CNPJResult(valid=False, status='BAIXADA', message='CNPJ baixado.')
+        self.client.force_authenticate(user=self.admin_user)
+        upload = SimpleUploadedFile('cnpjs.csv', f'{ACTIVE}\n{OTHER}\n{ACTIVE}\n'.encode('utf-8'))
+
+        response = self.client.post(self.url, {'file': upload}, format='multipart')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert sorted(line['cnpj'] for line in self._lines(response)) == [ACTIVE, OTHER]
+
+    def test_invalid_payloads(self, settings):
+        self.client.force_authenticate(user=self.admin_user)
+        assert self.client.post(self.url, {'cnpjs': ACTIVE}, format='json').status_code == 400
+        assert self.client.post(self.url, {'cnpjs': []}, format='json').status_code == 400
+
+        settings.CNPJ_BULK_MAX_ITEMS = 1
+        response = self.client.post(self.url, {'cnpjs': [ACTIVE, OTHER]}, format='json')
+        assert response.status_code == 400
+
+    @patch('core.services.cnpj.providers.BrasilAPICNPJProvider._fetch')
+    def test_bulk_failures_count_on_their_own_breaker(self, mock_fetch):
+        from core.services.cnpj.providers import default_breaker
+
+        mock_fetch.return_value = CNPJResult(valid=False, status='TIMEOUT', message='Tempo esgotado.')
+        self.client.force_authenticate(user=self.admin_user)
+
+        response = self.client.post(self.url, {'cnpjs': [ACTIVE]}, format='json')
+        self._lines(response)
+
+        assert default_breaker('brasilapi-bulk').failures == 1
+        assert default_breaker('brasilapi').failures == 0
+
+    def test_oversized_file_is_rejected_before_reading(self, settings):
+        settings.CNPJ_BULK_MAX_ITEMS = 2
+        self.client.force_authenticate(user=self.admin_user)
+        upload = SimpleUploadedFile('cnpjs.csv', b'0' * 1024)
+
+        with patch('core.services.cnpj.bulk.parse_cnpj_list') as parse:
+            response = self.client.post(self.url, {'file': upload}, format='multipart')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        parse.assert_not_called()
@@ -40,3 +40,13 @@ class TestValidateCNPJEndpoint:
         response = self.client.get('/api/validate-cnpj/')
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert response.data['status'] == 'MISSING_PARAM'
+
+    @patch('core.services.cnpj.providers.BrasilAPICNPJProvider.validate')
+    def test_validate_cnpj_bad_check_digits_skips_provider(self, mock_provider):
+        """Malformed CNPJs are rejected offline, without an external call"""
+        response = self.client.get('/api/validate-cnpj/?cnpj=11222333000182')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['valid'] is False
+        assert response.data['status'] == 'INVALID_FORMAT'
+        mock_provider.assert_not_called()
@@ -0,0 +1,35 @@
+import pytest
+from core.validators import clean_cnpj, is_valid_cnpj, is_valid_cpf
+
+
+@pytest.mark.parametrize('value', ['52998224725', '529.982.247-25', '12345678909'])
+def test_valid_cpf(value):
+    assert is_valid_cpf(value) is True
+
+
+@pytest.mark.parametrize('value', ['52998224726', '12345678901', '11111111111', '5299822472', '', None])
+def test_invalid_cpf(value):
+    assert is_valid_cpf(value) is False
+
+
+@pytest.mark.parametrize('value', ['11222333000181', '11.222.333/0001-81', '12ABC34501DE35', '12.abc.345/01de-35'])
+def test_valid_cnpj(value):
+    assert is_valid_cnpj(value) is True
+
+
+@pytest.mark.parametrize('value', [
+    '11222333000182',   # wrong check digit
+    '12ABC34501DE36',   # wrong check digit (alphanumeric)
+    '12ABC34501DE3A',   # check digits must be numeric
+    '00000000000000',
+    '1122233300018',
+    '11222333000181X',
+    '',
+    None,
+])
+def test_invalid_cnpj(value):
+    assert is_valid_cnpj(value) is False
+
+
+def test_clean_cnpj_keeps_letters():
+    assert clean_cnpj('12.abc.345/01de-35') == '12ABC34501DE35'
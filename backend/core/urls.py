@@ -1,8 +1,9 @@
 from django.urls import path
-from .views import health_check, test_email_view, validate_cnpj_view
+from .views import health_check, test_email_view, validate_cnpj_view, validate_cnpj_bulk_view
 
 urlpatterns = [
     path('health/', health_check, name='health_check'),
     path('test-email/', test_email_view, name='test_email'),
     path('validate-cnpj/', validate_cnpj_view, name='validate_cnpj'),
+    path('validate-cnpj/bulk/', validate_cnpj_bulk_view, name='validate_cnpj_bulk'),
 ]
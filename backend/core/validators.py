@@ -0,0 +1,46 @@
+"""
+Offline CPF / CNPJ check-digit validation (Receita Federal modulo-11 rules).
+
+CNPJs may be alphanumeric (Receita's format in force since July 2026): the first 12
+characters are digits or uppercase letters, the two check digits stay numeric, and
+every character weighs ord(char) - 48, so numeric CNPJs keep their digits.
+"""
+import re
+
+_CNPJ_BASE = re.compile(r'^[0-9A-Z]{12}[0-9]{2}$')
+_SEPARATORS = re.compile(r'[\s./-]')
+
+
+def clean_cpf(value):
+    return ''.join(filter(str.isdigit, value or ''))
+
+
+def clean_cnpj(value):
+    """Drops the mask characters and uppercases letters; other characters are kept so they fail validation."""
+    return _SEPARATORS.sub('', value or '').upper()
+
+
+def _check_digit(values, weights):
+    remainder = sum(value * weight for value, weight in zip(values, weights)) % 11
+    return 0 if remainder < 2 else 11 - remainder
+
+
+def is_valid_cpf(value):
+    cpf = clean_cpf(value)
+    if len(cpf) != 11 or cpf == cpf[0] * 11:
+        return False
+    digits = [int(char) for char in cpf]
+    first = _check_digit(digits[:9], range(10, 1, -1))
+    second = _check_digit(digits[:10], range(11, 1, -1))
+    return digits[9] == first and digits[10] == second
+
+
+def is_valid_cnpj(value):
+    cnpj = clean_cnpj(value)
+    if not _CNPJ_BASE.match(cnpj) or cnpj == cnpj[0] * 14:
+        return False
+    values = [ord(char) - 48 for char in cnpj]
+    weights = [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+    first = _check_digit(values[:12], weights[1:])
+    second = _check_digit(values[:13], weights)
+    return values[12] == first and values[13] == second
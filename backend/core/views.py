@@ -1,7 +1,10 @@
-from rest_framework.decorators import api_view, permission_classes
+import json
+from rest_framework.decorators import api_view, parser_classes, permission_classes
+from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
 from django.db import connection
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from .services.email.factory import get_email_service
 from django.conf import settings
@@ -122,3 +125,57 @@ def validate_cnpj_view(request):
         "status": result.status,
         "message": result.message
     })
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+@parser_classes([JSONParser, MultiPartParser])
+def validate_cnpj_bulk_view(request):
+    """
+    Admin bulk CNPJ validation.
+    Body: {"cnpjs": [...]} or a multipart 'file' (CNPJs separated by newlines, commas or semicolons).
+    Duplicates are dropped; results are streamed as NDJSON in completion order.
+    """
+    from .services.cnpj.bulk import max_upload_size, parse_cnpj_list, unique_cnpjs, validate_many
+    from .services.cnpj.service import CNPJService, bulk_provider
+
+    upload = request.FILES.get('file')
+    if upload is not None:
+        # Checked before reading: the file is only decoded in memory once it fits the item cap
+        if upload.size > max_upload_size(settings.CNPJ_BULK_MAX_ITEMS):
+            return Response(
+                {"error": f"Arquivo muito grande. Máximo de {settings.CNPJ_BULK_MAX_ITEMS} CNPJs por requisição."},
+                status=400
+            )
+        values = parse_cnpj_list(upload.read().decode('utf-8-sig', errors='replace'))
+    else:
+        values = request.data.get('cnpjs')
+        if not isinstance(values, list):
+            return Response({"error": "Envie 'cnpjs' (lista) ou um arquivo em 'file'."}, status=400)
+
+    cnpjs = unique_cnpjs(values)
+    if not cnpjs:
+        return Response({"error": "Nenhum CNPJ informado."}, status=400)
+    if len(cnpjs) > settings.CNPJ_BULK_MAX_ITEMS:
+        return Response(
+            {"error": f"Máximo de {settings.CNPJ_BULK_MAX_ITEMS} CNPJs por requisição."}, status=400
+        )
+
+    logger.info(
+        "Bulk CNPJ validation started",
+        extra={"event": "cnpj_bulk_start", "user_id": request.user.id, "count": len(cnpjs)}
+    )
+
+    # Own circuit breakers and fewer parallel lookups than public registration traffic
+    service = CNPJService(bulk_provider())
+    lines = (
+        (json.dumps({
+            "cnpj": cnpj,
+            "valid": result.valid,
+            "status": result.status,
+            "message": result.message,
+        }, ensure_ascii=False) + '\n').encode('utf-8')
+        for cnpj, result in validate_many(service, cnpjs, settings.CNPJ_BULK_CONCURRENCY)
+    )
+    response = StreamingHttpResponse(lines, content_type='application/x-ndjson; charset=utf-8')
+    response['X-Total-Count'] = str(len(cnpjs))
+    return response
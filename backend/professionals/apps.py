@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class ProfessionalsConfig(AppConfig):
     name = 'professionals'
+
+    def ready(self):
+        from . import signals  # noqa: F401
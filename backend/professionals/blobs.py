@@ -0,0 +1,103 @@
+"""
+Content-addressed document storage (DOCUMENT_STORAGE_LAYOUT='content_addressed').
+
+Each distinct content is stored once, as a DocumentBlob named after its sha256.
+Documents reference the blob, which counts its references; gc_document_blobs
+deletes blobs that are no longer referenced.
+"""
+import logging
+import os
+from datetime import timedelta
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, Value, When
+from django.utils import timezone
+from .models import Document, DocumentBlob, DOCUMENT_CONTENT_TYPES
+from .uploads import copy_object
+
+logger = logging.getLogger(__name__)
+
+# Blob file extension by sniffed content type ('.jpg' rather than '.jpeg')
+BLOB_EXTENSIONS = {content_type: f'.{extension}' for extension, content_type in reversed(DOCUMENT_CONTENT_TYPES.items())}
+
+
+def acquire_blob(file, sha256, size, content_type, stored_name=None):
+    """
+    DocumentBlob holding this content, with one more reference. The bytes are only
+    written to storage when no blob with this sha256 exists yet: from `file`, or
+    copied within the storage from `stored_name` (an object already uploaded there).
+    """
+    with transaction.atomic():
+        # The row lock keeps a concurrent garbage collection from deleting the blob meanwhile
+        blob = DocumentBlob.objects.select_for_update().filter(sha256=sha256).first()
+        if blob is not None:
+            DocumentBlob.objects.filter(pk=sha256).update(ref_count=F('ref_count') + 1, released_at=None)
+            logger.info("Document blob reused", extra={"event": "document_blob_reused", "sha256": sha256})
+            return blob
+
+        blob = DocumentBlob(sha256=sha256, size=size, content_type=content_type, ref_count=1)
+        extension = BLOB_EXTENSIONS.get(content_type, os.path.splitext(stored_name or file.name)[1])
+        if stored_name:
+            target = blob.file.field.generate_filename(blob, f'{sha256}{extension}')
+            blob.file.name = copy_object(blob.file.storage, stored_name, target)
+        else:
+            blob.file.save(f'{sha256}{extension}', file, save=False)
+        try:
+            with transaction.atomic():
+                blob.save(force_insert=True)
+        except IntegrityError:
+            # Stored concurrently by another upload: drop this copy and reference that one
+            blob.file.delete(save=False)
+            return acquire_blob(file, sha256, size, content_type, stored_name)
+        logger.info("Document blob stored", extra={"event": "document_blob_stored", "sha256": sha256, "size": size})
+        return blob
+
+
+def release_blob(sha256):
+    """Drops one reference; a blob reaching zero is left for gc_document_blobs."""
+    DocumentBlob.objects.filter(pk=sha256, ref_count__gt=0).update(
+        ref_count=F('ref_count') - 1,
+        released_at=Case(When(ref_count=1, then=Value(timezone.now())), default=F('released_at')),
+    )
+
+
+def recount_references():
+    """Resets ref_count from the Document rows (repairs drift). Returns the number of blobs fixed."""
+    now = timezone.now()
+    drifted = DocumentBlob.objects.annotate(actual=Count('documents')).exclude(ref_count=F('actual'))
+    fixed = 0
+    for blob in drifted.only('sha256', 'ref_count'):
+        DocumentBlob.objects.filter(pk=blob.pk).update(
+            ref_count=blob.actual, released_at=now if blob.actual == 0 else None
+        )
+        fixed += 1
+    return fixed
+
+
+def collect_garbage(grace_seconds, dry_run=False):
+    """
+    Deletes blobs unreferenced for at least `grace_seconds`, file first and then
+    row, one blob per transaction. Returns (blobs deleted, bytes freed).
+    """
+    cutoff = timezone.now() - timedelta(seconds=grace_seconds)
+    candidates = DocumentBlob.objects.filter(ref_count=0, released_at__lte=cutoff).values_list('sha256', flat=True)
+    deleted = freed = 0
+    for sha256 in list(candidates):
+        with transaction.atomic():
+            # Re-checked under the row lock: an upload may have referenced it again
+            blob = DocumentBlob.objects.select_for_update().filter(pk=sha256, ref_count=0).first()
+            if blob is None or Document.objects.filter(blob=blob).exists():
+                continue
+            if not dry_run:
+                # If the storage delete fails the row stays and the next run retries
+                for field in (blob.preview, blob.thumbnail):
+                    if field:
+                        field.delete(save=False)
+                blob.file.delete(save=False)
+                blob.delete()
+        deleted += 1
+        freed += blob.size
+        logger.info(
+            "Document blob collected",
+            extra={"event": "document_blob_collected", "sha256": sha256, "size": blob.size, "dry_run": dry_run}
+        )
+    return deleted, freed
@@ -0,0 +1,303 @@
+from datetime import datetime, time, timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Avg, Sum, F, Q
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+from .models import Professional, DailyRegistrationStats, DailyStatsRefresh
+
+FINALIZED_STATUSES = ['APPROVED', 'REJECTED']
+
+# Finalized rows with a review date (the ones averaged by the dashboard)
+REVIEWED = Q(status__in=FINALIZED_STATUSES) & (Q(approved_at__isnull=False) | Q(rejected_at__isnull=False))
+ANALYSIS_DURATION = Coalesce('approved_at', 'rejected_at') - F('submission_date')
+
+# Payloads are stored under a versioned key: bumping the version invalidates them,
+# including a payload still being computed when the change happened
+DASHBOARD_CACHE_VERSION_KEY = 'dashboard:version'
+DASHBOARD_CACHE_KEY = 'dashboard:payload:{version}'
+
+# Changes are looked up slightly before the previous run to catch rows committed during it
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+
+def month_starts(start, end):
+    """Local month boundaries (same values as TruncMonth) from the month of `start` through `end`."""
+    tz = timezone.get_current_timezone()
+    local_start = timezone.localtime(start, tz)
+    year, month = local_start.year, local_start.month
+    boundaries = []
+    while True:
+        boundary = timezone.make_aware(datetime(year, month, 1), tz)
+        boundaries.append(boundary)
+        if boundary > end:
+            return boundaries
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def professional_metrics(now=None):
+    """
+    Professional-side dashboard metrics computed in a single table scan with
+    conditional aggregation. Returns the same structures the former per-metric
+    queries produced.
+    """
+    now = now or timezone.now()
+    windows = {f'last_{days}_days': now - timedelta(days=days) for days in (30, 60, 90)}
+    one_year_ago = now - timedelta(days=365)
+
+    # 12-month trend: one bucket per local month, first bucket clipped to one_year_ago
+    boundaries = month_starts(one_year_ago, now)
+    months = boundaries[:-1]
+
+    aggregates = {'total': Count('id')}
+    for key, since in windows.items():
+        aggregates[key] = Count('id', filter=Q(submission_date__gte=since))
+    for code, _ in Professional.STATUS_CHOICES:
+        aggregates[f'status_{code}'] = Count('id', filter=Q(status=code))
+    for index, month in enumerate(months):
+        aggregates[f'month_{index}'] = Count('id', filter=Q(
+            submission_date__gte=max(month, one_year_ago),
+            submission_date__lt=boundaries[index + 1],
+        ))
+
+    # Average Analysis Time: diff between submission and approval/rejection
+    aggregates['avg_time'] = Avg(
+        Coalesce('approved_at', 'rejected_at') - F('submission_date'),
+        filter=Q(status__in=FINALIZED_STATUSES),
+    )
+
+    data = Professional.objects.order_by().aggregate(**aggregates)
+
+    avg_time = data['avg_time']
+    avg_time_seconds = avg_time.total_seconds() if avg_time else 0
+
+    return {
+        'total_registrations': data['total'],
+        **{key: data[key] for key in windows},
+        'status_counts': [
+            {'status': code, 'count': data[f'status_{code}']}
+            for code, _ in Professional.STATUS_CHOICES
+            if data[f'status_{code}']
+        ],
+        'yearly_variation': [
+            {'month': month, 'count': data[f'month_{index}']}
+            for index, month in enumerate(months)
+            if data[f'month_{index}']
+        ],
+        'avg_analysis_time_days': round(avg_time_seconds / 86400, 1),
+    }
+
+
+def local_day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min), timezone.get_current_timezone())
+
+
+def _day_ranges(days):
+    """Groups sorted dates into (first, last) runs of consecutive days."""
+    ranges = []
+    for day in days:
+        if ranges and day == ranges[-1][1] + timedelta(days=1):
+            ranges[-1][1] = day
+        else:
+            ranges.append([day, day])
+    return ranges
+
+
+def _submission_days_q(days):
+    q = Q()
+    for first, last in _day_ranges(days):
+        q |= Q(submission_date__gte=local_day_start(first), submission_date__lt=local_day_start(last + timedelta(days=1)))
+    return q
+
+
+def _rollup_days_q(days):
+    q = Q()
+    for first, last in _day_ranges(days):
+        q |= Q(day__gte=first, day__lte=last)
+    return q
+
+
+def refresh_daily_stats(full=False):
+    """
+    Rebuilds DailyRegistrationStats for the submission days whose rows changed
+    (last_status_update) since the previous run, or for every day when `full`.
+    Deleted registrations are only picked up by a full refresh.
+    """
+    started_at = timezone.now()
+    last_refresh = DailyStatsRefresh.objects.order_by('-started_at').first()
+    full = full or last_refresh is None
+
+    rows = Professional.objects.order_by()
+    days = None
+    if not full:
+        changed = rows.filter(last_status_update__gte=last_refresh.started_at - REFRESH_OVERLAP)
+        days = sorted(set(
+            changed.annotate(day=TruncDate('submission_date')).values_list('day', flat=True)
+        ))
+        if not days:
+            return DailyStatsRefresh.objects.create(started_at=started_at, days_refreshed=0)
+        rows = rows.filter(_submission_days_q(days))
+
+    grouped = rows.annotate(day=TruncDate('submission_date')).values('day', 'status', 'person_type').annotate(
+        total=Count('id'),
+        analyzed=Count('id', filter=REVIEWED),
+        duration=Sum(ANALYSIS_DURATION, filter=REVIEWED),
+    )
+    stats = [
+        DailyRegistrationStats(
+            day=row['day'],
+            status=row['status'],
+            person_type=row['person_type'],
+            count=row['total'],
+            analyzed_count=row['analyzed'],
+            analysis_seconds=row['duration'].total_seconds() if row['duration'] else 0,
+        )
+        for row in grouped
+    ]
+
+    with transaction.atomic():
+        stale = DailyRegistrationStats.objects.all()
+        if not full:
+            stale = stale.filter(_rollup_days_q(days))
+        stale.delete()
+        DailyRegistrationStats.objects.bulk_create(stats, batch_size=1000)
+        days_refreshed = len({stat.day for stat in stats}) if full else len(days)
+        return DailyStatsRefresh.objects.create(started_at=started_at, days_refreshed=days_refreshed, full=full)
+
+
+def status_metrics():
+    """
+    Status counts and average analysis time, always read live: a status change does not
+    move a row to another submission day, so the rollup cannot follow it. Both queries
+    are index-only scans (prof_status_submitted_idx, prof_finalized_idx).
+    """
+    counts = dict(Professional.objects.order_by().values_list('status').annotate(count=Count('*')))
+    avg_time = Professional.objects.filter(status__in=FINALIZED_STATUSES).order_by().aggregate(
+        avg=Avg(ANALYSIS_DURATION)
+    )['avg']
+    avg_time_seconds = avg_time.total_seconds() if avg_time else 0
+    return {
+        'status_counts': [
+            {'status': code, 'count': counts[code]}
+            for code, _ in Professional.STATUS_CHOICES
+            if counts.get(code)
+        ],
+        'avg_analysis_time_days': round(avg_time_seconds / 86400, 1),
+    }
+
+
+def rollup_metrics(now=None):
+    """
+    Dashboard metrics with the submission counts read from DailyRegistrationStats.
+    Days before the last refresh come from the rollup; rows submitted since that day
+    and the partial boundary day of each window are counted live, so the result
+    matches professional_metrics() for everything the rollup has seen. Status counts
+    and the average analysis time come from status_metrics(). Falls back to
+    professional_metrics() until the rollup has been built once.
+    """
+    now = now or timezone.now()
+    last_refresh = DailyStatsRefresh.objects.order_by('-started_at').first()
+    if last_refresh is None:
+        return professional_metrics(now)
+
+    cutoff_day = timezone.localdate(last_refresh.started_at)
+    fresh = Q(submission_date__gte=local_day_start(cutoff_day))
+
+    windows = {f'last_{days}_days': now - timedelta(days=days) for days in (30, 60, 90)}
+    one_year_ago = now - timedelta(days=365)
+    boundaries = month_starts(one_year_ago, now)
+    months = boundaries[:-1]
+
+    def boundary_day(since):
+        # Whole days after the boundary come from the rollup, the boundary day itself is read live
+        day = timezone.localdate(since)
+        partial = Q(submission_date__gte=since, submission_date__lt=local_day_start(day + timedelta(days=1)))
+        return day, partial
+
+    stored_aggregates = {'total': Sum('count')}
+    live_aggregates = {'total': Count('id', filter=fresh)}
+    live_scope = fresh
+
+    for key, since in windows.items():
+        day, partial = boundary_day(since)
+        stored_aggregates[key] = Sum('count', filter=Q(day__gt=day))
+        live_aggregates[key] = Count('id', filter=partial | (fresh & Q(submission_date__gte=since)))
+        live_scope |= partial
+
+    year_day, year_partial = boundary_day(one_year_ago)
+    live_scope |= year_partial
+    for index, month in enumerate(months):
+        end = boundaries[index + 1]
+        stored_aggregates[f'month_{index}'] = Sum('count', filter=Q(
+            day__gt=year_day, day__gte=timezone.localdate(month), day__lt=timezone.localdate(end),
+        ))
+        in_month = Q(submission_date__gte=max(month, one_year_ago), submission_date__lt=end)
+        live_aggregates[f'month_{index}'] = Count('id', filter=in_month & (year_partial | fresh))
+
+    stored = DailyRegistrationStats.objects.filter(day__lt=cutoff_day).order_by().aggregate(**stored_aggregates)
+    live = Professional.objects.filter(live_scope).order_by().aggregate(**live_aggregates)
+
+    def combined(key):
+        return (stored[key] or 0) + (live[key] or 0)
+
+    return {
+        'total_registrations': combined('total'),
+        **{key: combined(key) for key in windows},
+        'yearly_variation': [
+            {'month': month, 'count': combined(f'month_{index}')}
+            for index, month in enumerate(months)
+            if combined(f'month_{index}')
+        ],
+        **status_metrics(),
+    }
+
+
+def analyzed_logs(now):
+    """Admin actions of the current local month, as a half-open range on (action, timestamp)."""
+    from audit.models import AuditLog
+    month_start, next_month_start = month_starts(now, now)
+    return AuditLog.objects.filter(
+        action__in=['STATUS_CHANGE', 'UPDATE'],
+        timestamp__gte=month_start,
+        timestamp__lt=next_month_start,
+    )
+
+
+def dashboard_payload(now=None):
+    now = now or timezone.now()
+
+    # Professional-side metrics: DailyRegistrationStats rollup + rows since its last refresh
+    metrics = rollup_metrics(now)
+
+    # Efficiency (Analyzed this month)
+    # Count unique professionals whose status changed or was updated restricted to admin actions
+    analyzed_this_month = analyzed_logs(now).values('target_id').distinct().count()
+
+    return {
+        'total_registrations': metrics['total_registrations'],
+        'last_30_days': metrics['last_30_days'],
+        'last_60_days': metrics['last_60_days'],
+        'last_90_days': metrics['last_90_days'],
+        'status_counts': metrics['status_counts'],
+        'yearly_variation': metrics['yearly_variation'],
+        'analyzed_this_month': analyzed_this_month,
+        'avg_analysis_time_days': metrics['avg_analysis_time_days'],
+    }
+
+
+def cached_dashboard_payload():
+    version = cache.get_or_set(DASHBOARD_CACHE_VERSION_KEY, 0, None)
+    key = DASHBOARD_CACHE_KEY.format(version=version)
+    payload = cache.get(key)
+    if payload is None:
+        payload = dashboard_payload()
+        cache.set(key, payload, settings.DASHBOARD_CACHE_TTL)
+    return payload
+
+
+def invalidate_dashboard_cache():
+    try:
+        cache.incr(DASHBOARD_CACHE_VERSION_KEY)
+    except ValueError:
+        cache.set(DASHBOARD_CACHE_VERSION_KEY, 1, None)
@@ -0,0 +1,441 @@
+import csv
+import hashlib
+import json
+import logging
+import re
+import tempfile
+import zipfile
+from datetime import timedelta
+from itertools import chain, islice
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Professional
+
+logger = logging.getLogger(__name__)
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+CSV_CONTENT_TYPE = 'text/csv; charset=utf-8'
+NDJSON_CONTENT_TYPE = 'application/x-ndjson; charset=utf-8'
+
+# Rows are fetched from the database in chunks of this size
+EXPORT_CHUNK_SIZE = 2000
+
+# Column widths are estimated from the header plus this many leading rows
+WIDTH_SAMPLE_SIZE = 200
+
+# Bytes accumulated before a chunk is handed to the response
+STREAM_FLUSH_SIZE = 64 * 1024
+
+# Strategy A: Universal columns + Specific columns
+# (key used by NDJSON, header used by XLSX/CSV)
+EXPORT_SCHEMA = [
+    ('submission_date', 'Data Envio'),
+    ('status', 'Status'),
+    ('person_type', 'Tipo'),
+    ('name', 'Nome / Razão Social'),
+    ('company_name', 'Nome Fantasia'),
+    ('cpf', 'CPF'),
+    ('cnpj', 'CNPJ'),
+    ('birth_date', 'Data Nascimento / Abertura'),
+    ('technical_manager_name', 'Nome Resp. Técnico'),
+    ('technical_manager_cpf', 'CPF Resp. Técnico'),
+    ('email', 'Email'),
+    ('phone', 'Telefone'),
+    ('zip_code', 'CEP'),
+    ('street', 'Logradouro'),
+    ('number', 'Número'),
+    ('complement', 'Complemento'),
+    ('neighborhood', 'Bairro'),
+    ('city', 'Cidade'),
+    ('state', 'UF'),
+    ('education', 'Formação'),
+    ('institution', 'Instituição'),
+    ('graduation_year', 'Ano Conclusão'),
+    ('council_name', 'Conselho'),
+    ('council_number', 'Nº Conselho'),
+    ('area_of_action', 'Área Atuação'),
+    ('experience_years', 'Experiência (anos)'),
+    ('reviewed_at', 'Data Aprovação/Reprovação'),
+    ('reviewed_by', 'Responsável Análise'),
+]
+
+EXPORT_COLUMNS = [header for _, header in EXPORT_SCHEMA]
+EXPORT_KEYS = [key for key, _ in EXPORT_SCHEMA]
+
+# Columns read from the database to build one export row
+EXPORT_FIELDS = [
+    'submission_date', 'status', 'person_type', 'name', 'company_name', 'cpf', 'cnpj', 'birth_date',
+    'technical_manager_name', 'technical_manager_cpf', 'email', 'phone',
+    'zip_code', 'street', 'number', 'complement', 'neighborhood', 'city', 'state',
+    'education', 'institution', 'graduation_year', 'council_name', 'council_number',
+    'area_of_action', 'experience_years',
+    'approved_at', 'rejected_at', 'approved_by__username', 'rejected_by__username',
+]
+
+STATUS_LABELS = dict(Professional.STATUS_CHOICES)
+PERSON_TYPE_LABELS = dict(Professional.PERSON_TYPE_CHOICES)
+
+
+def format_record(record):
+    """Builds the export row (EXPORT_SCHEMA order) from a dict keyed by EXPORT_FIELDS."""
+    approval_date = record['approved_at'] or record['rejected_at']
+    reviewer_name = record['approved_by__username'] or record['rejected_by__username'] or '-'
+
+    # Format dates
+    submission_date = record['submission_date']
+    birth_date = record['birth_date']
+    submission_date_str = submission_date.strftime('%d/%m/%Y %H:%M') if submission_date else '-'
+    approval_date_str = approval_date.strftime('%d/%m/%Y %H:%M') if approval_date else '-'
+    birth_date_str = birth_date.strftime('%d/%m/%Y') if birth_date else '-'
+
+    # Determine fields based on type
+    is_pj = record['person_type'] == 'PJ'
+
+    return [
+        submission_date_str,
+        STATUS_LABELS.get(record['status'], record['status']),
+        PERSON_TYPE_LABELS.get(record['person_type'], record['person_type']), # PF or PJ
+        record['name'],
+        record['company_name'] if is_pj else '-',
+        record['cpf'] if not is_pj else '-',
+        record['cnpj'] if is_pj else '-',
+        birth_date_str,
+        record['technical_manager_name'] if is_pj else '-',
+        record['technical_manager_cpf'] if is_pj else '-',
+        record['email'],
+        record['phone'],
+        record['zip_code'],
+        record['street'],
+        record['number'],
+        record['complement'] or '-',
+        record['neighborhood'],
+        record['city'],
+        record['state'],
+        record['education'],
+        record['institution'],
+        record['graduation_year'],
+        record['council_name'],
+        record['council_number'],
+        record['area_of_action'] or '-',
+        record['experience_years'],
+        approval_date_str,
+        reviewer_name
+    ]
+
+
+def value_rows(queryset):
+    """
+    Rows read with values_list(): only the rendered columns are selected and the
+    reviewer usernames are joined in the same query, so the export costs one query.
+    """
+    values = queryset.values_list(*EXPORT_FIELDS).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    for record in values:
+        yield format_record(dict(zip(EXPORT_FIELDS, record)))
+
+
+class _Echo:
+    """File-like object for csv.writer that returns the line instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def _batched(lines):
+    batch = []
+    size = 0
+    for line in lines:
+        batch.append(line)
+        size += len(line)
+        if size >= STREAM_FLUSH_SIZE:
+            yield b''.join(batch)
+            batch = []
+            size = 0
+    if batch:
+        yield b''.join(batch)
+
+
+def stream_csv(rows, columns):
+    writer = csv.writer(_Echo())
+    lines = chain([columns], rows)
+    return _batched(writer.writerow(row).encode('utf-8') for row in lines)
+
+
+def stream_ndjson(rows, keys):
+    lines = (
+        (json.dumps(dict(zip(keys, row)), ensure_ascii=False) + '\n').encode('utf-8')
+        for row in rows
+    )
+    return _batched(lines)
+
+
+# XML 1.0 forbids most control characters; Excel refuses files containing them
+_ILLEGAL_XML_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_CONTENT_TYPES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+
+_ROOT_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{title}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+_WORKBOOK_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+_STYLES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+_SHEET_HEADER_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+)
+
+
+class _StreamBuffer:
+    """Write-only sink for zipfile; its content is drained into the response."""
+
+    def __init__(self):
+        self._chunks = []
+        self.size = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        self.size = 0
+        return data
+
+
+def _column_letter(index):
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _cell_xml(reference, value):
+    if value is None:
+        return ''
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f'<c r="{reference}"><v>{value}</v></c>'
+    text = escape(_ILLEGAL_XML_CHARS.sub('', str(value)))
+    return f'<c r="{reference}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _row_xml(row_number, values, letters):
+    cells = ''.join(
+        _cell_xml(f'{letter}{row_number}', value)
+        for letter, value in zip(letters, values)
+    )
+    return f'<row r="{row_number}">{cells}</row>'.encode('utf-8')
+
+
+def _estimate_widths(rows):
+    widths = [0] * len(rows[0])
+    for row in rows:
+        for index, value in enumerate(row):
+            length = len(str(value)) if value is not None else 0
+            widths[index] = max(widths[index], length)
+    return [width + 2 for width in widths]
+
+
+def stream_xlsx(rows, columns, sheet_title='Sheet1'):
+    """
+    Yields an XLSX file (one worksheet, inline strings) chunk by chunk.
+    Only the width sample is kept in memory, so the output size does not
+    affect memory usage.
+    """
+    rows = iter(rows)
+    sample = [list(columns)] + list(islice(rows, WIDTH_SAMPLE_SIZE))
+    letters = [_column_letter(index) for index in range(len(columns))]
+
+    buffer = _StreamBuffer()
+    with zipfile.ZipFile(buffer, mode='w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', _CONTENT_TYPES_XML)
+        archive.writestr('_rels/.rels', _ROOT_RELS_XML)
+        archive.writestr('xl/workbook.xml', _WORKBOOK_XML.format(title=escape(sheet_title, {'"': '&quot;'})))
+        archive.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS_XML)
+        archive.writestr('xl/styles.xml', _STYLES_XML)
+
+        with archive.open('xl/worksheets/sheet1.xml', mode='w') as sheet:
+            cols = ''.join(
+                f'<col min="{index}" max="{index}" width="{width}" customWidth="1"/>'
+                for index, width in enumerate(_estimate_widths(sample), start=1)
+            )
+            sheet.write(f'{_SHEET_HEADER_XML}<cols>{cols}</cols><sheetData>'.encode('utf-8'))
+
+            for row_number, values in enumerate(chain(sample, rows), start=1):
+                sheet.write(_row_xml(row_number, values, letters))
+                if buffer.size >= STREAM_FLUSH_SIZE:
+                    yield buffer.drain()
+
+            sheet.write(b'</sheetData></worksheet>')
+
+    yield buffer.drain()
+
+
+# Background export jobs
+
+def export_filters_hash(export_format, filters):
+    payload = json.dumps([export_format, filters], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def filtered_professionals(filters):
+    """
+    Rebuilds the queryset of ProfessionalViewSet for the stored query parameters,
+    so a job exports exactly what export_excel would have returned.
+    """
+    from django.http import HttpRequest, QueryDict
+    from rest_framework.request import Request
+    from .views import ProfessionalViewSet
+
+    http_request = HttpRequest()
+    http_request.GET = QueryDict(mutable=True)
+    http_request.GET.update(filters)
+    request = Request(http_request)
+
+    view = ProfessionalViewSet(request=request, action='export_excel', format_kwarg=None, args=(), kwargs={})
+    return view.filter_queryset(view.get_queryset())
+
+
+def stale_before():
+    """Jobs pending or running since before this moment are considered abandoned."""
+    return timezone.now() - timedelta(seconds=settings.EXPORT_JOB_TIMEOUT_SECONDS)
+
+
+def claim_next_job():
+    """
+    Marks the oldest pending job as running and returns it (None if the queue is empty).
+    Jobs left RUNNING by a worker that died (OOM, deploy) are claimed again once stale.
+    """
+    from .models import ExportJob
+
+    with transaction.atomic():
+        job = (
+            ExportJob.objects.select_for_update(skip_locked=True)
+            .filter(Q(status='PENDING') | Q(status='RUNNING', started_at__lt=stale_before()))
+            .order_by('created_at')
+            .first()
+        )
+        if job is None:
+            return None
+        if job.status == 'RUNNING':
+            logger.warning(
+                "Reclaiming stale export job",
+                extra={"event": "export_job_reclaimed", "job_id": str(job.id), "started_at": str(job.started_at)}
+            )
+        job.status = 'RUNNING'
+        job.started_at = timezone.now()
+        job.processed_rows = 0
+        job.save(update_fields=['status', 'started_at', 'processed_rows'])
+    return job
+
+
+def _track_progress(rows, job):
+    from .models import ExportJob
+
+    processed = 0
+    for processed, row in enumerate(rows, start=1):
+        yield row
+        if processed % EXPORT_CHUNK_SIZE == 0:
+            ExportJob.objects.filter(pk=job.pk).update(processed_rows=processed)
+    job.processed_rows = processed
+
+
+def run_export_job(job):
+    """Builds the export file of a claimed job and stores it in the default storage."""
+    try:
+        queryset = filtered_professionals(job.filters)
+        job.total_rows = queryset.count()
+        job.save(update_fields=['total_rows'])
+
+        rows = _track_progress(value_rows(queryset), job)
+        if job.export_format == 'xlsx':
+            chunks = stream_xlsx(rows, EXPORT_COLUMNS, sheet_title='Profissionais')
+        elif job.export_format == 'csv':
+            chunks = stream_csv(rows, EXPORT_COLUMNS)
+        else:
+            chunks = stream_ndjson(rows, EXPORT_KEYS)
+
+        with tempfile.TemporaryFile() as tmp:
+            for chunk in chunks:
+                tmp.write(chunk)
+            tmp.seek(0)
+            job.file.save(f'profissionais_{job.id}.{job.export_format}', File(tmp), save=False)
+
+        job.status = 'DONE'
+        job.finished_at = timezone.now()
+        job.save(update_fields=['file', 'status', 'processed_rows', 'finished_at'])
+
+        logger.info(
+            "Export job finished",
+            extra={"event": "export_job_done", "job_id": str(job.id), "rows": job.processed_rows}
+        )
+    except Exception as e:
+        job.status = 'FAILED'
+        job.error = str(e)
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'finished_at'])
+        logger.error(
+            "Export job failed",
+            extra={"event": "export_job_failed", "job_id": str(job.id), "error": str(e)}
+        )
+    return job
@@ -0,0 +1,53 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from professionals.models import Document, file_metadata
+
+logger = logging.getLogger(__name__)
+
+
+def read_metadata(document):
+    """Runs in a worker thread: storage I/O only, no database access."""
+    try:
+        with document.file.open('rb') as f:
+            return document, file_metadata(f)
+    except Exception as e:
+        logger.warning(f"Could not read document {document.id}: {str(e)}")
+        return document, None
+
+
+class Command(BaseCommand):
+    help = 'Fills size, sha256 and content_type of documents uploaded before they were recorded or sent straight to S3'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument('--workers', type=int, default=8, help='Concurrent storage reads')
+
+    def handle(self, *args, **options):
+        # Direct-to-S3 uploads (documents/finalize/) are recorded without a digest
+        pending = Document.objects.filter(Q(size__isnull=True) | Q(sha256='')).only('id', 'file').order_by('id')
+        updated = failed = 0
+        last_id = None
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            while True:
+                batch_qs = pending if last_id is None else pending.filter(id__gt=last_id)
+                batch = list(batch_qs[:options['batch_size']])
+                if not batch:
+                    break
+                last_id = batch[-1].id
+
+                changed = []
+                for document, metadata in executor.map(read_metadata, batch):
+                    if metadata is None:
+                        failed += 1
+                        continue
+                    document.size, document.sha256, document.content_type = metadata
+                    changed.append(document)
+
+                Document.objects.bulk_update(changed, ['size', 'sha256', 'content_type'])
+                updated += len(changed)
+                self.stdout.write(f'{updated} documents updated...')
+
+        self.stdout.write(self.style.SUCCESS(f'Backfill finished: {updated} updated, {failed} unreadable.'))
@@ -0,0 +1,114 @@
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count, Avg, F
+from django.db.models.functions import Coalesce, TruncMonth
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from professionals.dashboard import professional_metrics
+from professionals.models import Professional
+
+
+def seed_professionals(rows, batch_size):
+    """Bulk-creates `rows` professionals with submissions and reviews spread over two years."""
+    now = timezone.now()
+    statuses = [code for code, _ in Professional.STATUS_CHOICES]
+
+    for offset in range(0, rows, batch_size):
+        batch = []
+        for _ in range(min(batch_size, rows - offset)):
+            submitted = now - timedelta(seconds=random.randint(0, 2 * 365 * 86400))
+            status = random.choice(statuses)
+            reviewed = submitted + timedelta(hours=random.randint(1, 24 * 30))
+            batch.append(Professional(
+                name='Benchmark', cpf=f'{random.randint(0, 10**11 - 1):011d}',
+                email='benchmark@example.com', phone='11999999999', birth_date=date(1990, 1, 1),
+                zip_code='00000000', street='Rua', number='1', neighborhood='Centro',
+                city='Cidade', state='SP', education='Enfermeiro', institution='USP',
+                graduation_year=2015, council_name='COREN', council_number='1', experience_years=5,
+                status=status, submission_date=submitted,
+                approved_at=reviewed if status == 'APPROVED' else None,
+                rejected_at=reviewed if status == 'REJECTED' else None,
+            ))
+        submitted_dates = [professional.submission_date for professional in batch]
+        Professional.objects.bulk_create(batch)
+        # submission_date is auto_now_add (overwritten on insert); bulk_update writes the spread dates back
+        for professional, submitted in zip(batch, submitted_dates):
+            professional.submission_date = submitted
+        Professional.objects.bulk_update(batch, ['submission_date'], batch_size=1000)
+
+
+def legacy_metrics(now):
+    """Former DashboardViewSet implementation: one query per metric."""
+    metrics = {
+        'total_registrations': Professional.objects.count(),
+        'status_counts': list(Professional.objects.values('status').annotate(count=Count('id'))),
+    }
+    for days in (30, 60, 90):
+        metrics[f'last_{days}_days'] = Professional.objects.filter(
+            submission_date__gte=now - timedelta(days=days)
+        ).count()
+    metrics['yearly_variation'] = list(Professional.objects.filter(
+        submission_date__gte=now - timedelta(days=365)
+    ).annotate(month=TruncMonth('submission_date')).values('month').annotate(count=Count('id')).order_by('month'))
+    metrics['avg_time'] = Professional.objects.filter(
+        status__in=['APPROVED', 'REJECTED']
+    ).annotate(end_date=Coalesce('approved_at', 'rejected_at')).aggregate(
+        avg_time=Avg(F('end_date') - F('submission_date'))
+    )['avg_time']
+    return metrics
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds professionals inside a transaction (rolled back unless --keep) and compares '
+        'the legacy per-metric dashboard queries with the single-pass aggregation'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000)
+        parser.add_argument('--batch-size', type=int, default=10_000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--keep', action='store_true', help='Keep the seeded rows (DEBUG only)')
+        parser.add_argument(
+            '--i-know-this-writes', action='store_true',
+            help='Run with DEBUG off: the seed inserts --rows fake registrations into the configured database'
+        )
+
+    def handle(self, *args, **options):
+        if not (settings.DEBUG or options['i_know_this_writes']):
+            raise CommandError(
+                'benchmark_dashboard seeds fake registrations into the professionals table. '
+                'Run it against a copy of the database, or pass --i-know-this-writes.'
+            )
+        if options['keep'] and not settings.DEBUG:
+            raise CommandError('--keep would commit the fake registrations; it is only allowed with DEBUG on.')
+
+        with transaction.atomic():
+            self.stdout.write(f"Seeding {options['rows']} professionals...")
+            seed_professionals(options['rows'], options['batch_size'])
+
+            now = timezone.now()
+            for label, func in (('legacy', legacy_metrics), ('single-pass', professional_metrics)):
+                timings, queries = self._measure(func, now, options['repeat'])
+                self.stdout.write(
+                    f'{label:12} queries={queries:2d} '
+                    f'median={statistics.median(timings):9.1f} ms  min={min(timings):9.1f} ms'
+                )
+
+            if not options['keep']:
+                transaction.set_rollback(True)
+
+    def _measure(self, func, now, repeat):
+        timings = []
+        with CaptureQueriesContext(connection) as ctx:
+            func(now)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(now)
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings, len(ctx.captured_queries)
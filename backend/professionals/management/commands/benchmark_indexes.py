@@ -0,0 +1,132 @@
+import json
+import statistics
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Avg
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from professionals.dashboard import ANALYSIS_DURATION, FINALIZED_STATUSES
+from professionals.management.commands.benchmark_dashboard import seed_professionals
+from professionals.models import Professional
+
+# Indexes added by migration 0014, dropped (inside the rolled-back transaction) for the "before" run
+QUERY_INDEXES = [
+    'prof_cpf_submitted_idx',
+    'prof_submitted_idx',
+    'prof_status_submitted_idx',
+    'prof_pending_idx',
+    'prof_finalized_idx',
+]
+
+
+def hot_queries(cpf, now):
+    """(label, queryset, terminal method) for the query patterns the indexes target."""
+    page = 51  # KeysetPagination page size + 1
+    return [
+        ('duplicate_cpf_check', Professional.objects.filter(
+            cpf=cpf, submission_date__gte=now - timedelta(days=90)
+        ), 'exists'),
+        ('default_list', Professional.objects.order_by('-submission_date', '-id')[:page], 'list'),
+        ('status_list', Professional.objects.filter(status='APPROVED').order_by('-submission_date', '-id')[:page], 'list'),
+        ('pending_queue', Professional.objects.filter(status='PENDING').order_by('-submission_date', '-id')[:page], 'list'),
+        ('finalized_avg', Professional.objects.filter(status__in=FINALIZED_STATUSES).order_by(), 'avg'),
+    ]
+
+
+def run_query(queryset, terminal):
+    if terminal == 'exists':
+        return queryset.exists()
+    if terminal == 'avg':
+        return queryset.aggregate(avg=Avg(ANALYSIS_DURATION))
+    return list(queryset.all())
+
+
+def explain(queryset, terminal):
+    """Plan of the exact statement run_query() sends, captured from the connection."""
+    with CaptureQueriesContext(connection) as ctx:
+        run_query(queryset, terminal)
+    sql = ctx.captured_queries[-1]['sql']
+    prefix = 'EXPLAIN ANALYZE' if connection.vendor == 'postgresql' else 'EXPLAIN QUERY PLAN'
+    with connection.cursor() as cursor:
+        cursor.execute(f'{prefix} {sql}')
+        return '\n'.join(' '.join(str(col) for col in row) for row in cursor.fetchall())
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds professionals inside a transaction (always rolled back) and records the plan '
+        'and timing of the hot professional queries without and with the composite/partial indexes'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000)
+        parser.add_argument('--batch-size', type=int, default=10_000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--output', help='Write the plans and timings as JSON to this file')
+        parser.add_argument(
+            '--i-know-this-locks', action='store_true',
+            help='Run with DEBUG off: dropping the indexes locks the professionals table (ACCESS EXCLUSIVE '
+                 'on PostgreSQL) until the rollback, blocking every read and write of it'
+        )
+
+    def handle(self, *args, **options):
+        if not (settings.DEBUG or options['i_know_this_locks']):
+            raise CommandError(
+                'benchmark_indexes drops indexes of the professionals table and holds an exclusive lock on it '
+                'for the whole run. Run it against a copy of the database, or pass --i-know-this-locks.'
+            )
+
+        report = {'vendor': connection.vendor, 'rows': options['rows'], 'queries': {}}
+
+        with transaction.atomic():
+            self.stdout.write(f"Seeding {options['rows']} professionals...")
+            seed_professionals(options['rows'], options['batch_size'])
+            cpf = Professional.objects.values_list('cpf', flat=True).first()
+            now = timezone.now()
+
+            indexes = [index for index in Professional._meta.indexes if index.name in QUERY_INDEXES]
+            # Only used to render DDL: entering it is not allowed on SQLite inside atomic()
+            editor = connection.schema_editor()
+            self._execute(index.remove_sql(Professional, editor) for index in indexes)
+            self._analyze()
+            self._record(report, 'before', hot_queries(cpf, now), options['repeat'])
+
+            self._execute(index.create_sql(Professional, editor) for index in indexes)
+            self._analyze()
+            self._record(report, 'after', hot_queries(cpf, now), options['repeat'])
+
+            transaction.set_rollback(True)
+
+        for label, runs in report['queries'].items():
+            self.stdout.write(
+                f"{label:20} before={runs['before']['median_ms']:9.2f} ms  after={runs['after']['median_ms']:9.2f} ms"
+            )
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(f"Plans written to {options['output']}")
+
+    def _execute(self, statements):
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(str(statement))
+
+    def _analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {Professional._meta.db_table}')
+
+    def _record(self, report, phase, queries, repeat):
+        for label, queryset, terminal in queries:
+            run_query(queryset, terminal)  # warm-up
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                run_query(queryset, terminal)
+                timings.append((time.perf_counter() - start) * 1000)
+            report['queries'].setdefault(label, {})[phase] = {
+                'median_ms': round(statistics.median(timings), 3),
+                'plan': explain(queryset, terminal),
+            }
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from professionals.blobs import collect_garbage, recount_references
+
+
+class Command(BaseCommand):
+    help = 'Deletes content-addressed document blobs that no document references any more'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-seconds', type=int, default=settings.DOCUMENT_BLOB_GC_GRACE_SECONDS,
+            help='Only blobs unreferenced for at least this long are deleted'
+        )
+        parser.add_argument('--recount', action='store_true', help='Recompute reference counts from the documents first')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be deleted')
+
+    def handle(self, *args, **options):
+        if options['recount']:
+            fixed = recount_references()
+            self.stdout.write(f'{fixed} reference counts corrected.')
+
+        deleted, freed = collect_garbage(options['grace_seconds'], dry_run=options['dry_run'])
+        verb = 'would be deleted' if options['dry_run'] else 'deleted'
+        self.stdout.write(self.style.SUCCESS(f'{deleted} blobs {verb} ({freed / 1024 / 1024:.1f} MB).'))
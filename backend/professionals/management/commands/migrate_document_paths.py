@@ -0,0 +1,85 @@
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from professionals.models import Document, document_prefix
+from professionals.uploads import copy_object
+
+logger = logging.getLogger(__name__)
+
+
+def target_name(document):
+    return document_prefix(document.professional_id) + posixpath.basename(document.file.name)
+
+
+def move_document(document):
+    """Runs in a worker thread: storage I/O only, no database access."""
+    try:
+        return document, copy_object(document.file.storage, document.file.name, target_name(document))
+    except Exception as e:
+        logger.warning(f"Could not copy document {document.id}: {str(e)}")
+        return document, None
+
+
+def delete_object(storage, name):
+    try:
+        storage.delete(name)
+    except Exception as e:
+        logger.warning(f"Could not delete old document object {name}: {str(e)}")
+
+
+class Command(BaseCommand):
+    help = (
+        'Moves document files stored under the old documents/<cpf>/ layout to '
+        'documents/<shard>/<professional id>/ (copy, update the row, then delete the old object)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument('--workers', type=int, default=8, help='Concurrent storage copies')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the documents to move')
+
+    def handle(self, *args, **options):
+        # Content-addressed blobs are shared and already spread by digest
+        documents = Document.objects.filter(blob__isnull=True).only('id', 'file', 'professional_id').order_by('id')
+        moved = failed = pending = 0
+        last_id = None
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            while True:
+                batch_qs = documents if last_id is None else documents.filter(id__gt=last_id)
+                batch = list(batch_qs[:options['batch_size']])
+                if not batch:
+                    break
+                last_id = batch[-1].id
+
+                batch = [
+                    document for document in batch
+                    if document.file and not document.file.name.startswith(document_prefix(document.professional_id))
+                ]
+                if options['dry_run']:
+                    pending += len(batch)
+                    continue
+
+                changed, old_names = [], []
+                for document, new_name in executor.map(move_document, batch):
+                    if new_name is None:
+                        failed += 1
+                        continue
+                    old_names.append((document.file.storage, document.file.name))
+                    document.file.name = new_name
+                    changed.append(document)
+
+                with transaction.atomic():
+                    Document.objects.bulk_update(changed, ['file'])
+                # Old objects go only once the rows point at the copies
+                list(executor.map(lambda item: delete_object(*item), old_names))
+                moved += len(changed)
+                self.stdout.write(f'{moved} documents moved...')
+
+        if options['dry_run']:
+            self.stdout.write(f'{pending} documents would be moved.')
+            return
+        style = self.style.SUCCESS if not failed else self.style.WARNING
+        self.stdout.write(style(f'{moved} documents moved, {failed} failed.'))
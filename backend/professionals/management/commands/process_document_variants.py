@@ -0,0 +1,26 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from professionals.variants import claim_next_document, process_document
+
+class Command(BaseCommand):
+    help = 'Builds preview and thumbnail variants of uploaded image documents (runs until interrupted unless --once is given)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Exit when the queue is empty')
+        parser.add_argument('--interval', type=int, default=settings.DOCUMENT_VARIANTS_POLL_SECONDS, help='Seconds to wait when the queue is empty')
+
+    def handle(self, *args, **options):
+        while True:
+            document = claim_next_document()
+            if document is None:
+                if options['once']:
+                    return
+                time.sleep(options['interval'])
+                continue
+
+            document = process_document(document)
+            if document.variants_status == 'FAILED':
+                self.stdout.write(self.style.ERROR(f'Document {document.id}: variants failed.'))
+            else:
+                self.stdout.write(f'Document {document.id}: {document.variants_status.lower()}.')
@@ -0,0 +1,37 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from professionals.dashboard import refresh_daily_stats
+
+class Command(BaseCommand):
+    help = 'Refreshes the DailyRegistrationStats rollup for the days that changed since the last run'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Rebuild every day (also picks up deleted registrations)')
+        parser.add_argument('--loop', action='store_true', help='Keep running (the dashboard-stats service)')
+        parser.add_argument('--interval', type=int, default=settings.DASHBOARD_STATS_REFRESH_SECONDS, help='With --loop: seconds between refreshes')
+        parser.add_argument(
+            '--full-every', type=int, default=settings.DASHBOARD_STATS_FULL_REFRESH_SECONDS,
+            help='With --loop: seconds between full rebuilds'
+        )
+
+    def handle(self, *args, **options):
+        if not options['loop']:
+            self._refresh(options['full'])
+            return
+
+        # Incremental runs miss deleted registrations; a periodic full rebuild drops them
+        full = options['full']
+        last_full = time.monotonic()
+        while True:
+            self._refresh(full)
+            if full:
+                last_full = time.monotonic()
+            time.sleep(options['interval'])
+            full = time.monotonic() - last_full >= options['full_every']
+
+    def _refresh(self, full):
+        refresh = refresh_daily_stats(full=full)
+        mode = 'full' if refresh.full else 'incremental'
+        self.stdout.write(self.style.SUCCESS(f'Dashboard stats refreshed ({mode}): {refresh.days_refreshed} days.'))
+        return refresh
@@ -0,0 +1,27 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from professionals.exports import claim_next_job, run_export_job
+
+class Command(BaseCommand):
+    help = 'Processes queued export jobs (runs until interrupted unless --once is given)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Exit when the queue is empty')
+        parser.add_argument('--interval', type=int, default=settings.EXPORT_WORKER_POLL_SECONDS, help='Seconds to wait when the queue is empty')
+
+    def handle(self, *args, **options):
+        while True:
+            job = claim_next_job()
+            if job is None:
+                if options['once']:
+                    return
+                time.sleep(options['interval'])
+                continue
+
+            self.stdout.write(f'Processing export job {job.id}...')
+            job = run_export_job(job)
+            if job.status == 'DONE':
+                self.stdout.write(self.style.SUCCESS(f'Export job {job.id} finished ({job.processed_rows} rows).'))
+            else:
+                self.stdout.write(self.style.ERROR(f'Export job {job.id} failed: {job.error}'))
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-17 22:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('professionals', '0009_exportjob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='exportjob',
+            name='export_format',
+            field=models.CharField(choices=[('xlsx', 'Excel (XLSX)'), ('csv', 'CSV'), ('ndjson', 'NDJSON')], default='xlsx', max_length=10),
+        ),
+    ]
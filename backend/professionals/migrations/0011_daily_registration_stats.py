@@ -0,0 +1,45 @@
+# Generated by Django 5.0.1 on 2026-10-17 22:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('professionals', '0010_alter_exportjob_export_format'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRegistrationStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(choices=[('PENDING', 'Pendente'), ('APPROVED', 'Aprovado'), ('REJECTED', 'Reprovado'), ('ADJUSTMENT_REQUESTED', 'Ajuste Solicitado')], max_length=50)),
+                ('person_type', models.CharField(choices=[('PF', 'Pessoa Física'), ('PJ', 'Pessoa Jurídica')], max_length=2)),
+                ('count', models.IntegerField(default=0)),
+                ('analyzed_count', models.IntegerField(default=0)),
+                ('analysis_seconds', models.FloatField(default=0)),
+            ],
+            options={
+                'ordering': ['day'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyStatsRefresh',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField(db_index=True)),
+                ('finished_at', models.DateTimeField(auto_now_add=True)),
+                ('days_refreshed', models.IntegerField(default=0)),
+                ('full', models.BooleanField(default=False)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyregistrationstats',
+            constraint=models.UniqueConstraint(fields=('day', 'status', 'person_type'), name='unique_daily_registration_stats'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+from django.db import migrations
+
+# PostgreSQL only: the test suite runs on SQLite, where ProfessionalSearchFilter
+# falls back to the plain SearchFilter and these objects are not needed.
+CREATE_SEARCH_INDEX = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    # unaccent() and concat_ws() are only STABLE; an IMMUTABLE wrapper pinned to the
+    # unaccent dictionary lets the normalized document back an expression index
+    """
+    CREATE OR REPLACE FUNCTION professional_search_text(text, text, text, text, text, text)
+    RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE
+    AS $$ SELECT lower(public.unaccent('public.unaccent'::regdictionary, concat_ws(' ', $1, $2, $3, $4, $5, $6))) $$
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS professional_search_trgm_idx
+    ON professionals_professional
+    USING gin (professional_search_text(name, company_name, cpf, cnpj, email, city) gin_trgm_ops)
+    """,
+]
+
+DROP_SEARCH_INDEX = [
+    "DROP INDEX IF EXISTS professional_search_trgm_idx",
+    "DROP FUNCTION IF EXISTS professional_search_text(text, text, text, text, text, text)",
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('professionals', '0012_document_metadata'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run(CREATE_SEARCH_INDEX), _run(DROP_SEARCH_INDEX)),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.0.1 on 2026-10-17 22:27
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently as PostgresAddIndexConcurrently
+from django.db import migrations, models
+
+
+class AddIndexConcurrently(PostgresAddIndexConcurrently):
+    """CREATE INDEX CONCURRENTLY on PostgreSQL (no write lock on a live table); plain AddIndex elsewhere."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        return migrations.AddIndex.database_forwards(self, app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            return super().database_backwards(app_label, schema_editor, from_state, to_state)
+        return migrations.AddIndex.database_backwards(self, app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+    # Concurrent index builds cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('professionals', '0013_professional_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='professional',
+            index=models.Index(fields=['cpf', 'submission_date'], name='prof_cpf_submitted_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='professional',
+            index=models.Index(fields=['-submission_date', '-id'], name='prof_submitted_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='professional',
+            index=models.Index(fields=['status', '-submission_date', '-id'], name='prof_status_submitted_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='professional',
+            index=models.Index(condition=models.Q(('status', 'PENDING')), fields=['-submission_date', '-id'], name='prof_pending_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='professional',
+            index=models.Index(condition=models.Q(('status__in', ['APPROVED', 'REJECTED'])), fields=['status', 'submission_date', 'approved_at', 'rejected_at'], name='prof_finalized_idx'),
+        ),
+    ]
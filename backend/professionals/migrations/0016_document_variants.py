@@ -0,0 +1,33 @@
+# Generated by Django 5.0.1 on 2026-10-17 22:53
+
+import professionals.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('professionals', '0015_document_blobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='preview',
+            field=models.FileField(blank=True, null=True, upload_to=professionals.models.variant_upload_path),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='thumbnail',
+            field=models.FileField(blank=True, null=True, upload_to=professionals.models.variant_upload_path),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='variants_status',
+            field=models.CharField(choices=[('PENDING', 'Pendente'), ('PROCESSING', 'Em processamento'), ('DONE', 'Concluído'), ('SKIPPED', 'Não se aplica'), ('FAILED', 'Falhou')], default='PENDING', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(condition=models.Q(('variants_status', 'PENDING')), fields=['uploaded_at'], name='doc_variants_pending_idx'),
+        ),
+    ]
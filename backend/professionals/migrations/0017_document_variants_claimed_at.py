@@ -0,0 +1,26 @@
+# Generated by Django 5.0.1 on 2026-10-17 23:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('professionals', '0016_document_variants'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='document',
+            name='doc_variants_pending_idx',
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='variants_claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(condition=models.Q(('variants_status__in', ['PENDING', 'PROCESSING'])), fields=['uploaded_at'], name='doc_variants_queue_idx'),
+        ),
+    ]
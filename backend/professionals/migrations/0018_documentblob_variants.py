@@ -0,0 +1,24 @@
+# Generated by Django 5.0.1 on 2026-10-17 23:04
+
+import professionals.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('professionals', '0017_document_variants_claimed_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentblob',
+            name='preview',
+            field=models.FileField(blank=True, null=True, upload_to=professionals.models.variant_upload_path),
+        ),
+        migrations.AddField(
+            model_name='documentblob',
+            name='thumbnail',
+            field=models.FileField(blank=True, null=True, upload_to=professionals.models.variant_upload_path),
+        ),
+    ]
@@ -1,28 +1,53 @@
+import hashlib
+import mimetypes
+import os
+import posixpath
 import uuid
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
 from django.core.validators import FileExtensionValidator
 from django.core.exceptions import ValidationError
 from datetime import timedelta, date
 from django.utils import timezone
 
+def document_prefix(professional_id):
+    """
+    documents/<shard>/<professional id>/, built from the id alone (no query). The
+    shard is the id's first two hex digits, spreading objects over 256 prefixes.
+    """
+    professional_id = str(professional_id)
+    return f'documents/{professional_id[:2]}/{professional_id}/'
+
 def document_upload_path(instance, filename):
-    cpf = 'unknown'
-    try:
-        cpf = instance.professional.cpf
-    except Exception:
-        if hasattr(instance, 'professional_id') and instance.professional_id:
-            # Lazy import to avoid circular dependency/definition issues
-            from .models import Professional
-            try:
-                prof = Professional.objects.get(id=instance.professional_id)
-                cpf = prof.cpf
-            except Professional.DoesNotExist:
-                pass
-    return f'documents/{cpf}/{filename}'
+    return f'{document_prefix(instance.professional_id)}{filename}'
+
+def file_metadata(file):
+    """
+    Returns (size, sha256, content_type) read from the file's chunks, or the values
+    DocumentUploadHandler recorded on the upload while it was received.
+    """
+    upload = getattr(file, 'file', None)
+    if getattr(upload, 'sha256', None):
+        return upload.size, upload.sha256, upload.content_type
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in file.chunks():
+        digest.update(chunk)
+        size += len(chunk)
+    content_type = getattr(file.file, 'content_type', None) or mimetypes.guess_type(file.name)[0] or ''
+    return size, digest.hexdigest(), content_type
+
+# Accepted registration documents, by extension
+DOCUMENT_CONTENT_TYPES = {
+    'pdf': 'application/pdf',
+    'jpg': 'image/jpeg',
+    'jpeg': 'image/jpeg',
+    'png': 'image/png',
+}
+DOCUMENT_MAX_SIZE = 5 * 1024 * 1024 # 5 MB
 
 def validate_file_size(value):
-    limit = 5 * 1024 * 1024 # 5 MB
-    if value.size > limit:
+    if value.size > DOCUMENT_MAX_SIZE:
         raise ValidationError('Arquivo muito grande. O tamanho máximo é 5MB.')
 
 class Professional(models.Model):
@@ -188,22 +213,210 @@ class Professional(models.Model):
     
     class Meta:
         ordering = ['-submission_date']
+        indexes = [
+            # 90-day duplicate check in ProfessionalSerializer.validate_cpf
+            models.Index(fields=['cpf', 'submission_date'], name='prof_cpf_submitted_idx'),
+            # Default listing order (keyset pagination appends id)
+            models.Index(fields=['-submission_date', '-id'], name='prof_submitted_idx'),
+            models.Index(fields=['status', '-submission_date', '-id'], name='prof_status_submitted_idx'),
+            # Review queue
+            models.Index(
+                fields=['-submission_date', '-id'], name='prof_pending_idx',
+                condition=models.Q(status='PENDING'),
+            ),
+            # Dashboard average analysis time (covers every column the aggregate reads)
+            models.Index(
+                fields=['status', 'submission_date', 'approved_at', 'rejected_at'], name='prof_finalized_idx',
+                condition=models.Q(status__in=['APPROVED', 'REJECTED']),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.status})"
 
+def delete_files(storage, names):
+    for name in names:
+        storage.delete(name)
+
+def variant_upload_path(instance, filename):
+    # Next to the original file
+    return posixpath.join(posixpath.dirname(instance.file.name), filename)
+
+def blob_upload_path(instance, filename):
+    # Named after the content; the extension only follows the sniffed content type
+    extension = os.path.splitext(filename)[1].lower()
+    return f'documents/blobs/{instance.sha256[:2]}/{instance.sha256}{extension}'
+
+class DocumentBlob(models.Model):
+    """File content shared by every Document with the same sha256 (content-addressed layout)."""
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    file = models.FileField(upload_to=blob_upload_path)
+    size = models.BigIntegerField()
+    content_type = models.CharField(max_length=100, blank=True)
+    # Documents pointing at this blob; gc_document_blobs removes it once it drops to zero
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    released_at = models.DateTimeField(null=True, blank=True)
+    # Image variants, built once per content and shared by every Document of the blob
+    preview = models.FileField(upload_to=variant_upload_path, null=True, blank=True)
+    thumbnail = models.FileField(upload_to=variant_upload_path, null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['released_at'], name='docblob_unreferenced_idx', condition=models.Q(ref_count=0)),
+        ]
+
+    def __str__(self):
+        return f"{self.sha256} ({self.ref_count} refs)"
+
 class Document(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     professional = models.ForeignKey(Professional, on_delete=models.CASCADE, related_name='documents')
     file = models.FileField(
         upload_to=document_upload_path,
         validators=[
-            FileExtensionValidator(allowed_extensions=['pdf', 'jpg', 'jpeg', 'png']),
+            FileExtensionValidator(allowed_extensions=list(DOCUMENT_CONTENT_TYPES)),
             validate_file_size
         ]
     )
     description = models.CharField(max_length=100)
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
+    # Recorded once at upload so serializers never ask the storage backend (S3 HEAD)
+    size = models.BigIntegerField(null=True, blank=True)
+    sha256 = models.CharField(max_length=64, blank=True)
+    content_type = models.CharField(max_length=100, blank=True)
+    # Set under DOCUMENT_STORAGE_LAYOUT='content_addressed'; `file` then names the blob's file
+    blob = models.ForeignKey(DocumentBlob, on_delete=models.PROTECT, null=True, blank=True, related_name='documents')
+
+    VARIANTS_STATUS_CHOICES = [
+        ('PENDING', 'Pendente'),
+        ('PROCESSING', 'Em processamento'),
+        ('DONE', 'Concluído'),
+        ('SKIPPED', 'Não se aplica'),
+        ('FAILED', 'Falhou'),
+    ]
+
+    # Downscaled copies of image uploads, built by process_document_variants
+    variants_status = models.CharField(max_length=20, choices=VARIANTS_STATUS_CHOICES, default='PENDING')
+    variants_claimed_at = models.DateTimeField(null=True, blank=True) # Stale PROCESSING rows are claimed again
+    preview = models.FileField(upload_to=variant_upload_path, null=True, blank=True)
+    thumbnail = models.FileField(upload_to=variant_upload_path, null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # process_document_variants queue (PROCESSING rows for the stale-claim check)
+            models.Index(
+                fields=['uploaded_at'], name='doc_variants_queue_idx',
+                condition=models.Q(variants_status__in=['PENDING', 'PROCESSING']),
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not (self.file and not self.file._committed):
+            return super().save(*args, **kwargs)
+
+        self.size, self.sha256, self.content_type = file_metadata(self.file)
+        # A new file needs new variants; the old ones go too unless they belong to a blob
+        storage = self.preview.storage
+        stale_variants = [] if self.blob_id else [f.name for f in (self.preview, self.thumbnail) if f]
+        self.variants_status, self.preview, self.thumbnail = 'PENDING', None, None
+
+        if settings.DOCUMENT_STORAGE_LAYOUT != 'content_addressed':
+            super().save(*args, **kwargs)
+        else:
+            from .blobs import acquire_blob, release_blob
+            previous_blob_id = self.blob_id
+            with transaction.atomic():
+                # Identical content already stored is referenced instead of written again
+                self.blob = acquire_blob(self.file, self.sha256, self.size, self.content_type)
+                self.file = self.blob.file.name
+                super().save(*args, **kwargs)
+                if previous_blob_id:
+                    # The replaced file's reference (net zero when the content did not change)
+                    release_blob(previous_blob_id)
+
+        if stale_variants:
+            transaction.on_commit(lambda: delete_files(storage, stale_variants))
+
     def __str__(self):
         return f"{self.description} - {self.professional.name}"
+
+class ExportJob(models.Model):
+    STATUS_CHOICES = [
+        ('PENDING', 'Pendente'),
+        ('RUNNING', 'Em processamento'),
+        ('DONE', 'Concluído'),
+        ('FAILED', 'Falhou'),
+    ]
+
+    FORMAT_CHOICES = [
+        ('xlsx', 'Excel (XLSX)'),
+        ('csv', 'CSV'),
+        ('ndjson', 'NDJSON'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    requested_by = models.ForeignKey('auth.User', on_delete=models.SET_NULL, null=True, blank=True, related_name='export_jobs')
+    export_format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default='xlsx')
+
+    # Same query parameters accepted by ProfessionalViewSet (filters, search, ordering)
+    filters = models.JSONField(default=dict, blank=True)
+    filters_hash = models.CharField(max_length=64, db_index=True) # Used to reuse recent artifacts
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    total_rows = models.IntegerField(default=0)
+    processed_rows = models.IntegerField(default=0)
+    file = models.FileField(upload_to='exports/', null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    @property
+    def progress(self):
+        if self.status == 'DONE':
+            return 100
+        if not self.total_rows:
+            return 0
+        return min(99, int(self.processed_rows * 100 / self.total_rows))
+
+    def __str__(self):
+        return f"Export {self.export_format} ({self.status})"
+
+class DailyRegistrationStats(models.Model):
+    """Dashboard rollup: registrations per local submission day, status and person type."""
+    day = models.DateField()
+    status = models.CharField(max_length=50, choices=Professional.STATUS_CHOICES)
+    person_type = models.CharField(max_length=2, choices=Professional.PERSON_TYPE_CHOICES)
+    count = models.IntegerField(default=0)
+
+    # Finalized (approved/rejected) rows and the sum of their analysis durations
+    analyzed_count = models.IntegerField(default=0)
+    analysis_seconds = models.FloatField(default=0)
+
+    class Meta:
+        ordering = ['day']
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'status', 'person_type'], name='unique_daily_registration_stats'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.status} {self.person_type}: {self.count}"
+
+class DailyStatsRefresh(models.Model):
+    """One row per run of refresh_dashboard_stats; the latest one is the rollup watermark."""
+    started_at = models.DateTimeField(db_index=True)
+    finished_at = models.DateTimeField(auto_now_add=True)
+    days_refreshed = models.IntegerField(default=0)
+    full = models.BooleanField(default=False)
+
+    class Meta:
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"Refresh {self.started_at} ({self.days_refreshed} days)"
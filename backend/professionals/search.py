@@ -0,0 +1,74 @@
+import unicodedata
+from django.db import connection
+from django.db.models import F, FloatField, Func, Q, TextField, Value
+from django.db.models.functions import Cast
+from rest_framework import filters
+
+# Columns covered by the search box, in the order they are passed to the SQL function
+SEARCH_COLUMNS = ['name', 'company_name', 'cpf', 'cnpj', 'email', 'city']
+
+# Created by migration 0013 on PostgreSQL: an IMMUTABLE wrapper around
+# lower(unaccent(concat_ws(...))) so it can back the trigram GIN expression index
+SEARCH_TEXT_FUNCTION = 'professional_search_text'
+SEARCH_INDEX_NAME = 'professional_search_trgm_idx'
+
+
+class SearchText(Func):
+    """Normalized (lowercase, accent-free) search document of a professional."""
+    function = SEARCH_TEXT_FUNCTION
+    output_field = TextField()
+
+    def __init__(self, **extra):
+        super().__init__(*[F(column) for column in SEARCH_COLUMNS], **extra)
+
+
+class WordSimilarity(Func):
+    """pg_trgm word_similarity(term, document): how well `term` matches a word span of the document."""
+    function = 'word_similarity'
+    output_field = FloatField()
+
+
+def normalize_term(term):
+    """Lowercases and strips accents the same way unaccent() does for Portuguese text."""
+    decomposed = unicodedata.normalize('NFKD', term.lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+class ProfessionalSearchFilter(filters.SearchFilter):
+    """
+    On PostgreSQL every search term must appear in the normalized search document
+    (a LIKE served by the trigram index) and rows are annotated with `search_rank`,
+    the summed word similarity of the terms. Other databases use the plain
+    SearchFilter over `search_fields`.
+    """
+    rank_annotation = 'search_rank'
+
+    def filter_queryset(self, request, queryset, view):
+        if connection.vendor != 'postgresql':
+            return super().filter_queryset(request, queryset, view)
+
+        terms = [normalize_term(term) for term in self.get_search_terms(request)]
+        terms = [term for term in terms if term]
+        if not terms:
+            return queryset
+
+        queryset = queryset.alias(search_text=SearchText())
+        condition = Q()
+        rank = None
+        for term in terms:
+            condition &= Q(search_text__contains=term)
+            similarity = WordSimilarity(Value(term), F('search_text'))
+            rank = similarity if rank is None else rank + similarity
+        # word_similarity() returns real; as double precision the rank survives the
+        # round trip through a keyset cursor unchanged
+        return queryset.filter(condition).annotate(**{self.rank_annotation: Cast(rank, FloatField())})
+
+
+class ProfessionalOrderingFilter(filters.OrderingFilter):
+    """Orders ranked search results by relevance unless an explicit ordering was requested."""
+
+    def get_ordering(self, request, queryset, view):
+        params = request.query_params.get(self.ordering_param)
+        if not params and ProfessionalSearchFilter.rank_annotation in queryset.query.annotations:
+            return ['-' + ProfessionalSearchFilter.rank_annotation]
+        return super().get_ordering(request, queryset, view)
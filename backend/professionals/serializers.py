@@ -2,7 +2,9 @@ from rest_framework import serializers
 from django.utils import timezone
 from datetime import timedelta
 from django.core.validators import MinValueValidator, MaxValueValidator, MinLengthValidator
-from .models import Professional, Document
+from core.validators import clean_cnpj, is_valid_cnpj, is_valid_cpf
+from .models import Professional, Document, ExportJob, DOCUMENT_MAX_SIZE, document_prefix
+from .uploads import content_type_for
 
 class DocumentSerializer(serializers.ModelSerializer):
     file_size = serializers.SerializerMethodField()
@@ -10,10 +12,16 @@ class DocumentSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Document
-        fields = ['id', 'professional', 'file', 'description', 'uploaded_at', 'file_size', 'download_url']
-        read_only_fields = ['id', 'uploaded_at', 'file_size', 'download_url']
+        fields = [
+            'id', 'professional', 'file', 'description', 'uploaded_at', 'file_size', 'content_type', 'sha256',
+            'variants_status', 'download_url'
+        ]
+        read_only_fields = ['id', 'uploaded_at', 'file_size', 'content_type', 'sha256', 'variants_status', 'download_url']
 
     def get_file_size(self, obj):
+        if obj.size is not None:
+            return obj.size
+        # Rows not yet backfilled (backfill_document_metadata)
         try:
             return obj.file.size
         except Exception:
@@ -26,6 +34,52 @@ class DocumentSerializer(serializers.ModelSerializer):
             return None
         return reverse('document-download', kwargs={'pk': obj.pk}, request=request)
 
+class DocumentPresignSerializer(serializers.Serializer):
+    professional = serializers.PrimaryKeyRelatedField(queryset=Professional.objects.all())
+    filename = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(min_value=1, required=False)
+
+    def validate_filename(self, value):
+        if content_type_for(value) is None:
+            raise serializers.ValidationError("Tipo de arquivo não permitido. Envie PDF, JPG ou PNG.")
+        return value
+
+    def validate_size(self, value):
+        if value > DOCUMENT_MAX_SIZE:
+            raise serializers.ValidationError("Arquivo muito grande. O tamanho máximo é 5MB.")
+        return value
+
+class DocumentFinalizeSerializer(serializers.Serializer):
+    professional = serializers.PrimaryKeyRelatedField(queryset=Professional.objects.all())
+    key = serializers.CharField(max_length=100)
+    description = serializers.CharField(max_length=100)
+
+    def validate(self, data):
+        key = data['key']
+        # Only keys issued by presign for this professional can be attached
+        if not key.startswith(document_prefix(data['professional'].id)) or '..' in key.split('/'):
+            raise serializers.ValidationError({"key": "Arquivo inválido para este profissional."})
+        if content_type_for(key) is None:
+            raise serializers.ValidationError({"key": "Tipo de arquivo não permitido. Envie PDF, JPG ou PNG."})
+        return data
+
+class SparseFieldsetMixin:
+    """Restricts the output to the fields listed in ?fields=a,b,c (unknown names are ignored)."""
+    fields_query_param = 'fields'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method != 'GET':
+            return
+        requested = request.query_params.get(self.fields_query_param)
+        if not requested:
+            return
+        allowed = {name.strip() for name in requested.split(',')} | {'id'}
+        for name in list(self.fields):
+            if name not in allowed:
+                self.fields.pop(name)
+
 class ProfessionalSerializer(serializers.ModelSerializer):
     documents = DocumentSerializer(many=True, read_only=True)
     graduation_year = serializers.IntegerField(
@@ -99,9 +153,25 @@ class ProfessionalSerializer(serializers.ModelSerializer):
             
         return data
 
+    def validate_cnpj(self, value):
+        if not value:
+            return value
+        cnpj = clean_cnpj(value)
+        if not is_valid_cnpj(cnpj):
+            raise serializers.ValidationError("CNPJ inválido.")
+        return cnpj
+
+    def validate_technical_manager_cpf(self, value):
+        if value and not is_valid_cpf(value):
+            raise serializers.ValidationError("CPF do responsável técnico inválido.")
+        return value
+
     def validate_cpf(self, value):
         if not value:
             return value
+        # Check digits are verified offline, before the duplicate lookup below
+        if not is_valid_cpf(value):
+            raise serializers.ValidationError("CPF inválido.")
         # Check 90 days rule for CPF (PF only)
         ninety_days_ago = timezone.now() - timedelta(days=90)
         recent_submission = Professional.objects.filter(
@@ -128,8 +198,37 @@ class ProfessionalSerializer(serializers.ModelSerializer):
 
         return super().create(validated_data)
 
+class ProfessionalListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Admin grid rows: flat columns only, no nested documents (no storage calls)."""
+    class Meta:
+        model = Professional
+        fields = [
+            'id', 'person_type', 'name', 'company_name', 'cpf', 'cnpj', 'email',
+            'education', 'city', 'state', 'status', 'submission_date'
+        ]
+        read_only_fields = fields
+
 class ProfessionalManagementSerializer(ProfessionalSerializer):
     class Meta(ProfessionalSerializer.Meta):
         # Remove 'status' from read_only_fields to allow Admin updates
         read_only_fields = ['submission_date', 'consent_date']
         fields = ProfessionalSerializer.Meta.fields + ['internal_notes']
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    progress = serializers.IntegerField(read_only=True)
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = [
+            'id', 'export_format', 'filters', 'status',
+            'total_rows', 'processed_rows', 'progress', 'download_url', 'error',
+            'created_at', 'started_at', 'finished_at'
+        ]
+        read_only_fields = fields
+
+    def get_download_url(self, obj):
+        # Signed URL when the default storage is S3 (AWS_QUERYSTRING_AUTH)
+        if obj.status != 'DONE' or not obj.file:
+            return None
+        return obj.file.url
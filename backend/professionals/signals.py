@@ -0,0 +1,23 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from audit.models import AuditLog
+from .dashboard import invalidate_dashboard_cache
+from .models import Professional, Document
+
+@receiver(post_save, sender=Professional)
+@receiver(post_delete, sender=Professional)
+def professional_changed(sender, **kwargs):
+    # After commit: a poll between the invalidation and the commit would cache the old numbers again
+    transaction.on_commit(invalidate_dashboard_cache)
+
+@receiver(post_save, sender=AuditLog)
+def status_change_logged(sender, instance, created, **kwargs):
+    if created and instance.action == 'STATUS_CHANGE':
+        transaction.on_commit(invalidate_dashboard_cache)
+
+@receiver(post_delete, sender=Document)
+def document_deleted(sender, instance, **kwargs):
+    if instance.blob_id:
+        from .blobs import release_blob
+        release_blob(instance.blob_id)
@@ -80,7 +80,7 @@ class TestAuditLogic:
         """Rule 3: Log registration creation"""
         data = {
             "name": "New Log User",
-            "cpf": "66666666666",
+            "cpf": "66699933310",
             "email": "log@test.com",
             "phone": "11888888888",
             "birth_date": "2000-01-01",
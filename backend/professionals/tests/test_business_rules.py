@@ -12,7 +12,7 @@ class TestBusinessRules:
         """Rule 1: New professional registration must have default status PENDING"""
         prof = Professional.objects.create(
             name="Test User",
-            cpf="12345678901",
+            cpf="12345678909",
             email="test@example.com",
             phone="11999999999",
             birth_date=date(1990, 1, 1),
@@ -55,7 +55,7 @@ class TestBusinessRules:
         Professional.objects.create(
             id=uuid.uuid4(),
             name="Recent User",
-            cpf="11111111111", 
+            cpf="11144477735", 
             email="recent@test.com",
             phone="11999999999",
             birth_date=date(1990, 1, 1),
@@ -78,7 +78,7 @@ class TestBusinessRules:
         # Try to register again with same CPF
         data = {
             "name": "New Attempt",
-            "cpf": "11111111111",
+            "cpf": "11144477735",
             "email": "new@test.com",
             "phone": "11888888888",
             "birth_date": "1990-01-01",
@@ -108,7 +108,7 @@ class TestBusinessRules:
         prof = Professional.objects.create(
             id=uuid.uuid4(),
             name="Old User",
-            cpf="22222222222",
+            cpf="22255588846",
             email="old@test.com",
             phone="11999999999",
             birth_date=date(1990, 1, 1),
@@ -132,7 +132,7 @@ class TestBusinessRules:
         # Try to register again with same CPF
         data = {
             "name": "Retry User",
-            "cpf": "22222222222",
+            "cpf": "22255588846",
             "email": "retry@test.com",
             "phone": "11777777777",
             "birth_date": "1990-01-01",
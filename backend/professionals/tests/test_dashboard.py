@@ -0,0 +1,268 @@
+import pytest
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from professionals.models import Professional
+
+
+@pytest.mark.django_db
+class TestDashboardMetrics:
+    def setup_method(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_superuser('admin', 'admin@test.com', 'password')
+        self.client.force_authenticate(user=self.admin_user)
+        self.url = '/api/admin/dashboard/'
+
+    def test_dashboard_metrics(self, make_professional):
+        make_professional(days_ago=10)
+        make_professional(days_ago=45, status='APPROVED')
+        make_professional(days_ago=80, status='REJECTED')
+        make_professional(days_ago=200, status='ADJUSTMENT_REQUESTED')
+        make_professional(days_ago=500)
+
+        # Finalized 2 and 4 days after submission -> average of 3 days
+        now = timezone.now()
+        Professional.objects.filter(status='APPROVED').update(approved_at=now - timedelta(days=43))
+        Professional.objects.filter(status='REJECTED').update(rejected_at=now - timedelta(days=76))
+
+        response = self.client.get(self.url)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.data
+
+        assert data['total_registrations'] == 5
+        assert data['last_30_days'] == 1
+        assert data['last_60_days'] == 2
+        assert data['last_90_days'] == 3
+        assert data['avg_analysis_time_days'] == 3.0
+        assert {item['status']: item['count'] for item in data['status_counts']} == {
+            'PENDING': 2, 'APPROVED': 1, 'REJECTED': 1, 'ADJUSTMENT_REQUESTED': 1,
+        }
+        # Rows older than a year stay out of the trend
+        assert sum(item['count'] for item in data['yearly_variation']) == 4
+        assert all(item['count'] for item in data['yearly_variation'])
+        months = [item['month'] for item in data['yearly_variation']]
+        assert months == sorted(months)
+        assert all(month.day == 1 and month.hour == 0 for month in map(timezone.localtime, months))
+
+    def test_dashboard_uses_single_professional_query(self, make_professional):
+        for days_ago in (1, 40, 100, 300):
+            make_professional(days_ago=days_ago)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        assert response.status_code == status.HTTP_200_OK
+
+        professional_queries = [q for q in ctx.captured_queries if 'professionals_professional' in q['sql']]
+        assert len(professional_queries) == 1
+
+    def test_dashboard_empty(self):
+        response = self.client.get(self.url)
+        assert response.data['total_registrations'] == 0
+        assert response.data['status_counts'] == []
+        assert response.data['yearly_variation'] == []
+        assert response.data['avg_analysis_time_days'] == 0
+
+    def test_dashboard_denied_for_non_admin(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.get(self.url)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+@pytest.mark.django_db
+class TestDashboardRollup:
+    def setup_method(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_superuser('admin', 'admin@test.com', 'password')
+        self.client.force_authenticate(user=self.admin_user)
+        self.url = '/api/admin/dashboard/'
+
+    def _seed(self, make_professional):
+        now = timezone.now()
+        for days_ago in (0, 10, 29, 31, 59, 61, 89, 91, 200, 364, 366, 500):
+            make_professional(days_ago=days_ago, person_type='PF' if days_ago % 2 else 'PJ')
+        Professional.objects.filter(submission_date__lt=now - timedelta(days=60)).update(
+            status='APPROVED', approved_at=now - timedelta(days=50)
+        )
+        Professional.objects.filter(submission_date__lt=now - timedelta(days=300)).update(
+            status='REJECTED', approved_at=None, rejected_at=now - timedelta(days=200)
+        )
+
+    def test_rollup_matches_live_metrics(self, make_professional):
+        from professionals.dashboard import professional_metrics, refresh_daily_stats
+        from professionals.models import DailyRegistrationStats
+        self._seed(make_professional)
+        expected = professional_metrics()
+
+        refresh = refresh_daily_stats()
+        assert refresh.full
+        assert DailyRegistrationStats.objects.exists()
+
+        response = self.client.get(self.url)
+        data = response.data
+        for key in ('total_registrations', 'last_30_days', 'last_60_days', 'last_90_days', 'avg_analysis_time_days'):
+            assert data[key] == expected[key], key
+        assert data['status_counts'] == expected['status_counts']
+        assert data['yearly_variation'] == expected['yearly_variation']
+
+    def test_rollup_reads_stored_days(self, make_professional):
+        from professionals.dashboard import refresh_daily_stats
+        from professionals.models import DailyRegistrationStats
+        make_professional(days_ago=40)
+        refresh_daily_stats()
+
+        # Rollup rows are what the dashboard reads for past days
+        DailyRegistrationStats.objects.update(count=7)
+        assert self.client.get(self.url).data['total_registrations'] == 7
+
+    def test_registrations_after_refresh_are_counted_live(self, make_professional):
+        from professionals.dashboard import refresh_daily_stats
+        make_professional(days_ago=40)
+        refresh_daily_stats()
+
+        make_professional(days_ago=0, cpf='10987654321')
+        data = self.client.get(self.url).data
+        assert data['total_registrations'] == 2
+        assert data['last_30_days'] == 1
+
+    def test_incremental_refresh_only_touches_changed_days(self, make_professional):
+        from professionals.dashboard import refresh_daily_stats
+        from professionals.models import DailyRegistrationStats, DailyStatsRefresh
+        old = make_professional(days_ago=40)
+        make_professional(days_ago=100, cpf='10987654321')
+        refresh_daily_stats()
+        DailyStatsRefresh.objects.update(started_at=timezone.now() - timedelta(hours=1))
+        Professional.objects.update(last_status_update=timezone.now() - timedelta(hours=2))
+
+        old.status = 'APPROVED'
+        old.approved_at = timezone.now()
+        old.save()
+
+        refresh = refresh_daily_stats()
+        assert not refresh.full
+        assert refresh.days_refreshed == 1
+        assert DailyRegistrationStats.objects.get(status='APPROVED').count == 1
+        assert DailyRegistrationStats.objects.filter(status='PENDING').count() == 1
+
+    def test_status_change_after_refresh_is_shown(self, make_professional, django_capture_on_commit_callbacks):
+        from professionals.dashboard import refresh_daily_stats
+        prof = make_professional(days_ago=3)
+        refresh_daily_stats(full=True)
+        assert self.client.get(self.url).data['status_counts'] == [{'status': 'PENDING', 'count': 1}]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = self.client.patch(f'/api/professionals/{prof.id}/', {'status': 'APPROVED'})
+        assert response.status_code == status.HTTP_200_OK
+
+        data = self.client.get(self.url).data
+        assert data['status_counts'] == [{'status': 'APPROVED', 'count': 1}]
+        assert data['avg_analysis_time_days'] == 3.0
+        assert data['total_registrations'] == 1
+
+@pytest.mark.django_db
+class TestDashboardCache:
+    def setup_method(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_superuser('admin', 'admin@test.com', 'password')
+        self.client.force_authenticate(user=self.admin_user)
+        self.url = '/api/admin/dashboard/'
+
+    def test_repeated_polls_hit_cache(self, make_professional):
+        make_professional(days_ago=5)
+        self.client.get(self.url)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        assert response.data['total_registrations'] == 1
+        assert len(ctx.captured_queries) == 0
+
+    def test_professional_save_invalidates(self, make_professional, django_capture_on_commit_callbacks):
+        prof = make_professional(days_ago=5)
+        assert self.client.get(self.url).data['total_registrations'] == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            make_professional(days_ago=1, cpf='10987654321')
+        assert self.client.get(self.url).data['total_registrations'] == 2
+
+        with django_capture_on_commit_callbacks(execute=True):
+            prof.delete()
+        assert self.client.get(self.url).data['total_registrations'] == 1
+
+    def test_status_change_audit_invalidates(self, make_professional, django_capture_on_commit_callbacks):
+        from audit.models import AuditLog
+        prof = make_professional(days_ago=5)
+        assert self.client.get(self.url).data['analyzed_this_month'] == 0
+
+        with django_capture_on_commit_callbacks(execute=True):
+            AuditLog.objects.create(
+                user=self.admin_user, action='STATUS_CHANGE', target_model='Professional',
+                target_id=str(prof.id), details='Status changed to APPROVED'
+            )
+        assert self.client.get(self.url).data['analyzed_this_month'] == 1
+
+    def test_invalidation_waits_for_commit(self, make_professional, django_capture_on_commit_callbacks):
+        make_professional(days_ago=5)
+        self.client.get(self.url)
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            make_professional(days_ago=1, cpf='10987654321')
+            # Not committed yet: the cached payload is still served
+            assert self.client.get(self.url).data['total_registrations'] == 1
+
+        assert len(callbacks) == 1
+        callbacks[0]()
+        assert self.client.get(self.url).data['total_registrations'] == 2
+
+    def test_other_audit_actions_keep_cache(self, make_professional):
+        from audit.models import AuditLog
+        prof = make_professional(days_ago=5)
+        self.client.get(self.url)
+
+        AuditLog.objects.create(
+            user=self.admin_user, action='VIEW', target_model='Professional', target_id=str(prof.id)
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self.url)
+        assert len(ctx.captured_queries) == 0
+
+
+@pytest.mark.django_db
+def test_refresh_loop_runs_incrementally_after_the_first_build(make_professional):
+    from io import StringIO
+    from unittest.mock import patch
+    from django.core.management import call_command
+    make_professional(days_ago=3)
+    out = StringIO()
+
+    # Third sleep stops the service loop
+    with patch('professionals.management.commands.refresh_dashboard_stats.time.sleep', side_effect=[None, None, SystemExit]):
+        with pytest.raises(SystemExit):
+            call_command('refresh_dashboard_stats', '--loop', '--interval=0', '--full-every=3600', stdout=out)
+
+    # No rollup yet: the first run builds it fully, the next ones only refresh changed days
+    assert out.getvalue().count('(full)') == 1
+    assert out.getvalue().count('(incremental)') == 2
+
+
+@pytest.mark.django_db
+def test_benchmark_dashboard_refuses_to_seed_without_the_flag(settings):
+    from django.core.management import CommandError, call_command
+    settings.DEBUG = False
+    with pytest.raises(CommandError, match='--i-know-this-writes'):
+        call_command('benchmark_dashboard', rows=10)
+    with pytest.raises(CommandError, match='--keep'):
+        call_command('benchmark_dashboard', rows=10, keep=True, i_know_this_writes=True)
+    assert not Professional.objects.exists()
+
+
+@pytest.mark.django_db
+def test_seeded_submissions_are_spread_without_touching_auto_now_add():
+    from professionals.management.commands.benchmark_dashboard import seed_professionals
+    seed_professionals(50, 20)
+
+    assert Professional._meta.get_field('submission_date').auto_now_add
+    oldest = Professional.objects.order_by('submission_date').first().submission_date
+    assert oldest < timezone.now() - timedelta(days=1)
+    assert Professional.objects.count() == 50
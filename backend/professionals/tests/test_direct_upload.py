@@ -0,0 +1,190 @@
+import hashlib
+import io
+import json
+import pytest
+from unittest.mock import ANY, patch
+from botocore.exceptions import ClientError
+from rest_framework import status
+from rest_framework.test import APIClient
+from storages.backends.s3boto3 import S3Boto3Storage
+from professionals.models import Document, DocumentBlob
+
+
+def make_storage():
+    # Presigning is local signing only, no request reaches AWS
+    return S3Boto3Storage(
+        bucket_name='docs-bucket', access_key='test', secret_key='test',
+        region_name='us-east-1', location='media', file_overwrite=False,
+    )
+
+
+def not_found():
+    return ClientError({'Error': {'Code': '404', 'Message': 'Not Found'}}, 'HeadObject')
+
+
+@pytest.mark.django_db
+class TestPresign:
+    @pytest.fixture(autouse=True)
+    def setup_data(self, make_professional):
+        self.client = APIClient()
+        self.professional = make_professional()
+        self.storage = make_storage()
+
+    def presign(self, **data):
+        payload = {'professional': str(self.professional.id), 'filename': 'diploma.pdf', **data}
+        with patch('professionals.uploads.default_storage', self.storage):
+            return self.client.post('/api/documents/presign/', payload, format='json')
+
+    def test_anonymous_gets_form_scoped_to_professional_prefix(self):
+        response = self.presign()
+
+        assert response.status_code == status.HTTP_200_OK
+        key = response.data['key']
+        professional_id = str(self.professional.id)
+        assert key.startswith(f'documents/{professional_id[:2]}/{professional_id}/') and key.endswith('/diploma.pdf')
+        assert 'docs-bucket' in response.data['url']
+        fields = response.data['fields']
+        assert fields['key'] == f'media/{key}'
+        assert fields['Content-Type'] == 'application/pdf'
+
+    def test_policy_limits_size_and_content_type(self):
+        import base64
+        fields = self.presign(filename='foto.PNG').data['fields']
+        policy = json.loads(base64.b64decode(fields['policy']))
+
+        assert ['content-length-range', 1, 5 * 1024 * 1024] in policy['conditions']
+        assert {'Content-Type': 'image/png'} in policy['conditions']
+        assert {'key': fields['key']} in policy['conditions']
+
+    def test_each_presign_gets_its_own_key(self):
+        assert self.presign().data['key'] != self.presign().data['key']
+
+    def test_long_filenames_fit_the_file_field(self):
+        key = self.presign(filename=('x' * 150) + '.pdf').data['key']
+        assert len(key) <= 100 and key.endswith('.pdf')
+
+    def test_rejects_disallowed_extension(self):
+        response = self.presign(filename='script.exe')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'filename' in response.data
+
+    def test_rejects_announced_size_over_limit(self):
+        response = self.presign(size=6 * 1024 * 1024)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'size' in response.data
+
+    def test_filesystem_storage_is_not_supported(self):
+        response = self.client.post(
+            '/api/documents/presign/',
+            {'professional': str(self.professional.id), 'filename': 'diploma.pdf'},
+            format='json'
+        )
+        assert response.status_code == status.HTTP_501_NOT_IMPLEMENTED
+
+
+@pytest.mark.django_db
+class TestFinalize:
+    @pytest.fixture(autouse=True)
+    def setup_data(self, make_professional):
+        self.client = APIClient()
+        self.professional = make_professional()
+        self.storage = make_storage()
+        professional_id = str(self.professional.id)
+        self.key = f'documents/{professional_id[:2]}/{professional_id}/0f0f0f0f/diploma.pdf'
+
+    def finalize(self, head=None, content=b'%PDF-1.4 diploma', **data):
+        payload = {
+            'professional': str(self.professional.id), 'key': self.key, 'description': 'Diploma', **data
+        }
+        client = self.storage.connection.meta.client
+        with patch('professionals.uploads.default_storage', self.storage), \
+                patch.object(client, 'head_object', **(head or {})) as head_object, \
+                patch.object(client, 'get_object', side_effect=lambda **kwargs: {'Body': io.BytesIO(content)}) as get_object, \
+                patch.object(client, 'delete_object') as delete_object:
+            response = self.client.post('/api/documents/finalize/', payload, format='json')
+        self.head_object, self.get_object, self.delete_object = head_object, get_object, delete_object
+        return response
+
+    def test_creates_document_from_uploaded_object(self):
+        response = self.finalize(head={'return_value': {'ContentLength': 2048, 'ContentType': 'application/pdf'}})
+
+        assert response.status_code == status.HTTP_201_CREATED
+        self.head_object.assert_called_once_with(Bucket='docs-bucket', Key=f'media/{self.key}')
+        self.get_object.assert_called_once_with(Bucket='docs-bucket', Key=f'media/{self.key}', Range='bytes=0-15')
+        self.delete_object.assert_not_called()
+        document = Document.objects.get(id=response.data['id'])
+        assert document.file.name == self.key
+        assert document.professional == self.professional
+        assert document.size == 2048
+        assert document.content_type == 'application/pdf'
+        assert response.data['file_size'] == 2048
+
+    def test_missing_object_is_rejected(self):
+        response = self.finalize(head={'side_effect': not_found()})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not Document.objects.exists()
+
+    def test_key_of_another_professional_is_rejected(self, make_professional):
+        other = make_professional(cpf='98765432100')
+        response = self.finalize(key=f'documents/{str(other.id)[:2]}/{other.id}/abc/diploma.pdf')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        self.head_object.assert_not_called()
+
+    def test_path_traversal_is_rejected(self):
+        response = self.finalize(key=self.key.replace('/0f0f0f0f/', '/../../ab/other/'))
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_same_key_cannot_be_registered_twice(self):
+        head = {'return_value': {'ContentLength': 10, 'ContentType': 'application/pdf'}}
+        assert self.finalize(head=head).status_code == status.HTTP_201_CREATED
+
+        response = self.finalize(head=head)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert Document.objects.count() == 1
+        # The registered document's object stays
+        self.delete_object.assert_not_called()
+
+    def test_content_not_matching_the_extension_is_rejected_and_deleted(self):
+        response = self.finalize(
+            head={'return_value': {'ContentLength': 2048, 'ContentType': 'application/pdf'}},
+            content=b'MZ\x90\x00 not a pdf',
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not Document.objects.exists()
+        self.delete_object.assert_called_once_with(Bucket='docs-bucket', Key=f'media/{self.key}')
+
+    def test_object_over_the_size_limit_is_rejected_and_deleted(self):
+        response = self.finalize(
+            head={'return_value': {'ContentLength': 6 * 1024 * 1024, 'ContentType': 'application/pdf'}}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not Document.objects.exists()
+        self.get_object.assert_not_called()
+        self.delete_object.assert_called_once()
+
+    def test_content_addressed_upload_is_moved_into_its_blob(self, settings):
+        settings.DOCUMENT_STORAGE_LAYOUT = 'content_addressed'
+        content = b'%PDF-1.4 diploma'
+        digest = hashlib.sha256(content).hexdigest()
+        blob_name = f'documents/blobs/{digest[:2]}/{digest}.pdf'
+        head = {'return_value': {'ContentLength': len(content), 'ContentType': 'application/pdf'}}
+
+        with patch('professionals.blobs.copy_object', return_value=blob_name) as copy:
+            response = self.finalize(head=head, content=content)
+            assert response.status_code == status.HTTP_201_CREATED
+            copy.assert_called_once_with(ANY, self.key, blob_name)
+            self.delete_object.assert_called_once_with(Bucket='docs-bucket', Key=f'media/{self.key}')
+
+            # Same content uploaded again: referenced, not copied
+            self.key = self.key.replace('/0f0f0f0f/', '/1e1e1e1e/')
+            assert self.finalize(head=head, content=content).status_code == status.HTTP_201_CREATED
+            copy.assert_called_once()
+            self.delete_object.assert_called_once_with(Bucket='docs-bucket', Key=f'media/{self.key}')
+
+        blob = DocumentBlob.objects.get()
+        assert (blob.sha256, blob.file.name, blob.ref_count) == (digest, blob_name, 2)
+        assert set(Document.objects.values_list('file', 'sha256', 'blob')) == {(blob_name, digest, digest)}
@@ -0,0 +1,176 @@
+import hashlib
+import pytest
+from datetime import timedelta
+from io import StringIO
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from professionals.blobs import acquire_blob, collect_garbage, recount_references, release_blob
+from professionals.models import Document, DocumentBlob
+
+PDF_CONTENT = b'%PDF-1.4 diploma'
+OTHER_PDF = b'%PDF-1.4 carteira do conselho'
+
+
+def make_document(professional, content=PDF_CONTENT, name='diploma.pdf'):
+    return Document.objects.create(
+        professional=professional,
+        description='Diploma',
+        file=SimpleUploadedFile(name, content, content_type='application/pdf'),
+    )
+
+
+@pytest.mark.django_db
+class TestContentAddressedLayout:
+    @pytest.fixture(autouse=True)
+    def layout(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+        settings.DOCUMENT_STORAGE_LAYOUT = 'content_addressed'
+        self.media_root = tmp_path
+
+    def stored_files(self):
+        return sorted(p.relative_to(self.media_root).as_posix() for p in self.media_root.rglob('*') if p.is_file())
+
+    def test_identical_uploads_share_one_blob(self, make_professional):
+        first = make_document(make_professional())
+        second = make_document(make_professional(cpf='98765432100'), name='diploma-de-novo.pdf')
+
+        digest = hashlib.sha256(PDF_CONTENT).hexdigest()
+        blob = DocumentBlob.objects.get()
+        assert blob.sha256 == digest
+        assert blob.ref_count == 2
+        assert first.blob_id == second.blob_id == digest
+        assert first.file.name == second.file.name == f'documents/blobs/{digest[:2]}/{digest}.pdf'
+        assert self.stored_files() == [first.file.name]
+        with second.file.open('rb') as f:
+            assert f.read() == PDF_CONTENT
+
+    def test_different_content_gets_its_own_blob(self, make_professional):
+        professional = make_professional()
+        make_document(professional)
+        make_document(professional, OTHER_PDF)
+
+        assert DocumentBlob.objects.count() == 2
+        assert len(self.stored_files()) == 2
+
+    def test_upload_endpoint_deduplicates(self, make_professional):
+        client = APIClient()
+        professional = make_professional()
+        for _ in range(2):
+            file = SimpleUploadedFile('diploma.pdf', PDF_CONTENT, content_type='application/pdf')
+            response = client.post(
+                '/api/documents/', {'professional': professional.id, 'description': 'Diploma', 'file': file},
+                format='multipart'
+            )
+            assert response.status_code == status.HTTP_201_CREATED
+
+        assert DocumentBlob.objects.get().ref_count == 2
+        assert len(self.stored_files()) == 1
+
+    def test_deleting_documents_releases_references(self, make_professional):
+        professional = make_professional()
+        first = make_document(professional)
+        make_document(professional)
+
+        first.delete()
+        blob = DocumentBlob.objects.get()
+        assert blob.ref_count == 1
+        assert blob.released_at is None
+
+        # Cascade from the professional
+        professional.delete()
+        blob.refresh_from_db()
+        assert blob.ref_count == 0
+        assert blob.released_at is not None
+
+    def test_replacing_a_file_moves_the_reference(self, make_professional):
+        document = make_document(make_professional())
+        document.file = SimpleUploadedFile('novo.pdf', OTHER_PDF, content_type='application/pdf')
+        document.save()
+
+        old = DocumentBlob.objects.get(sha256=hashlib.sha256(PDF_CONTENT).hexdigest())
+        new = DocumentBlob.objects.get(sha256=hashlib.sha256(OTHER_PDF).hexdigest())
+        assert (old.ref_count, new.ref_count) == (0, 1)
+        assert document.blob == new
+
+    def test_blob_copied_from_an_already_stored_object(self):
+        stored = default_storage.save('documents/upload/diploma.pdf', ContentFile(PDF_CONTENT))
+        digest = hashlib.sha256(PDF_CONTENT).hexdigest()
+
+        blob = acquire_blob(None, digest, len(PDF_CONTENT), 'application/pdf', stored_name=stored)
+
+        assert blob.file.name == f'documents/blobs/{digest[:2]}/{digest}.pdf'
+        with blob.file.open('rb') as f:
+            assert f.read() == PDF_CONTENT
+
+    def test_release_never_goes_below_zero(self, make_professional):
+        document = make_document(make_professional())
+        release_blob(document.blob_id)
+        release_blob(document.blob_id)
+
+        assert DocumentBlob.objects.get().ref_count == 0
+
+    def test_gc_deletes_unreferenced_blobs_after_grace_period(self, make_professional):
+        professional = make_professional()
+        kept = make_document(professional)
+        dropped = make_document(professional, OTHER_PDF)
+        dropped_name = dropped.file.name
+        dropped.delete()
+
+        assert collect_garbage(grace_seconds=3600) == (0, 0)
+
+        DocumentBlob.objects.filter(ref_count=0).update(released_at=timezone.now() - timedelta(hours=2))
+        assert collect_garbage(grace_seconds=3600) == (1, len(OTHER_PDF))
+        assert list(DocumentBlob.objects.values_list('sha256', flat=True)) == [kept.blob_id]
+        assert dropped_name not in self.stored_files()
+        assert kept.file.name in self.stored_files()
+
+    def test_gc_skips_blobs_referenced_again(self, make_professional):
+        document = make_document(make_professional())
+        document.delete()
+        DocumentBlob.objects.update(released_at=timezone.now() - timedelta(days=2))
+
+        # Re-uploaded before the collector ran
+        make_document(make_professional(cpf='98765432100'))
+
+        assert collect_garbage(grace_seconds=0) == (0, 0)
+        assert DocumentBlob.objects.get().ref_count == 1
+
+    def test_recount_repairs_drift(self, make_professional):
+        professional = make_professional()
+        make_document(professional)
+        make_document(professional)
+        DocumentBlob.objects.update(ref_count=7)
+
+        assert recount_references() == 1
+        assert DocumentBlob.objects.get().ref_count == 2
+
+    def test_gc_command_dry_run(self, make_professional):
+        make_document(make_professional()).delete()
+        out = StringIO()
+        call_command('gc_document_blobs', '--grace-seconds=0', '--dry-run', stdout=out)
+
+        assert '1 blobs would be deleted' in out.getvalue()
+        assert DocumentBlob.objects.count() == 1
+        assert len(self.stored_files()) == 1
+
+
+@pytest.mark.django_db
+class TestPerProfessionalLayout:
+    @pytest.fixture(autouse=True)
+    def media_root(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+
+    def test_default_layout_keeps_a_copy_per_document(self, make_professional):
+        professional = make_professional()
+        first = make_document(professional)
+        second = make_document(professional)
+
+        assert not DocumentBlob.objects.exists()
+        assert first.blob is None
+        assert first.file.name.startswith(f'documents/{str(professional.id)[:2]}/{professional.id}/')
+        assert first.file.name != second.file.name
@@ -0,0 +1,63 @@
+import hashlib
+import pytest
+from unittest.mock import patch
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APIClient
+from professionals.models import Document
+from professionals.serializers import DocumentSerializer
+
+PDF_CONTENT = b'%PDF-1.4 test document'
+
+
+@pytest.mark.django_db
+class TestDocumentMetadata:
+    def setup_method(self):
+        self.client = APIClient()
+
+    @pytest.fixture(autouse=True)
+    def media_root(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+
+    def test_upload_records_metadata(self, make_professional):
+        prof = make_professional()
+        file = SimpleUploadedFile('diploma.pdf', PDF_CONTENT, content_type='application/pdf')
+        response = self.client.post(
+            '/api/documents/', {'professional': prof.id, 'description': 'Diploma', 'file': file}, format='multipart'
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+        document = Document.objects.get(id=response.data['id'])
+        assert document.size == len(PDF_CONTENT)
+        assert document.sha256 == hashlib.sha256(PDF_CONTENT).hexdigest()
+        assert document.content_type == 'application/pdf'
+
+    def test_serializer_does_not_touch_storage(self, make_professional):
+        prof = make_professional()
+        document = Document.objects.create(
+            professional=prof, description='Diploma',
+            file=SimpleUploadedFile('diploma.pdf', PDF_CONTENT, content_type='application/pdf')
+        )
+        with patch('django.core.files.storage.FileSystemStorage.size', side_effect=AssertionError('storage call')):
+            data = DocumentSerializer(document).data
+        assert data['file_size'] == len(PDF_CONTENT)
+
+    def test_backfill_command(self, make_professional):
+        prof = make_professional()
+        documents = [
+            Document.objects.create(
+                professional=prof, description=f'Doc {i}',
+                file=SimpleUploadedFile(f'doc{i}.png', PDF_CONTENT + bytes([i]), content_type='image/png')
+            )
+            for i in range(3)
+        ]
+        Document.objects.update(size=None, sha256='', content_type='')
+
+        call_command('backfill_document_metadata', '--batch-size', '2', '--workers', '2')
+
+        for i, document in enumerate(documents):
+            document.refresh_from_db()
+            assert document.size == len(PDF_CONTENT) + 1
+            assert document.sha256 == hashlib.sha256(PDF_CONTENT + bytes([i])).hexdigest()
+            assert document.content_type == 'image/png'
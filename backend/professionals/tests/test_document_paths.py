@@ -0,0 +1,120 @@
+import pytest
+import uuid
+from io import StringIO
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from professionals.models import Document, document_prefix, document_upload_path
+
+PDF_CONTENT = b'%PDF-1.4 diploma'
+
+
+def make_legacy_document(professional, name='diploma.pdf', content=PDF_CONTENT):
+    """Document stored under the old documents/<cpf>/ layout."""
+    stored = default_storage.save(f'documents/{professional.cpf}/{name}', ContentFile(content))
+    document = Document(professional=professional, description='Diploma', size=len(content))
+    document.file.name = stored
+    document.save()
+    return document
+
+
+class TestDocumentUploadPath:
+    def test_path_comes_from_the_professional_id(self):
+        professional_id = uuid.UUID('3fa85f64-5717-4562-b3fc-2c963f66afa6')
+        document = Document(professional_id=professional_id)
+
+        assert document_prefix(professional_id) == 'documents/3f/3fa85f64-5717-4562-b3fc-2c963f66afa6/'
+        assert document_upload_path(document, 'diploma.pdf') == (
+            'documents/3f/3fa85f64-5717-4562-b3fc-2c963f66afa6/diploma.pdf'
+        )
+
+    @pytest.mark.django_db
+    def test_no_query_for_an_uncached_professional(self, make_professional):
+        professional = make_professional()
+        document = Document(professional_id=professional.id)
+
+        with CaptureQueriesContext(connection) as ctx:
+            path = document_upload_path(document, 'diploma.pdf')
+
+        assert len(ctx.captured_queries) == 0
+        assert path.startswith(f'documents/{str(professional.id)[:2]}/')
+
+
+@pytest.mark.django_db
+class TestMigrateDocumentPaths:
+    @pytest.fixture(autouse=True)
+    def media_root(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+
+    def test_moves_legacy_objects(self, make_professional):
+        professional = make_professional()
+        document = make_legacy_document(professional)
+        old_name = document.file.name
+
+        out = StringIO()
+        call_command('migrate_document_paths', '--batch-size=1', '--workers=2', stdout=out)
+
+        document.refresh_from_db()
+        assert document.file.name == f'{document_prefix(professional.id)}diploma.pdf'
+        assert not default_storage.exists(old_name)
+        with document.file.open('rb') as f:
+            assert f.read() == PDF_CONTENT
+        assert '1 documents moved, 0 failed.' in out.getvalue()
+
+    def test_same_file_names_do_not_overwrite_each_other(self, make_professional):
+        professional = make_professional()
+        first = make_legacy_document(professional, content=b'%PDF-1.4 first')
+        second = make_legacy_document(professional, content=b'%PDF-1.4 second')
+
+        call_command('migrate_document_paths', stdout=StringIO())
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert first.file.name != second.file.name
+        with first.file.open('rb') as f:
+            assert f.read() == b'%PDF-1.4 first'
+        with second.file.open('rb') as f:
+            assert f.read() == b'%PDF-1.4 second'
+
+    def test_current_layout_is_left_alone(self, make_professional):
+        professional = make_professional()
+        document = Document(professional=professional, description='Diploma')
+        document.file.save('diploma.pdf', ContentFile(PDF_CONTENT), save=True)
+        name = document.file.name
+
+        out = StringIO()
+        call_command('migrate_document_paths', stdout=out)
+
+        document.refresh_from_db()
+        assert document.file.name == name
+        assert '0 documents moved' in out.getvalue()
+
+    def test_dry_run_changes_nothing(self, make_professional):
+        document = make_legacy_document(make_professional())
+        name = document.file.name
+
+        out = StringIO()
+        call_command('migrate_document_paths', '--dry-run', stdout=out)
+
+        document.refresh_from_db()
+        assert document.file.name == name
+        assert default_storage.exists(name)
+        assert '1 documents would be moved.' in out.getvalue()
+
+    def test_failed_copy_keeps_the_row_and_object(self, make_professional, monkeypatch):
+        document = make_legacy_document(make_professional())
+        name = document.file.name
+
+        def broken_copy(storage, source, target):
+            raise OSError('disk full')
+
+        monkeypatch.setattr('professionals.management.commands.migrate_document_paths.copy_object', broken_copy)
+        out = StringIO()
+        call_command('migrate_document_paths', stdout=out)
+
+        document.refresh_from_db()
+        assert document.file.name == name
+        assert default_storage.exists(name)
+        assert '0 documents moved, 1 failed.' in out.getvalue()
@@ -0,0 +1,296 @@
+import hashlib
+import io
+import pytest
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.utils import timezone
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+from professionals.blobs import collect_garbage
+from professionals.models import Document, DocumentBlob
+from professionals.variants import ImageTooLarge, claim_next_document, process_document, render_variants
+
+PDF_CONTENT = b'%PDF-1.4 diploma'
+
+
+def image_bytes(size=(3000, 2000), image_format='JPEG', mode='RGB', exif_orientation=None):
+    image = Image.new(mode, size, (200, 30, 30, 128) if mode == 'RGBA' else (200, 30, 30))
+    buffer = io.BytesIO()
+    options = {}
+    if exif_orientation:
+        exif = Image.Exif()
+        exif[0x0112] = exif_orientation
+        options['exif'] = exif
+    image.save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def make_document(professional, name, content, content_type):
+    return Document.objects.create(
+        professional=professional,
+        description='Carteira do conselho',
+        file=SimpleUploadedFile(name, content, content_type=content_type),
+    )
+
+
+class TestRenderVariants:
+    def test_downscales_to_configured_sides(self, settings):
+        settings.DOCUMENT_PREVIEW_MAX_SIDE = 1600
+        settings.DOCUMENT_THUMBNAIL_MAX_SIDE = 320
+        settings.DOCUMENT_THUMBNAIL_FORMAT = 'WEBP'
+
+        preview, thumbnail, image_format = render_variants(io.BytesIO(image_bytes()))
+
+        with Image.open(io.BytesIO(preview)) as image:
+            assert (image.format, image.size) == ('JPEG', (1600, 1067))
+        with Image.open(io.BytesIO(thumbnail)) as image:
+            assert (image.format, image.size) == ('WEBP', (320, 213))
+        assert image_format == 'WEBP'
+
+    def test_applies_exif_orientation(self):
+        # Orientation 6: stored landscape, displayed portrait
+        preview, _, _ = render_variants(io.BytesIO(image_bytes((2000, 1000), exif_orientation=6)))
+        with Image.open(io.BytesIO(preview)) as image:
+            assert image.width < image.height
+
+    def test_flattens_transparent_png(self):
+        preview, _, _ = render_variants(io.BytesIO(image_bytes((800, 600), 'PNG', mode='RGBA')))
+        with Image.open(io.BytesIO(preview)) as image:
+            assert image.mode == 'RGB'
+
+    def test_small_images_are_not_upscaled(self):
+        preview, _, _ = render_variants(io.BytesIO(image_bytes((200, 100))))
+        with Image.open(io.BytesIO(preview)) as image:
+            assert image.size == (200, 100)
+
+    def test_refuses_images_over_the_pixel_cap_before_decoding(self, settings):
+        settings.DOCUMENT_VARIANTS_MAX_PIXELS = 100 * 100
+        with patch('PIL.ImageOps.exif_transpose') as decode:
+            with pytest.raises(ImageTooLarge):
+                render_variants(io.BytesIO(image_bytes((200, 100), 'PNG')))
+        decode.assert_not_called()
+
+    def test_jpeg_thumbnail_format(self, settings):
+        settings.DOCUMENT_THUMBNAIL_FORMAT = 'JPEG'
+        _, thumbnail, image_format = render_variants(io.BytesIO(image_bytes()))
+        assert image_format == 'JPEG'
+        assert thumbnail.startswith(b'\xff\xd8\xff')
+
+
+@pytest.mark.django_db
+class TestVariantPipeline:
+    @pytest.fixture(autouse=True)
+    def media_root(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+
+    @pytest.fixture(autouse=True)
+    def setup_data(self, make_professional):
+        self.professional = make_professional()
+
+    def test_new_documents_wait_for_variants(self):
+        document = make_document(self.professional, 'foto.jpg', image_bytes(), 'image/jpeg')
+        assert document.variants_status == 'PENDING'
+        assert not document.preview
+
+    def test_image_variants_stored_next_to_original(self):
+        content = image_bytes()
+        document = make_document(self.professional, 'foto.jpg', content, 'image/jpeg')
+
+        document = process_document(claim_next_document())
+
+        document.refresh_from_db()
+        assert document.variants_status == 'DONE'
+        directory = document.file.name.rsplit('/', 1)[0]
+        assert document.preview.name == f'{directory}/foto.preview.jpg'
+        assert document.thumbnail.name == f'{directory}/foto.thumb.webp'
+        assert document.preview.size < len(content)
+
+    def test_pdfs_are_skipped(self):
+        make_document(self.professional, 'diploma.pdf', PDF_CONTENT, 'application/pdf')
+
+        document = process_document(claim_next_document())
+
+        assert document.variants_status == 'SKIPPED'
+        assert not document.preview
+
+    def test_unreadable_image_fails_without_stopping_the_queue(self):
+        make_document(self.professional, 'foto.png', b'\x89PNG\r\n\x1a\n truncated', 'image/png')
+        make_document(self.professional, 'foto.jpg', image_bytes(), 'image/jpeg')
+
+        out = StringIO()
+        call_command('process_document_variants', '--once', stdout=out)
+
+        statuses = dict(Document.objects.values_list('file', 'variants_status'))
+        assert sorted(statuses.values()) == ['DONE', 'FAILED']
+        assert 'variants failed' in out.getvalue()
+
+    def test_oversized_image_is_marked_failed(self, settings):
+        settings.DOCUMENT_VARIANTS_MAX_PIXELS = 100 * 100
+        make_document(self.professional, 'foto.png', image_bytes((400, 400), 'PNG'), 'image/png')
+
+        document = process_document(claim_next_document())
+
+        assert document.variants_status == 'FAILED'
+        assert not document.preview
+
+    def test_stale_processing_document_is_claimed_again(self, settings):
+        settings.DOCUMENT_VARIANTS_TIMEOUT_SECONDS = 600
+        document = make_document(self.professional, 'foto.jpg', image_bytes(), 'image/jpeg')
+        # Worker died after claiming it
+        Document.objects.filter(id=document.id).update(
+            variants_status='PROCESSING', variants_claimed_at=timezone.now() - timedelta(minutes=30)
+        )
+
+        call_command('process_document_variants', '--once', stdout=StringIO())
+
+        document.refresh_from_db()
+        assert document.variants_status == 'DONE'
+        assert document.preview
+
+    def test_recently_claimed_document_is_left_alone(self, settings):
+        settings.DOCUMENT_VARIANTS_TIMEOUT_SECONDS = 600
+        document = make_document(self.professional, 'foto.jpg', image_bytes(), 'image/jpeg')
+        Document.objects.filter(id=document.id).update(variants_status='PROCESSING', variants_claimed_at=timezone.now())
+
+        assert claim_next_document() is None
+
+    def test_claimed_documents_are_not_claimed_twice(self):
+        make_document(self.professional, 'foto.jpg', image_bytes(), 'image/jpeg')
+
+        assert claim_next_document().variants_status == 'PROCESSING'
+        assert claim_next_document() is None
+
+    def test_replacing_the_file_queues_new_variants(self):
+        document = make_document(self.professional, 'foto.jpg', image_bytes(), 'image/jpeg')
+        process_document(claim_next_document())
+
+        document.refresh_from_db()
+        document.file = SimpleUploadedFile('nova.png', image_bytes(image_format='PNG'), content_type='image/png')
+        document.save()
+
+        document.refresh_from_db()
+        assert document.variants_status == 'PENDING'
+        assert not document.preview and not document.thumbnail
+
+    def test_replacing_the_file_deletes_the_old_variants(self, django_capture_on_commit_callbacks):
+        document = make_document(self.professional, 'foto.jpg', image_bytes(), 'image/jpeg')
+        process_document(claim_next_document())
+        document.refresh_from_db()
+        old_variants = [document.preview.name, document.thumbnail.name]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            document.file = SimpleUploadedFile('nova.png', image_bytes(image_format='PNG'), content_type='image/png')
+            document.save()
+
+        assert not any(default_storage.exists(name) for name in old_variants)
+
+
+@pytest.mark.django_db
+class TestBlobVariants:
+    @pytest.fixture(autouse=True)
+    def layout(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+        settings.DOCUMENT_STORAGE_LAYOUT = 'content_addressed'
+        self.media_root = tmp_path
+
+    def stored_files(self):
+        return sorted(p.relative_to(self.media_root).as_posix() for p in self.media_root.rglob('*') if p.is_file())
+
+    def test_documents_of_one_blob_share_its_variants(self, make_professional):
+        content = image_bytes()
+        first = make_document(make_professional(), 'foto.jpg', content, 'image/jpeg')
+        second = make_document(make_professional(cpf='98765432100'), 'outra.jpg', content, 'image/jpeg')
+
+        with patch('professionals.variants.render_variants', wraps=render_variants) as render:
+            process_document(claim_next_document())
+            process_document(claim_next_document())
+        render.assert_called_once()
+
+        blob = DocumentBlob.objects.get()
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert first.variants_status == second.variants_status == 'DONE'
+        assert first.preview.name == second.preview.name == blob.preview.name
+        assert first.thumbnail.name == second.thumbnail.name == blob.thumbnail.name
+        assert blob.preview.name == f'documents/blobs/{blob.sha256[:2]}/{blob.sha256}.preview.jpg'
+        assert len(self.stored_files()) == 3
+
+    def test_replacing_the_file_keeps_the_shared_variants(self, make_professional, django_capture_on_commit_callbacks):
+        content = image_bytes()
+        document = make_document(make_professional(), 'foto.jpg', content, 'image/jpeg')
+        make_document(make_professional(cpf='98765432100'), 'outra.jpg', content, 'image/jpeg')
+        process_document(claim_next_document())
+        document.refresh_from_db()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            document.file = SimpleUploadedFile('nova.png', image_bytes(image_format='PNG'), content_type='image/png')
+            document.save()
+
+        blob = DocumentBlob.objects.get(pk=hashlib.sha256(content).hexdigest())
+        assert default_storage.exists(blob.preview.name)
+        assert default_storage.exists(blob.thumbnail.name)
+
+    def test_gc_deletes_the_blob_variants(self, make_professional):
+        document = make_document(make_professional(), 'foto.jpg', image_bytes(), 'image/jpeg')
+        process_document(claim_next_document())
+        document.delete()
+
+        assert collect_garbage(grace_seconds=0)[0] == 1
+        assert self.stored_files() == []
+
+
+@pytest.mark.django_db
+class TestDownloadVariant:
+    @pytest.fixture(autouse=True)
+    def media_root(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+
+    @pytest.fixture(autouse=True)
+    def setup_data(self, make_professional):
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser('admin', 'admin@test.com', 'pass')
+        self.client.force_authenticate(user=self.admin)
+        self.professional = make_professional()
+
+    def download(self, document, variant=None):
+        params = {'variant': variant} if variant else {}
+        return self.client.get(f'/api/documents/{document.id}/download/', params)
+
+    def test_preview_url_once_processed(self):
+        document = make_document(self.professional, 'foto.jpg', image_bytes(), 'image/jpeg')
+        process_document(claim_next_document())
+        document.refresh_from_db()
+
+        response = self.download(document, 'preview')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {'url': document.preview.url, 'variant': 'preview'}
+
+        response = self.download(document, 'thumbnail')
+        assert response.data == {'url': document.thumbnail.url, 'variant': 'thumbnail'}
+
+    def test_original_by_default(self):
+        document = make_document(self.professional, 'foto.jpg', image_bytes(), 'image/jpeg')
+        response = self.download(document)
+        assert response.data == {'url': document.file.url, 'variant': 'original'}
+
+    def test_falls_back_to_original_before_processing(self):
+        document = make_document(self.professional, 'foto.jpg', image_bytes(), 'image/jpeg')
+        response = self.download(document, 'preview')
+        assert response.data == {'url': document.file.url, 'variant': 'original'}
+
+    def test_unknown_variant_is_rejected(self):
+        document = make_document(self.professional, 'diploma.pdf', PDF_CONTENT, 'application/pdf')
+        response = self.download(document, 'huge')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_serializer_reports_variants_status(self):
+        document = make_document(self.professional, 'foto.jpg', image_bytes(), 'image/jpeg')
+        response = self.client.get(f'/api/professionals/{self.professional.id}/')
+        assert response.data['documents'][0]['variants_status'] == 'PENDING'
+        assert response.data['documents'][0]['id'] == str(document.id)
@@ -32,7 +32,7 @@ class TestEmailHardening:
             graduation_year=2010,
             experience_years=10,
             person_type='PF',
-            cpf='12345678901'
+            cpf='12345678909'
         )
 
     @pytest.fixture
@@ -55,7 +55,7 @@ class TestEmailHardening:
             graduation_year=2010,
             experience_years=10,
             person_type='PJ',
-            cnpj='12345678000199'
+            cnpj='12345678000195'
         )
 
     def test_console_provider_fallback_in_dev(self):
@@ -91,7 +91,7 @@ class TestEmailHardening:
         args, kwargs = mock_service.send.call_args
         assert "Pessoa Física" in kwargs['content']
         assert "CPF: 123.***.***" in kwargs['html_content']
-        assert "12345678901" not in kwargs['content']
+        assert "12345678909" not in kwargs['content']
 
     @patch('professionals.services.get_email_service')
     def test_pj_email_content_masking(self, mock_get_service, professional_pj):
@@ -103,7 +103,7 @@ class TestEmailHardening:
         args, kwargs = mock_service.send.call_args
         assert "Pessoa Jurídica" in kwargs['content']
         assert "CNPJ: 12.***.***" in kwargs['html_content']
-        assert "12345678000199" not in kwargs['content']
+        assert "12345678000195" not in kwargs['content']
 
     @patch('professionals.services.get_email_service')
     @patch('django.db.transaction.on_commit')
@@ -112,7 +112,7 @@ class TestEmailHardening:
         data = {
             "name": "Test On Commit",
             "email": "test@oncommit.com",
-            "cpf": "11122233344",
+            "cpf": "11122233396",
             "phone": "999999999",
             "education": "Ortopedia",
             "council_name": "CRM",
@@ -147,7 +147,7 @@ class TestEmailHardening:
         data = {
             "name": "Test Fail",
             "email": "fail@test.com",
-            "cpf": "99988877766",
+            "cpf": "99988877714",
             "phone": "999999999",
             "education": "Ortopedia",
             "council_name": "CRM",
@@ -7,6 +7,7 @@ from professionals.models import Professional
 import openpyxl
 from io import BytesIO
 
+
 @pytest.mark.django_db
 class TestExportExcel:
     def setup_method(self):
@@ -72,7 +73,7 @@ class TestExportExcel:
         assert response['Content-Type'] == 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
         
         # Load workbook
-        wb = openpyxl.load_workbook(BytesIO(response.content))
+        wb = openpyxl.load_workbook(BytesIO(b''.join(response.streaming_content)))
         ws = wb.active
         
         # Check headers
@@ -141,7 +142,7 @@ class TestExportExcel:
         assert f'prestador_Maria_Individual_{pf.cpf}_' in response['Content-Disposition']
         
         # Load workbook
-        wb = openpyxl.load_workbook(BytesIO(response.content))
+        wb = openpyxl.load_workbook(BytesIO(b''.join(response.streaming_content)))
         ws = wb.active
         
         # Verify rows count (header + 1 pro)
@@ -152,8 +153,109 @@ class TestExportExcel:
         assert rows[0][3] == pf.name
         assert rows[0][5] == pf.cpf
 
+    def test_export_excel_is_streamed(self, make_professional):
+        """
+        Test that the export is streamed and rows beyond the width sample are written.
+        """
+        from professionals.exports import WIDTH_SAMPLE_SIZE
+        total = WIDTH_SAMPLE_SIZE + 5
+        for i in range(total):
+            make_professional(name=f'Prof {i}', cpf=f'{i:011d}', email=f'p{i}@test.com')
+
+        response = self.client.get(reverse('professional-export-excel'))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+
+        wb = openpyxl.load_workbook(BytesIO(b''.join(response.streaming_content)))
+        ws = wb.active
+        assert ws.title == 'Profissionais'
+        assert ws.max_row == total + 1
+        assert ws.column_dimensions['A'].width == len('16/10/2026 10:00') + 2
+        assert all(row[21] == 2020 for row in ws.iter_rows(min_row=2, values_only=True))
+
+    def _count_export_queries(self, url):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+            b''.join(response.streaming_content)
+        return len(ctx.captured_queries)
+
+    def test_export_excel_query_count_is_constant(self, make_professional):
+        """
+        Reviewer usernames must be joined, not fetched per row (no N+1).
+        """
+        reviewer = User.objects.create_user('reviewer', 'reviewer@test.com', 'password')
+        url = reverse('professional-export-excel')
+
+        for i in range(2):
+            make_professional(cpf=f'{i:011d}', status='APPROVED', approved_by=reviewer)
+        few_rows = self._count_export_queries(url)
+
+        for i in range(2, 20):
+            if i % 2:
+                make_professional(cpf=f'{i:011d}', status='REJECTED', rejected_by=self.admin_user)
+            else:
+                make_professional(cpf=f'{i:011d}', status='APPROVED', approved_by=reviewer)
+        many_rows = self._count_export_queries(url)
+
+        assert few_rows == many_rows == 1
+
     def test_export_excel_denied_for_anon(self):
         self.client.force_authenticate(user=None)
         url = reverse('professional-export-excel')
         response = self.client.get(url)
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+@pytest.mark.django_db
+class TestExportFlatFormats:
+    def setup_method(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_superuser('admin', 'admin@test.com', 'password')
+        self.client.force_authenticate(user=self.admin_user)
+
+    def test_export_csv_matches_excel_columns(self, make_professional):
+        import csv
+        from io import StringIO
+        make_professional(name='Aprovado', status='APPROVED', approved_by=self.admin_user)
+        make_professional(name='Pendente', cpf='10987654321')
+
+        response = self.client.get(reverse('professional-export-csv'), {'status': 'APPROVED'})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response['Content-Type'].startswith('text/csv')
+
+        content = b''.join(response.streaming_content).decode('utf-8')
+        rows = list(csv.reader(StringIO(content)))
+        assert len(rows[0]) == 28
+        assert rows[0][:3] == ['Data Envio', 'Status', 'Tipo']
+        assert len(rows) == 2
+        assert rows[1][1] == 'Aprovado'
+        assert rows[1][3] == 'Aprovado'
+        assert rows[1][27] == 'admin'
+
+    def test_export_ndjson_one_object_per_row(self, make_professional):
+        import json
+        make_professional(name='Ana PF')
+        make_professional(
+            person_type='PJ', name='Clinica PJ', cpf=None, cnpj='12345678000199',
+            company_name='Clinica', email='pj@test.com'
+        )
+
+        response = self.client.get(reverse('professional-export-ndjson'), {'search': 'Clinica'})
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'].startswith('application/x-ndjson')
+
+        lines = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        assert len(lines) == 1
+        record = json.loads(lines[0])
+        assert record['name'] == 'Clinica PJ'
+        assert record['person_type'] == 'Pessoa Jurídica'
+        assert record['cpf'] == '-'
+        assert record['cnpj'] == '12345678000199'
+        assert record['reviewed_by'] == '-'
+
+    def test_flat_exports_denied_for_anon(self):
+        self.client.force_authenticate(user=None)
+        assert self.client.get(reverse('professional-export-csv')).status_code == status.HTTP_401_UNAUTHORIZED
+        assert self.client.get(reverse('professional-export-ndjson')).status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,134 @@
+import pytest
+import openpyxl
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from professionals.models import ExportJob
+
+
+@pytest.mark.django_db
+class TestExportJobs:
+    def setup_method(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_superuser('admin', 'admin@test.com', 'password')
+        self.client.force_authenticate(user=self.admin_user)
+        self.url = reverse('export-job-list')
+
+    @pytest.fixture(autouse=True)
+    def media_root(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+
+    def test_create_job_records_filters(self):
+        response = self.client.post(f'{self.url}?status=APPROVED&search=Ana&page=2')
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data['status'] == 'PENDING'
+        assert response.data['filters'] == {'search': 'Ana', 'status': 'APPROVED'}
+        assert response.data['download_url'] is None
+
+    def test_query_string_filters_are_kept_with_a_body(self):
+        response = self.client.post(f'{self.url}?status=APPROVED&search=Ana', {'format': 'csv', 'search': 'Bia'}, format='json')
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data['export_format'] == 'csv'
+        # Body keys win over the query string
+        assert response.data['filters'] == {'search': 'Bia', 'status': 'APPROVED'}
+
+    def test_identical_request_reuses_job(self):
+        first = self.client.post(self.url, {'status': 'APPROVED'}, format='json')
+        second = self.client.post(self.url, {'status': 'APPROVED'}, format='json')
+        other = self.client.post(self.url, {'status': 'REJECTED'}, format='json')
+
+        assert second.status_code == status.HTTP_200_OK
+        assert second.data['id'] == first.data['id']
+        assert other.data['id'] != first.data['id']
+        assert ExportJob.objects.count() == 2
+
+    def test_worker_builds_filtered_artifact(self, make_professional):
+        make_professional(name='Aprovado', status='APPROVED')
+        make_professional(name='Pendente', cpf='10987654321')
+
+        job_id = self.client.post(self.url, {'status': 'APPROVED'}, format='json').data['id']
+        call_command('run_export_worker', '--once')
+
+        response = self.client.get(reverse('export-job-detail', args=[job_id]))
+        assert response.data['status'] == 'DONE'
+        assert response.data['progress'] == 100
+        assert response.data['total_rows'] == 1
+        assert response.data['download_url']
+
+        job = ExportJob.objects.get(id=job_id)
+        with job.file.open('rb') as f:
+            ws = openpyxl.load_workbook(f).active
+        rows = list(ws.iter_rows(min_row=2, values_only=True))
+        assert [row[3] for row in rows] == ['Aprovado']
+
+    def test_worker_builds_csv_artifact(self, make_professional):
+        make_professional(name='Ana')
+
+        job_id = self.client.post(self.url, {'format': 'csv'}, format='json').data['id']
+        call_command('run_export_worker', '--once')
+
+        job = ExportJob.objects.get(id=job_id)
+        assert job.status == 'DONE'
+        assert job.file.name.endswith('.csv')
+        with job.file.open('rb') as f:
+            lines = f.read().decode('utf-8').splitlines()
+        assert len(lines) == 2
+        assert 'Ana' in lines[1]
+
+    def test_expired_artifact_is_not_reused(self, settings):
+        settings.EXPORT_JOB_REUSE_SECONDS = 60
+        first_id = self.client.post(self.url, format='json').data['id']
+        call_command('run_export_worker', '--once')
+        ExportJob.objects.filter(id=first_id).update(finished_at=timezone.now() - timedelta(minutes=5))
+
+        response = self.client.post(self.url, format='json')
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data['id'] != first_id
+
+    def test_stale_running_job_is_reclaimed(self, make_professional, settings):
+        settings.EXPORT_JOB_TIMEOUT_SECONDS = 600
+        make_professional(name='Ana')
+        job_id = self.client.post(self.url, format='json').data['id']
+        # Worker killed mid-job
+        ExportJob.objects.filter(id=job_id).update(
+            status='RUNNING', started_at=timezone.now() - timedelta(minutes=30), processed_rows=1
+        )
+
+        call_command('run_export_worker', '--once')
+
+        job = ExportJob.objects.get(id=job_id)
+        assert job.status == 'DONE'
+        assert job.total_rows == 1
+
+    def test_recent_running_job_is_not_reclaimed(self, settings):
+        settings.EXPORT_JOB_TIMEOUT_SECONDS = 600
+        job_id = self.client.post(self.url, format='json').data['id']
+        ExportJob.objects.filter(id=job_id).update(status='RUNNING', started_at=timezone.now())
+
+        call_command('run_export_worker', '--once')
+
+        assert ExportJob.objects.get(id=job_id).status == 'RUNNING'
+
+    def test_stale_job_is_not_reused(self, settings):
+        settings.EXPORT_JOB_TIMEOUT_SECONDS = 600
+        first_id = self.client.post(self.url, format='json').data['id']
+        ExportJob.objects.filter(id=first_id).update(
+            status='RUNNING', started_at=timezone.now() - timedelta(minutes=30)
+        )
+
+        response = self.client.post(self.url, format='json')
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data['id'] != first_id
+
+    def test_invalid_format_rejected(self):
+        response = self.client.post(self.url, {'format': 'pdf'}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_export_jobs_denied_for_anon(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.post(self.url)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -72,7 +72,7 @@ class TestEmailIntegration:
         data = {
             "name": "Integration Doc",
             "email": "integration@test.com",
-            "cpf": "12345678901",
+            "cpf": "12345678909",
             "phone": "999999999",
             "education": "Ortopedia",
             "council_name": "CRM",
@@ -0,0 +1,54 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from professionals.models import Document
+
+
+@pytest.mark.django_db
+class TestListRepresentation:
+    def setup_method(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_superuser('admin', 'admin@test.com', 'password')
+        self.client.force_authenticate(user=self.admin_user)
+
+    @pytest.fixture(autouse=True)
+    def media_root(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+
+    def _add_documents(self, prof, count):
+        for i in range(count):
+            Document.objects.create(
+                professional=prof, description=f'Doc {i}',
+                file=SimpleUploadedFile(f'doc{i}.pdf', b'%PDF-1.4 content', content_type='application/pdf')
+            )
+
+    def test_list_has_no_nested_documents(self, make_professional):
+        prof = make_professional()
+        self._add_documents(prof, 2)
+
+        response = self.client.get('/api/professionals/')
+        assert response.status_code == status.HTTP_200_OK
+        item = response.data['results'][0]
+        assert 'documents' not in item
+        assert item['name'] == prof.name
+        assert item['status'] == 'PENDING'
+
+    def test_list_sparse_fieldset(self, make_professional):
+        make_professional()
+        response = self.client.get('/api/professionals/', {'fields': 'name,status,unknown'})
+        assert set(response.data['results'][0]) == {'id', 'name', 'status'}
+
+    def test_retrieve_prefetches_documents(self, make_professional):
+        prof = make_professional()
+        self._add_documents(prof, 3)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f'/api/professionals/{prof.id}/')
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['documents']) == 3
+        document_queries = [q for q in ctx.captured_queries if 'professionals_document' in q['sql']]
+        assert len(document_queries) == 1
@@ -0,0 +1,77 @@
+import base64
+import json
+import pytest
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from professionals.models import Professional
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    @pytest.fixture(autouse=True)
+    def setup_data(self, make_professional):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_superuser('admin', 'admin@test.com', 'password')
+        self.client.force_authenticate(user=self.admin_user)
+
+        # Several rows share the same submission_date to exercise the id tie-breaker
+        base = timezone.now() - timedelta(days=1)
+        for i in range(8):
+            prof = make_professional(
+                name=f'Prof {chr(72 - i)}', cpf=f'{i:011d}',
+                status='APPROVED' if i % 2 else 'PENDING'
+            )
+            Professional.objects.filter(pk=prof.pk).update(submission_date=base - timedelta(hours=i // 3))
+
+    def _walk(self, url, params):
+        ids = []
+        response = self.client.get(url, params)
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            ids.extend(item['id'] for item in response.data['results'])
+            if not response.data['next']:
+                return ids, response
+            response = self.client.get(response.data['next'])
+
+    def test_walks_every_row_once_in_order(self):
+        ids, _ = self._walk('/api/professionals/', {'page_size': 3})
+        expected = [str(pk) for pk in Professional.objects.order_by('-submission_date', '-id').values_list('id', flat=True)]
+        assert ids == expected
+
+    def test_previous_link_returns_previous_page(self):
+        first = self.client.get('/api/professionals/', {'page_size': 3})
+        assert first.data['previous'] is None
+        second = self.client.get(first.data['next'])
+        assert second.data['previous']
+
+        back = self.client.get(second.data['previous'])
+        assert [item['id'] for item in back.data['results']] == [item['id'] for item in first.data['results']]
+        assert back.data['next']
+
+    def test_respects_filters_and_ordering(self):
+        ids, _ = self._walk('/api/professionals/', {'page_size': 2, 'status': 'APPROVED', 'ordering': 'name'})
+        expected = [str(pk) for pk in Professional.objects.filter(status='APPROVED').order_by('name', 'id').values_list('id', flat=True)]
+        assert ids == expected
+
+    def test_respects_search(self):
+        ids, response = self._walk('/api/professionals/', {'page_size': 2, 'search': 'Prof H'})
+        assert len(ids) == 1
+        assert response.data['next'] is None
+
+    def test_page_size_is_capped(self):
+        response = self.client.get('/api/professionals/', {'page_size': 10000})
+        assert len(response.data['results']) == 8
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/professionals/', {'cursor': 'not-a-cursor'})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.parametrize('values', [['garbage', 'x'], [{'a': 1}, []], [None, None]])
+    def test_tampered_cursor_values(self, values):
+        token = base64.urlsafe_b64encode(json.dumps({'v': values, 'r': 0}).encode('utf-8')).decode('ascii')
+        response = self.client.get('/api/professionals/', {'cursor': token})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.data['detail'] == 'Cursor inválido.'
@@ -43,7 +43,7 @@ class TestAccessControl:
         """Rule 1a: Anonymous user CAN create a registration"""
         data = {
             "name": "Public User",
-            "cpf": "88888888888",
+            "cpf": "88811144450",
             "email": "public@test.com",
             "phone": "11888888888",
             "birth_date": "2000-01-01",
@@ -2,6 +2,8 @@ import pytest
 from rest_framework.test import APIClient
 from rest_framework import status
 from unittest.mock import patch, MagicMock
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from core.services.cnpj.interfaces import CNPJResult
 
 @pytest.mark.django_db
@@ -35,12 +37,12 @@ class TestPFPJValidation:
         data = {
             **self.base_data,
             "person_type": "PF",
-            "cpf": "12345678901",
+            "cpf": "12345678909",
         }
         response = self.client.post('/api/professionals/', data, format='json')
         assert response.status_code == status.HTTP_201_CREATED
         assert response.data['person_type'] == 'PF'
-        assert response.data['cpf'] == '12345678901'
+        assert response.data['cpf'] == '12345678909'
         assert response.data['cnpj'] is None
 
     def test_create_pf_missing_cpf(self):
@@ -58,8 +60,8 @@ class TestPFPJValidation:
         data = {
             **self.base_data,
             "person_type": "PF",
-            "cpf": "12345678901",
-            "cnpj": "12345678000199"
+            "cpf": "12345678909",
+            "cnpj": "12345678000195"
         }
         response = self.client.post('/api/professionals/', data, format='json')
         assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -73,15 +75,15 @@ class TestPFPJValidation:
         data = {
             **self.base_data,
             "person_type": "PJ",
-            "cnpj": "12345678000199",
+            "cnpj": "12345678000195",
             "company_name": "Minha Empresa LTDA",
             "technical_manager_name": "Gestor Token",
-            "technical_manager_cpf": "99988877766"
+            "technical_manager_cpf": "99988877714"
         }
         response = self.client.post('/api/professionals/', data, format='json')
         assert response.status_code == status.HTTP_201_CREATED
         assert response.data['person_type'] == 'PJ'
-        assert response.data['cnpj'] == '12345678000199'
+        assert response.data['cnpj'] == '12345678000195'
         assert response.data['cpf'] is None
 
     def test_create_pj_missing_cnpj(self):
@@ -98,9 +100,52 @@ class TestPFPJValidation:
         data = {
             **self.base_data,
             "person_type": "PJ",
-            "cnpj": "12345678000199",
-            "cpf": "12345678901"
+            "cnpj": "12345678000195",
+            "cpf": "12345678909"
         }
         response = self.client.post('/api/professionals/', data, format='json')
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert 'cpf' in response.data
+
+    def test_invalid_cpf_check_digits_rejected_without_query(self):
+        data = {
+            **self.base_data,
+            "person_type": "PF",
+            "cpf": "12345678901",
+        }
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post('/api/professionals/', data, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['cpf'] == ['CPF inválido.']
+        assert not any('professionals_professional' in query['sql'] for query in ctx.captured_queries)
+
+    @patch('core.services.cnpj.service.CNPJService.validate_cnpj')
+    def test_invalid_cnpj_check_digits_rejected_before_lookup(self, mock_validate):
+        data = {
+            **self.base_data,
+            "person_type": "PJ",
+            "cnpj": "12345678000199",
+            "company_name": "Minha Empresa LTDA",
+            "technical_manager_name": "Gestor Token",
+            "technical_manager_cpf": "99988877766"
+        }
+        response = self.client.post('/api/professionals/', data, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['cnpj'] == ['CNPJ inválido.']
+        assert response.data['technical_manager_cpf'] == ['CPF do responsável técnico inválido.']
+        mock_validate.assert_not_called()
+
+    @patch('core.services.cnpj.service.CNPJService.validate_cnpj')
+    def test_create_pj_with_alphanumeric_cnpj(self, mock_validate):
+        mock_validate.return_value = CNPJResult(valid=True, status='ATIVA', message='OK')
+        data = {
+            **self.base_data,
+            "person_type": "PJ",
+            "cnpj": "12abc34501de35",
+            "company_name": "Minha Empresa LTDA",
+            "technical_manager_name": "Gestor Token",
+            "technical_manager_cpf": "99988877714"
+        }
+        response = self.client.post('/api/professionals/', data, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['cnpj'] == '12ABC34501DE35'
@@ -0,0 +1,64 @@
+import json
+import pytest
+from datetime import timedelta
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+from professionals.dashboard import ANALYSIS_DURATION, FINALIZED_STATUSES
+from professionals.management.commands.benchmark_indexes import QUERY_INDEXES
+from professionals.models import Professional
+
+
+@pytest.mark.django_db
+class TestProfessionalQueryIndexes:
+    @pytest.fixture(autouse=True)
+    def setup_data(self, make_professional):
+        statuses = ['PENDING', 'APPROVED', 'REJECTED', 'ADJUSTMENT_REQUESTED']
+        for i in range(20):
+            make_professional(cpf=f'{i:011d}', status=statuses[i % 4])
+
+    def test_duplicate_cpf_check_uses_composite_index(self):
+        plan = Professional.objects.filter(
+            cpf='00000000001', submission_date__gte=timezone.now() - timedelta(days=90)
+        ).explain()
+        assert 'prof_cpf_submitted_idx' in plan
+
+    def test_status_list_uses_status_index(self):
+        plan = Professional.objects.filter(status='APPROVED').order_by('-submission_date', '-id').explain()
+        assert 'prof_status_submitted_idx' in plan
+
+    def test_pending_queue_is_read_in_index_order(self):
+        # SQLite treats the partial PENDING index and the status index as equivalent;
+        # either way the page is read in order without a sort
+        plan = Professional.objects.filter(status='PENDING').order_by('-submission_date', '-id').explain()
+        assert 'prof_pending_idx' in plan or 'prof_status_submitted_idx' in plan
+        assert 'TEMP B-TREE' not in plan
+
+    def test_finalized_aggregate_avoids_full_scan(self):
+        # On large tables the covering prof_finalized_idx is picked (see benchmark_indexes)
+        queryset = Professional.objects.filter(status__in=FINALIZED_STATUSES).order_by()
+        plan = queryset.annotate(duration=ANALYSIS_DURATION).values('duration').explain()
+        assert 'prof_finalized_idx' in plan or 'prof_status_submitted_idx' in plan
+
+
+@pytest.mark.django_db(transaction=True)
+def test_benchmark_indexes_records_plans(tmp_path):
+    output = tmp_path / 'plans.json'
+    call_command('benchmark_indexes', rows=200, batch_size=100, repeat=1, output=str(output), i_know_this_locks=True)
+
+    report = json.loads(output.read_text())
+    assert set(report['queries']) == {
+        'duplicate_cpf_check', 'default_list', 'status_list', 'pending_queue', 'finalized_avg'
+    }
+    for runs in report['queries'].values():
+        assert not any(name in runs['before']['plan'] for name in QUERY_INDEXES)
+        assert any(name in runs['after']['plan'] for name in QUERY_INDEXES)
+    # Seeded rows were rolled back
+    assert not Professional.objects.exists()
+
+
+@pytest.mark.django_db
+def test_benchmark_indexes_refuses_to_lock_without_the_flag(settings):
+    settings.DEBUG = False
+    with pytest.raises(CommandError, match='--i-know-this-locks'):
+        call_command('benchmark_indexes', rows=10)
+    assert not Professional.objects.exists()
@@ -0,0 +1,75 @@
+import pytest
+from unittest.mock import patch
+from django.contrib.auth.models import User
+from django.db.backends.postgresql.base import DatabaseWrapper
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from professionals.models import Professional
+from professionals.search import ProfessionalSearchFilter, ProfessionalOrderingFilter, normalize_term
+from professionals.views import ProfessionalViewSet
+
+
+def test_normalize_term():
+    assert normalize_term('José da Conceição') == 'jose da conceicao'
+    assert normalize_term('SÃO PAULO') == 'sao paulo'
+
+
+@pytest.mark.django_db
+class TestProfessionalSearch:
+    def setup_method(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_superuser('admin', 'admin@test.com', 'password')
+        self.client.force_authenticate(user=self.admin_user)
+
+    def _search(self, term):
+        response = self.client.get('/api/professionals/', {'search': term})
+        return {row['name'] for row in response.data['results']}
+
+    def test_fallback_covers_all_search_columns(self, make_professional):
+        make_professional(name='Ana', cpf='11111111111', email='ana@test.com', city='Campinas')
+        make_professional(
+            name='Clinica Razao', person_type='PJ', cpf=None, cnpj='11222333000181',
+            company_name='Clinica Vida', email='contato@vida.com'
+        )
+
+        assert self._search('Campinas') == {'Ana'}
+        assert self._search('Vida') == {'Clinica Razao'}
+        assert self._search('11222333') == {'Clinica Razao'}
+        assert self._search('ana@test') == {'Ana'}
+
+
+class TestPostgresSearchQuery:
+    """Compiles the PostgreSQL query without a server to check it targets the trigram index."""
+
+    def _sql(self, params):
+        request = Request(APIRequestFactory().get('/api/professionals/', params))
+        view = ProfessionalViewSet(action='list', request=request, format_kwarg=None)
+        queryset = Professional.objects.all()
+        with patch('professionals.search.connection') as connection:
+            connection.vendor = 'postgresql'
+            queryset = ProfessionalSearchFilter().filter_queryset(request, queryset, view)
+        queryset = ProfessionalOrderingFilter().filter_queryset(request, queryset, view)
+
+        pg = DatabaseWrapper({
+            'ENGINE': 'django.db.backends.postgresql', 'NAME': 'test', 'USER': '', 'PASSWORD': '',
+            'HOST': '', 'PORT': '', 'OPTIONS': {}, 'TIME_ZONE': None, 'CONN_MAX_AGE': 0,
+            'CONN_HEALTH_CHECKS': False, 'AUTOCOMMIT': True, 'ATOMIC_REQUESTS': False,
+        })
+        sql, sql_params = queryset.query.get_compiler(connection=pg).as_sql()
+        return sql, sql_params, queryset.query.order_by
+
+    def test_terms_are_normalized_and_ranked(self):
+        sql, params, order_by = self._sql({'search': 'José Conceição'})
+
+        document = 'professional_search_text("professionals_professional"."name", ' \
+                   '"professionals_professional"."company_name", "professionals_professional"."cpf", ' \
+                   '"professionals_professional"."cnpj", "professionals_professional"."email", ' \
+                   '"professionals_professional"."city")'
+        assert f'{document}::text LIKE' in sql
+        assert 'word_similarity' in sql
+        assert order_by == ('-search_rank',)
+        assert '%jose%' in params and '%conceicao%' in params
+
+    def test_explicit_ordering_wins_over_rank(self):
+        _, _, order_by = self._sql({'search': 'ana', 'ordering': 'name'})
+        assert order_by == ('name',)
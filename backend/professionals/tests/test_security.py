@@ -12,7 +12,7 @@ class TestSecurityHardening:
         self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
         self.professional_data = {
             "name": "Test Prof",
-            "cpf": "12345678901",
+            "cpf": "12345678909",
             "email": "test@example.com",
             "phone": "11999999999",
             "birth_date": "1990-01-01",
@@ -64,7 +64,7 @@ class TestSecurityHardening:
         prof_id = prof_res.data['id']
 
         # 2. Upload
-        file = SimpleUploadedFile("test.pdf", b"file_content", content_type="application/pdf")
+        file = SimpleUploadedFile("test.pdf", b"%PDF-1.4 file_content", content_type="application/pdf")
         data = {
             "professional": prof_id,
             "description": "Diploma",
@@ -0,0 +1,135 @@
+import hashlib
+import pytest
+from unittest.mock import patch
+from django.core.files.uploadedfile import InMemoryUploadedFile, SimpleUploadedFile
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+from professionals.models import Document, DOCUMENT_MAX_SIZE
+from professionals.uploads import DocumentUploadHandler, sniff_content_type
+
+PDF_CONTENT = b'%PDF-1.4 test document'
+PNG_CONTENT = b'\x89PNG\r\n\x1a\n' + b'\x00' * 64
+JPEG_CONTENT = b'\xff\xd8\xff\xe0' + b'\x00' * 64
+
+
+class TestSniffContentType:
+    def test_known_formats(self):
+        assert sniff_content_type(PDF_CONTENT) == 'application/pdf'
+        assert sniff_content_type(PNG_CONTENT) == 'image/png'
+        assert sniff_content_type(JPEG_CONTENT) == 'image/jpeg'
+
+    def test_unknown_format(self):
+        assert sniff_content_type(b'MZ\x90\x00') is None
+        assert sniff_content_type(b'') is None
+
+
+class TestDocumentUploadHandler:
+    def start(self, file_name='diploma.pdf'):
+        handler = DocumentUploadHandler()
+        handler.new_file('file', file_name, 'application/pdf', None)
+        return handler
+
+    def test_hashes_chunks_as_they_arrive(self):
+        handler = self.start()
+        chunks = [b'%PDF-1.4 ', b'a' * 1000, b'b' * 10]
+        position = 0
+        for chunk in chunks:
+            assert handler.receive_data_chunk(chunk, position) == chunk
+            position += len(chunk)
+
+        assert handler.file_complete(position) is None
+        assert handler.received['file'] == (
+            position, hashlib.sha256(b''.join(chunks)).hexdigest(), 'application/pdf'
+        )
+
+    def test_stops_as_soon_as_the_limit_is_crossed(self):
+        handler = self.start()
+        chunk = b'%PDF-' + b'a' * (handler.chunk_size - 5)
+        handler.receive_data_chunk(chunk, 0)
+        position = len(chunk)
+        filler = b'a' * handler.chunk_size
+        with pytest.raises(ValidationError):
+            while True:
+                handler.receive_data_chunk(filler, position)
+                position += len(filler)
+        # Aborted on the chunk that crossed the limit, not at the end of the stream
+        assert position <= DOCUMENT_MAX_SIZE
+
+    def test_rejects_content_that_does_not_match_extension(self):
+        handler = self.start('diploma.pdf')
+        with pytest.raises(ValidationError):
+            handler.receive_data_chunk(PNG_CONTENT, 0)
+
+    def test_rejects_disallowed_extension(self):
+        with pytest.raises(ValidationError):
+            self.start('payload.exe')
+
+    def test_rejects_declared_oversize_body_before_reading(self):
+        handler = DocumentUploadHandler()
+        with pytest.raises(ValidationError):
+            handler.handle_raw_input(None, {}, DOCUMENT_MAX_SIZE * 2, b'boundary')
+
+
+@pytest.mark.django_db
+class TestDocumentUploadEndpoint:
+    @pytest.fixture(autouse=True)
+    def setup_data(self, make_professional):
+        self.client = APIClient()
+        self.professional = make_professional()
+
+    @pytest.fixture(autouse=True)
+    def media_root(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+
+    def upload(self, name, content, content_type='application/octet-stream'):
+        file = SimpleUploadedFile(name, content, content_type=content_type)
+        return self.client.post(
+            '/api/documents/',
+            {'professional': self.professional.id, 'description': 'Diploma', 'file': file},
+            format='multipart'
+        )
+
+    def test_records_streamed_checksum_and_sniffed_type(self):
+        response = self.upload('foto.png', PNG_CONTENT)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        document = Document.objects.get(id=response.data['id'])
+        assert document.sha256 == hashlib.sha256(PNG_CONTENT).hexdigest()
+        assert document.size == len(PNG_CONTENT)
+        # The client-declared type is replaced by what the bytes say
+        assert document.content_type == 'image/png'
+
+    def test_file_is_read_once_to_store_it(self):
+        # Storing the upload reads it; Document.save() no longer hashes it a second time
+        original = InMemoryUploadedFile.chunks
+        with patch.object(InMemoryUploadedFile, 'chunks', autospec=True, side_effect=original) as chunks:
+            response = self.upload('diploma.pdf', PDF_CONTENT)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert chunks.call_count == 1
+
+    def test_disguised_file_is_rejected(self):
+        response = self.upload('diploma.pdf', b'MZ\x90\x00 not a pdf')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'file' in response.data
+        assert not Document.objects.exists()
+
+    def test_oversize_body_is_rejected_before_reading_the_file(self):
+        content = b'%PDF-1.4 ' + b'a' * (6 * 1024 * 1024)
+        with patch.object(TemporaryFileUploadHandler, 'receive_data_chunk') as write_chunk:
+            response = self.upload('diploma.pdf', content)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['file'] == ['Arquivo muito grande. O tamanho máximo é 5MB.']
+        write_chunk.assert_not_called()
+        assert not Document.objects.exists()
+
+    def test_file_just_over_the_limit_is_rejected_while_streaming(self):
+        response = self.upload('diploma.pdf', b'%PDF-1.4 ' + b'a' * DOCUMENT_MAX_SIZE)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['file'] == ['Arquivo muito grande. O tamanho máximo é 5MB.']
+        assert not Document.objects.exists()
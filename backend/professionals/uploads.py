@@ -0,0 +1,175 @@
+"""
+Document uploads: the streaming handler that checks multipart uploads while they
+are received, and direct-to-S3 uploads, where the browser POSTs the file to the
+bucket with a presigned form and only the resulting key goes through the API.
+"""
+import hashlib
+import os
+import uuid
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.files.uploadhandler import FileUploadHandler
+from django.utils.text import get_valid_filename
+from rest_framework.exceptions import ValidationError
+from .models import Document, DOCUMENT_CONTENT_TYPES, DOCUMENT_MAX_SIZE, document_prefix
+
+# Leading bytes of each accepted format
+MAGIC_NUMBERS = (
+    (b'%PDF-', 'application/pdf'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+)
+
+FILE_TOO_LARGE = 'Arquivo muito grande. O tamanho máximo é 5MB.'
+FILE_TYPE_NOT_ALLOWED = 'Tipo de arquivo não permitido. Envie PDF, JPG ou PNG.'
+FILE_CONTENT_MISMATCH = 'O conteúdo do arquivo não corresponde a um PDF, JPG ou PNG.'
+
+
+class DirectUploadUnavailable(Exception):
+    """The configured storage cannot issue presigned uploads (local filesystem)."""
+
+
+def document_storage():
+    storage = default_storage
+    # S3Boto3Storage exposes the bucket; FileSystemStorage (dev/tests) does not
+    if not hasattr(storage, 'bucket_name') or not hasattr(storage, 'connection'):
+        raise DirectUploadUnavailable()
+    return storage
+
+
+def document_key(professional, filename):
+    """Storage name for a new upload; the random part keeps concurrent uploads apart."""
+    stem, extension = os.path.splitext(get_valid_filename(os.path.basename(filename)))
+    # FileField names are limited to 100 characters
+    name = stem[:40 - len(extension)] + extension
+    return f'{document_prefix(professional.id)}{uuid.uuid4().hex[:8]}/{name}'
+
+
+def content_type_for(filename):
+    extension = os.path.splitext(filename)[1].lower().lstrip('.')
+    return DOCUMENT_CONTENT_TYPES.get(extension)
+
+
+def sniff_content_type(head):
+    """Content type of the accepted format `head` starts with, or None."""
+    for magic, content_type in MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return content_type
+    return None
+
+
+class DocumentUploadHandler(FileUploadHandler):
+    """
+    Runs ahead of Django's memory / temporary-file handlers on document uploads.
+    Oversize files and files whose first bytes do not match their extension are
+    rejected while the body is still being read, before they reach the disk, and
+    the sha256 is computed chunk by chunk on the way through.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        # field name -> (size, sha256, sniffed content type)
+        self.received = {}
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        # The other form fields and the multipart framing fit well within a chunk
+        if content_length and content_length > DOCUMENT_MAX_SIZE + self.chunk_size:
+            raise ValidationError({'file': [FILE_TOO_LARGE]})
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        super().new_file(field_name, file_name, *args, **kwargs)
+        self.expected_type = content_type_for(file_name)
+        if self.expected_type is None:
+            raise ValidationError({field_name: [FILE_TYPE_NOT_ALLOWED]})
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        if start == 0 and sniff_content_type(raw_data) != self.expected_type:
+            raise ValidationError({self.field_name: [FILE_CONTENT_MISMATCH]})
+        self.size += len(raw_data)
+        if self.size > DOCUMENT_MAX_SIZE:
+            raise ValidationError({self.field_name: [FILE_TOO_LARGE]})
+        self.digest.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        self.received[self.field_name] = (self.size, self.digest.hexdigest(), self.expected_type)
+        # The next handler builds the UploadedFile
+        return None
+
+
+def presigned_post(name, content_type, storage=None):
+    """
+    Presigned S3 POST form for storage name `name`. The bucket itself rejects
+    another key, another Content-Type or a body larger than DOCUMENT_MAX_SIZE.
+    """
+    storage = storage or document_storage()
+    key = storage._normalize_name(name)
+    client = storage.connection.meta.client
+    return client.generate_presigned_post(
+        Bucket=storage.bucket_name,
+        Key=key,
+        Fields={'Content-Type': content_type},
+        Conditions=[
+            {'Content-Type': content_type},
+            ['content-length-range', 1, DOCUMENT_MAX_SIZE],
+        ],
+        ExpiresIn=settings.DOCUMENT_PRESIGN_EXPIRES_SECONDS,
+    )
+
+
+def uploaded_object(name, storage=None):
+    """(size, content_type) of an uploaded object, or None when it does not exist (one HEAD request)."""
+    from botocore.exceptions import ClientError
+
+    storage = storage or document_storage()
+    client = storage.connection.meta.client
+    try:
+        head = client.head_object(Bucket=storage.bucket_name, Key=storage._normalize_name(name))
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+            return None
+        raise
+    return head['ContentLength'], head.get('ContentType', '')
+
+
+def uploaded_object_head(name, storage=None, length=16):
+    """First `length` bytes of an uploaded object (ranged GET), enough for sniff_content_type."""
+    storage = storage or document_storage()
+    client = storage.connection.meta.client
+    response = client.get_object(
+        Bucket=storage.bucket_name, Key=storage._normalize_name(name), Range=f'bytes=0-{length - 1}'
+    )
+    return response['Body'].read(length)
+
+
+def uploaded_object_sha256(name, storage=None, chunk_size=64 * 1024):
+    """sha256 of an uploaded object, streamed from the bucket."""
+    storage = storage or document_storage()
+    client = storage.connection.meta.client
+    body = client.get_object(Bucket=storage.bucket_name, Key=storage._normalize_name(name))['Body']
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: body.read(chunk_size), b''):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def copy_object(storage, source, target):
+    """
+    Copies `source` to a free name based on `target` and returns that name.
+    Server-side on S3; streamed through this process on other storages.
+    """
+    name = storage.get_available_name(target, max_length=Document._meta.get_field('file').max_length)
+    if hasattr(storage, 'bucket'):
+        storage.bucket.Object(storage._normalize_name(name)).copy_from(
+            CopySource={'Bucket': storage.bucket_name, 'Key': storage._normalize_name(source)}
+        )
+        return name
+    with storage.open(source, 'rb') as f:
+        return storage.save(name, f)
+
+
+def delete_uploaded_object(name, storage=None):
+    storage = storage or document_storage()
+    storage.connection.meta.client.delete_object(Bucket=storage.bucket_name, Key=storage._normalize_name(name))
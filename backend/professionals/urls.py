@@ -1,11 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ProfessionalViewSet, DocumentViewSet, DashboardViewSet
+from .views import ProfessionalViewSet, DocumentViewSet, DashboardViewSet, ExportJobViewSet
 
 router = DefaultRouter()
 router.register(r'professionals', ProfessionalViewSet)
 router.register(r'documents', DocumentViewSet)
 router.register(r'admin/dashboard', DashboardViewSet, basename='admin-dashboard')
+router.register(r'admin/export-jobs', ExportJobViewSet, basename='export-job')
 
 urlpatterns = [
     path('', include(router.urls)),
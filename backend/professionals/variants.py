@@ -0,0 +1,179 @@
+"""
+Post-upload image variants: a downscaled JPEG preview and a small WebP (or JPEG)
+thumbnail of every image document, stored next to the original so admins do not
+have to download a full-size phone photo to look at it. Under the content-addressed
+layout they belong to the DocumentBlob and are built once per content.
+"""
+import io
+import logging
+import posixpath
+from datetime import timedelta
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .uploads import content_type_for
+
+logger = logging.getLogger(__name__)
+
+VARIANTS = ('preview', 'thumbnail')
+PREVIEW_QUALITY = 82
+THUMBNAIL_QUALITY = 75
+EXTENSIONS = {'JPEG': '.jpg', 'WEBP': '.webp'}
+
+
+class ImageTooLarge(ValueError):
+    """The image would decode to more than DOCUMENT_VARIANTS_MAX_PIXELS pixels."""
+
+
+def is_image(document):
+    content_type = document.content_type or content_type_for(document.file.name) or ''
+    return content_type.startswith('image/')
+
+
+def thumbnail_format():
+    from PIL import features
+
+    requested = settings.DOCUMENT_THUMBNAIL_FORMAT.upper()
+    # Pillow builds without libwebp fall back to JPEG
+    if requested == 'WEBP' and not features.check('webp'):
+        return 'JPEG'
+    return requested if requested in EXTENSIONS else 'JPEG'
+
+
+def _flatten(image):
+    """RGB copy of `image`; transparency (PNG screenshots, scans) goes on white."""
+    from PIL import Image
+
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def _encode(image, image_format, quality):
+    buffer = io.BytesIO()
+    options = {'quality': quality, 'optimize': True}
+    if image_format == 'JPEG':
+        options['progressive'] = True
+    else:
+        options['method'] = 4
+    image.save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def render_variants(fileobj):
+    """(preview JPEG bytes, thumbnail bytes, thumbnail format) of an image file."""
+    from PIL import Image, ImageOps
+
+    preview_side = settings.DOCUMENT_PREVIEW_MAX_SIDE
+    with Image.open(fileobj) as source:
+        # JPEG: decode at a reduced scale straight away instead of the full sensor size
+        source.draft('RGB', (preview_side, preview_side))
+        # Nothing is decoded yet: size comes from the header (JPEG: already the draft scale)
+        pixels = source.width * source.height
+        if pixels > settings.DOCUMENT_VARIANTS_MAX_PIXELS:
+            raise ImageTooLarge(f'{source.width}x{source.height} exceeds DOCUMENT_VARIANTS_MAX_PIXELS')
+        # Phone photos are stored sideways with an EXIF orientation tag
+        image = _flatten(ImageOps.exif_transpose(source))
+
+    image.thumbnail((preview_side, preview_side), Image.LANCZOS)
+    preview = _encode(image, 'JPEG', PREVIEW_QUALITY)
+
+    image_format = thumbnail_format()
+    side = settings.DOCUMENT_THUMBNAIL_MAX_SIDE
+    image.thumbnail((side, side), Image.LANCZOS)
+    return preview, _encode(image, image_format, THUMBNAIL_QUALITY), image_format
+
+
+def claim_next_document():
+    """
+    Marks the oldest document waiting for variants as processing and returns it (None if there is none).
+    Documents left PROCESSING by a worker that died are claimed again after DOCUMENT_VARIANTS_TIMEOUT_SECONDS.
+    """
+    from .models import Document
+
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.DOCUMENT_VARIANTS_TIMEOUT_SECONDS)
+    with transaction.atomic():
+        document = (
+            Document.objects.select_for_update(skip_locked=True)
+            .filter(Q(variants_status='PENDING') | Q(variants_status='PROCESSING', variants_claimed_at__lt=stale))
+            .order_by('uploaded_at')
+            .first()
+        )
+        if document is None:
+            return None
+        if document.variants_status == 'PROCESSING':
+            logger.warning(
+                "Reclaiming stale document variants",
+                extra={"event": "document_variants_reclaimed", "document_id": str(document.id)}
+            )
+        document.variants_status = 'PROCESSING'
+        document.variants_claimed_at = now
+        document.save(update_fields=['variants_status', 'variants_claimed_at'])
+    return document
+
+
+def _store_variants(owner):
+    """Renders the variants of `owner.file` onto `owner` (a Document or a DocumentBlob), unsaved."""
+    with owner.file.open('rb') as f:
+        preview, thumbnail, image_format = render_variants(f)
+    stem = posixpath.splitext(posixpath.basename(owner.file.name))[0]
+    owner.preview.save(f'{stem}.preview.jpg', ContentFile(preview), save=False)
+    owner.thumbnail.save(f'{stem}.thumb{EXTENSIONS[image_format]}', ContentFile(thumbnail), save=False)
+
+
+def _share_blob_variants(document):
+    """
+    Content-addressed documents point at their blob's variants, rendered only by the
+    first document of that content. Returns False when the blob already had them.
+    """
+    from .models import DocumentBlob
+
+    with transaction.atomic():
+        # Documents of the same blob processed concurrently wait here instead of rendering twice
+        blob = DocumentBlob.objects.select_for_update().get(pk=document.blob_id)
+        rendered = not blob.preview
+        if rendered:
+            _store_variants(blob)
+            blob.save(update_fields=['preview', 'thumbnail'])
+    document.preview, document.thumbnail = blob.preview.name, blob.thumbnail.name
+    return rendered
+
+
+def process_document(document):
+    """Builds and stores the variants of a claimed document; PDFs are skipped."""
+    if not is_image(document):
+        document.variants_status = 'SKIPPED'
+        document.save(update_fields=['variants_status'])
+        return document
+
+    try:
+        if document.blob_id:
+            rendered = _share_blob_variants(document)
+        else:
+            _store_variants(document)
+            rendered = True
+        document.variants_status = 'DONE'
+    except Exception as e:
+        logger.error(
+            f"Document variants failed: {str(e)}",
+            extra={"event": "document_variants_failed", "document_id": str(document.id)}
+        )
+        document.variants_status = 'FAILED'
+        document.save(update_fields=['variants_status'])
+        return document
+
+    document.save(update_fields=['variants_status', 'preview', 'thumbnail'])
+    logger.info(
+        "Document variants stored" if rendered else "Document variants reused",
+        extra={
+            "event": "document_variants_stored" if rendered else "document_variants_reused",
+            "document_id": str(document.id), "original_size": document.size,
+        }
+    )
+    return document
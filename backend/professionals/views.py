@@ -1,14 +1,32 @@
 from rest_framework import viewsets, permissions, parsers, filters, status
 from django.db import transaction
+from django.http import StreamingHttpResponse
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
 from datetime import timedelta
-from django.db.models import Count, Avg, F
-from django.db.models.functions import TruncMonth
-from .models import Professional, Document
-from .serializers import ProfessionalSerializer, DocumentSerializer, ProfessionalManagementSerializer
+from django.conf import settings
+from django.db.models import Q
+from .models import Professional, Document, ExportJob, DOCUMENT_MAX_SIZE
+from .dashboard import cached_dashboard_payload
+from .pagination import KeysetPagination
+from .search import ProfessionalSearchFilter, ProfessionalOrderingFilter
+from .serializers import (
+    ProfessionalSerializer, ProfessionalListSerializer, DocumentSerializer,
+    ProfessionalManagementSerializer, ExportJobSerializer,
+    DocumentPresignSerializer, DocumentFinalizeSerializer,
+)
+from .uploads import (
+    DirectUploadUnavailable, DocumentUploadHandler, document_storage, document_key,
+    content_type_for, presigned_post, uploaded_object, uploaded_object_head, uploaded_object_sha256, delete_uploaded_object,
+    sniff_content_type, FILE_TOO_LARGE, FILE_CONTENT_MISMATCH,
+)
+from .exports import (
+    EXPORT_COLUMNS, EXPORT_KEYS, XLSX_CONTENT_TYPE, CSV_CONTENT_TYPE, NDJSON_CONTENT_TYPE,
+    value_rows, stream_xlsx, stream_csv, stream_ndjson, export_filters_hash, stale_before,
+)
+from .variants import VARIANTS
 from audit.models import AuditLog
 
 import logging
@@ -18,10 +36,12 @@ class ProfessionalViewSet(viewsets.ModelViewSet):
     queryset = Professional.objects.all()
     serializer_class = ProfessionalSerializer
     permission_classes = [permissions.AllowAny] # Open for registration, restricted for listing?
+    pagination_class = KeysetPagination
     
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, ProfessionalSearchFilter, ProfessionalOrderingFilter]
     filterset_fields = ['status', 'education']
-    search_fields = ['name', 'cpf', 'email']
+    # Fallback lookup outside PostgreSQL, which searches the trigram-indexed document instead
+    search_fields = ['name', 'company_name', 'cpf', 'cnpj', 'email', 'city']
     ordering_fields = ['submission_date', 'name']
     ordering = ['-submission_date']
     
@@ -30,7 +50,18 @@ class ProfessionalViewSet(viewsets.ModelViewSet):
             return [permissions.AllowAny()]
         return [permissions.IsAdminUser()] # Admin only for list/retrieve/update
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            # Only the grid columns (and the keyset ordering fields) are loaded
+            return queryset.only(*ProfessionalListSerializer.Meta.fields)
+        if self.action == 'retrieve':
+            return queryset.prefetch_related('documents')
+        return queryset
+
     def get_serializer_class(self):
+        if self.action == 'list':
+            return ProfessionalListSerializer
         if self.action in ['update', 'partial_update'] and self.request.user.is_staff:
             return ProfessionalManagementSerializer
         return ProfessionalSerializer
@@ -148,85 +179,12 @@ class ProfessionalViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     def _generate_excel_response(self, queryset, filename):
-        import openpyxl
-        from django.http import HttpResponse
-
-        response = HttpResponse(
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        # Streamed in chunks: memory stays flat regardless of the number of rows
+        response = StreamingHttpResponse(
+            stream_xlsx(value_rows(queryset), EXPORT_COLUMNS, sheet_title='Profissionais'),
+            content_type=XLSX_CONTENT_TYPE,
         )
         response['Content-Disposition'] = f'attachment; filename={filename}'
-
-        workbook = openpyxl.Workbook()
-        worksheet = workbook.active
-        worksheet.title = 'Profissionais'
-
-        # Strategy A: Universal columns + Specific columns
-        columns = [
-            'Data Envio', 'Status', 'Tipo', 
-            'Nome / Razão Social', 'Nome Fantasia', 
-            'CPF', 'CNPJ', 
-            'Data Nascimento / Abertura', 
-            'Nome Resp. Técnico', 'CPF Resp. Técnico',
-            'Email', 'Telefone', 
-            'CEP', 'Logradouro', 'Número', 'Complemento', 'Bairro', 'Cidade', 'UF',
-            'Formação', 'Instituição', 'Ano Conclusão',
-            'Conselho', 'Nº Conselho', 'Área Atuação', 'Experiência (anos)',
-            'Data Aprovação/Reprovação', 'Responsável Análise'
-        ]
-
-        worksheet.append(columns)
-
-        for prof in queryset:
-            approval_date = prof.approved_at or prof.rejected_at
-            reviewer = prof.approved_by or prof.rejected_by
-            reviewer_name = reviewer.username if reviewer else '-'
-            
-            # Format dates
-            submission_date_str = prof.submission_date.strftime('%d/%m/%Y %H:%M') if prof.submission_date else '-'
-            approval_date_str = approval_date.strftime('%d/%m/%Y %H:%M') if approval_date else '-'
-            birth_date_str = prof.birth_date.strftime('%d/%m/%Y') if prof.birth_date else '-'
-
-            # Determine fields based on type
-            is_pj = prof.person_type == 'PJ'
-            
-            row = [
-                submission_date_str,
-                prof.get_status_display(),
-                prof.get_person_type_display(), # PF or PJ
-                prof.name,
-                prof.company_name if is_pj else '-',
-                prof.cpf if not is_pj else '-',
-                prof.cnpj if is_pj else '-',
-                birth_date_str,
-                prof.technical_manager_name if is_pj else '-',
-                prof.technical_manager_cpf if is_pj else '-',
-                prof.email,
-                prof.phone,
-                prof.zip_code,
-                prof.street,
-                prof.number,
-                prof.complement or '-',
-                prof.neighborhood,
-                prof.city,
-                prof.state,
-                prof.education,
-                prof.institution,
-                prof.graduation_year,
-                prof.council_name,
-                prof.council_number,
-                prof.area_of_action or '-',
-                prof.experience_years,
-                approval_date_str,
-                reviewer_name
-            ]
-            worksheet.append(row)
-
-        # Adjust column widths (auto-size rough approximation)
-        for column_cells in worksheet.columns:
-            length = max(len(str(cell.value) or "") for cell in column_cells)
-            worksheet.column_dimensions[column_cells[0].column_letter].width = length + 2
-
-        workbook.save(response)
         return response
 
     @action(detail=False, methods=['get'], permission_classes=[permissions.IsAdminUser])
@@ -234,6 +192,27 @@ class ProfessionalViewSet(viewsets.ModelViewSet):
         queryset = self.filter_queryset(self.get_queryset())
         return self._generate_excel_response(queryset, 'profissionais_unimed.xlsx')
 
+    @action(detail=False, methods=['get'], permission_classes=[permissions.IsAdminUser])
+    def export_csv(self, request):
+        # Plain rows for ERP/BI loaders: values_list() + streaming, no openpyxl
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(
+            stream_csv(value_rows(queryset), EXPORT_COLUMNS),
+            content_type=CSV_CONTENT_TYPE,
+        )
+        response['Content-Disposition'] = 'attachment; filename=profissionais_unimed.csv'
+        return response
+
+    @action(detail=False, methods=['get'], permission_classes=[permissions.IsAdminUser])
+    def export_ndjson(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(
+            stream_ndjson(value_rows(queryset), EXPORT_KEYS),
+            content_type=NDJSON_CONTENT_TYPE,
+        )
+        response['Content-Disposition'] = 'attachment; filename=profissionais_unimed.ndjson'
+        return response
+
     @action(detail=True, methods=['get'], permission_classes=[permissions.IsAdminUser])
     def export_individual_excel(self, request, pk=None):
         professional = self.get_object()
@@ -246,76 +225,75 @@ class ProfessionalViewSet(viewsets.ModelViewSet):
         
         filename = f"prestador_{clean_name}_{clean_identifier}_{date_str}.xlsx"
         
-        # We pass a list containing the single object to reuse the generation logic
-        return self._generate_excel_response([professional], filename)
+        # Single-row queryset to reuse the generation logic
+        return self._generate_excel_response(Professional.objects.filter(pk=professional.pk), filename)
 
 
-class DashboardViewSet(viewsets.GenericViewSet):
+class ExportJobViewSet(viewsets.GenericViewSet):
+    """
+    Background exports. POST records the ProfessionalViewSet filters (from the body or
+    the query string) and queues a job; the run_export_worker command builds the file.
+    """
+    queryset = ExportJob.objects.all()
+    serializer_class = ExportJobSerializer
     permission_classes = [permissions.IsAdminUser]
 
-    def list(self, request):
-        now = timezone.now()
-        thirty_days_ago = now - timedelta(days=30)
+    def _export_filters(self, request):
+        view = ProfessionalViewSet
+        allowed = list(view.filterset_fields) + [
+            filters.SearchFilter.search_param,
+            filters.OrderingFilter.ordering_param,
+        ]
+        # Filters may come from the query string, the body or both; body keys win
+        export_filters = {}
+        for source in (request.query_params, request.data):
+            for key in allowed:
+                if source.get(key) not in (None, ''):
+                    export_filters[key] = str(source.get(key))
+        return dict(sorted(export_filters.items()))
+
+    def create(self, request):
+        export_format = request.data.get('format', 'xlsx')
+        if export_format not in dict(ExportJob.FORMAT_CHOICES):
+            return Response({"error": f"Formato inválido: {export_format}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        export_filters = self._export_filters(request)
+        filters_hash = export_filters_hash(export_format, export_filters)
+
+        # Identical requests share a live job or a recently finished artifact; jobs older than
+        # EXPORT_JOB_TIMEOUT_SECONDS may belong to a dead worker and are not handed out
+        reuse_after = timezone.now() - timedelta(seconds=settings.EXPORT_JOB_REUSE_SECONDS)
+        stale = stale_before()
+        existing = ExportJob.objects.filter(filters_hash=filters_hash).filter(
+            Q(status='PENDING', created_at__gte=stale)
+            | Q(status='RUNNING', started_at__gte=stale)
+            | Q(status='DONE', finished_at__gte=reuse_after)
+        ).order_by('-created_at').first()
+        if existing:
+            return Response(self.get_serializer(existing).data, status=status.HTTP_200_OK)
+
+        job = ExportJob.objects.create(
+            requested_by=request.user,
+            export_format=export_format,
+            filters=export_filters,
+            filters_hash=filters_hash,
+        )
+        logger.info(
+            "Export job queued",
+            extra={"event": "export_job_queued", "job_id": str(job.id), "filters": export_filters}
+        )
+        return Response(self.get_serializer(job).data, status=status.HTTP_202_ACCEPTED)
 
-        # 1. Total Registrations
-        total_count = Professional.objects.count()
+    def retrieve(self, request, pk=None):
+        return Response(self.get_serializer(self.get_object()).data)
 
-        # 2. Status Counts
-        status_counts = Professional.objects.values('status').annotate(count=Count('id'))
-        
-        # 3. Recent Counts (30, 60, 90 days)
-        sixty_days_ago = now - timedelta(days=60)
-        ninety_days_ago = now - timedelta(days=90)
-        
-        last_30_days = Professional.objects.filter(submission_date__gte=thirty_days_ago).count()
-        last_60_days = Professional.objects.filter(submission_date__gte=sixty_days_ago).count()
-        last_90_days = Professional.objects.filter(submission_date__gte=ninety_days_ago).count()
-
-        # 4. Yearly Variation (Continuous Yearly)
-        # We will get the last 12 months for the trend
-        one_year_ago = now - timedelta(days=365)
-        monthly_volume = Professional.objects.filter(
-            submission_date__gte=one_year_ago
-        ).annotate(
-            month=TruncMonth('submission_date')
-        ).values('month').annotate(
-            count=Count('id')
-        ).order_by('month')
-
-        # 5. Efficiency (Analyzed this month)
-        # Count unique professionals whose status changed or was updated restricted to admin actions
-        from audit.models import AuditLog
-        analyzed_this_month = AuditLog.objects.filter(
-            timestamp__year=now.year,
-            timestamp__month=now.month,
-            action__in=['STATUS_CHANGE', 'UPDATE']
-        ).values('target_id').distinct().count()
-
-        # 6. Average Analysis Time (for those finalized)
-        # We calculate diff between submission and approval/rejection
-        from django.db.models.functions import Coalesce
-        
-        avg_time_data = Professional.objects.filter(
-            status__in=['APPROVED', 'REJECTED']
-        ).annotate(
-            end_date=Coalesce('approved_at', 'rejected_at')
-        ).aggregate(
-            avg_time=Avg(F('end_date') - F('submission_date'))
-        )
-        
-        avg_time_seconds = avg_time_data['avg_time'].total_seconds() if avg_time_data['avg_time'] else 0
-        avg_time_days = round(avg_time_seconds / 86400, 1)
 
-        return Response({
-            'total_registrations': total_count,
-            'last_30_days': last_30_days,
-            'last_60_days': last_60_days,
-            'last_90_days': last_90_days,
-            'status_counts': status_counts,
-            'yearly_variation': monthly_volume,
-            'analyzed_this_month': analyzed_this_month,
-            'avg_analysis_time_days': avg_time_days,
-        })
+class DashboardViewSet(viewsets.GenericViewSet):
+    permission_classes = [permissions.IsAdminUser]
+
+    def list(self, request):
+        # Cached for DASHBOARD_CACHE_TTL seconds; professional/status-change writes invalidate it
+        return Response(cached_dashboard_payload())
 
 class DocumentViewSet(viewsets.ModelViewSet):
     queryset = Document.objects.all()
@@ -323,17 +301,134 @@ class DocumentViewSet(viewsets.ModelViewSet):
     parser_classes = [parsers.MultiPartParser, parsers.FormParser]
     permission_classes = [permissions.IsAdminUser] # Default to Admin only
 
-    def get_permissions(self):
+    def initialize_request(self, request, *args, **kwargs):
+        request = super().initialize_request(request, *args, **kwargs)
         if self.action == 'create':
+            # Checks size and type and hashes the file before Django buffers it
+            self.upload_handler = DocumentUploadHandler(request)
+            request.upload_handlers.insert(0, self.upload_handler)
+        return request
+
+    def perform_create(self, serializer):
+        upload = serializer.validated_data['file']
+        received = self.upload_handler.received.get('file')
+        if received:
+            # Recorded by Document.save() instead of reading the file again
+            upload.size, upload.sha256, upload.content_type = received
+        serializer.save()
+
+    def get_permissions(self):
+        if self.action in ['create', 'presign', 'finalize']:
             return [permissions.AllowAny()] # Allow anon upload during registration
         return [permissions.IsAdminUser()]
 
+    @action(detail=False, methods=['post'], parser_classes=[parsers.JSONParser, parsers.FormParser])
+    def presign(self, request):
+        """Presigned S3 POST form so the browser uploads the file straight to the bucket."""
+        serializer = DocumentPresignSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        professional = serializer.validated_data['professional']
+        filename = serializer.validated_data['filename']
+        try:
+            storage = document_storage()
+        except DirectUploadUnavailable:
+            return Response(
+                {"error": "Envio direto indisponível. Envie o arquivo por /api/documents/."},
+                status=status.HTTP_501_NOT_IMPLEMENTED
+            )
+
+        key = document_key(professional, filename)
+        content_type = content_type_for(filename)
+        post = presigned_post(key, content_type, storage=storage)
+        return Response({
+            "key": key,
+            "url": post['url'],
+            "fields": post['fields'],
+            "content_type": content_type,
+            "expires_in": settings.DOCUMENT_PRESIGN_EXPIRES_SECONDS,
+        })
+
+    @action(detail=False, methods=['post'], parser_classes=[parsers.JSONParser, parsers.FormParser])
+    def finalize(self, request):
+        """Creates the Document for a presigned upload once the object is in the bucket."""
+        serializer = DocumentFinalizeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        try:
+            storage = document_storage()
+        except DirectUploadUnavailable:
+            return Response(
+                {"error": "Envio direto indisponível. Envie o arquivo por /api/documents/."},
+                status=status.HTTP_501_NOT_IMPLEMENTED
+            )
+        uploaded = uploaded_object(data['key'], storage=storage)
+        if uploaded is None:
+            return Response({"key": ["Arquivo não encontrado. Envie o arquivo antes de finalizar."]}, status=status.HTTP_400_BAD_REQUEST)
+        if Document.objects.filter(file=data['key']).exists():
+            return Response({"key": ["Este arquivo já foi registrado."]}, status=status.HTTP_400_BAD_REQUEST)
+
+        size, _ = uploaded
+        # The bucket only enforced the presigned policy: check size and magic bytes like the multipart path
+        error = None
+        if size > DOCUMENT_MAX_SIZE:
+            error = FILE_TOO_LARGE
+        elif sniff_content_type(uploaded_object_head(data['key'], storage=storage)) != content_type_for(data['key']):
+            error = FILE_CONTENT_MISMATCH
+        if error:
+            delete_uploaded_object(data['key'], storage=storage)
+            logger.warning(
+                "Directly uploaded document rejected",
+                extra={"event": "document_finalize_rejected", "size": size, "reason": error}
+            )
+            return Response({"key": [error]}, status=status.HTTP_400_BAD_REQUEST)
+
+        document = Document(
+            professional=data['professional'],
+            description=data['description'],
+            size=size,
+            content_type=content_type_for(data['key']),
+        )
+        if settings.DOCUMENT_STORAGE_LAYOUT == 'content_addressed':
+            # The upload is copied (server-side) into its blob, or dropped when the blob already exists
+            from .blobs import acquire_blob
+            document.sha256 = uploaded_object_sha256(data['key'], storage=storage)
+            with transaction.atomic():
+                document.blob = acquire_blob(
+                    None, document.sha256, size, document.content_type, stored_name=data['key']
+                )
+                document.file.name = document.blob.file.name
+                document.save()
+            delete_uploaded_object(data['key'], storage=storage)
+        else:
+            # The name is already in the bucket: the FieldFile is committed and save() does not re-upload it
+            document.file.name = data['key']
+            document.save()
+        logger.info(
+            "Document uploaded directly to storage",
+            extra={"event": "document_finalized", "document_id": str(document.id), "size": size}
+        )
+        return Response(
+            DocumentSerializer(document, context=self.get_serializer_context()).data,
+            status=status.HTTP_201_CREATED
+        )
+
     @action(detail=True, methods=['get'], permission_classes=[permissions.IsAdminUser])
     def download(self, request, pk=None):
         document = self.get_object()
+        variant = request.query_params.get('variant', 'original')
+        if variant not in ('original',) + VARIANTS:
+            return Response(
+                {"error": "Variante inválida. Use original, preview ou thumbnail."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         if not document.file:
             return Response({"error": "File not found"}, status=status.HTTP_404_NOT_FOUND)
-            
+
+        # PDFs and images still waiting for process_document_variants get the original
+        if variant != 'original' and not getattr(document, variant):
+            variant = 'original'
+        file = document.file if variant == 'original' else getattr(document, variant)
+
         # Return URL JSON. Frontend handles the redirection/download.
         # This keeps headers and auth logic clean.
-        return Response({"url": document.file.url})
+        return Response({"url": file.url, "variant": variant})
@@ -66,7 +66,7 @@ export const Dashboard: React.FC = () => {
         try {
             const [metricsRes, listRes] = await Promise.all([
                 api.get('/api/admin/dashboard/'),
-                api.get('/api/professionals/')
+                api.get('/api/professionals/', { params: { page_size: 5, fields: 'id,name,cpf,submission_date,status' } })
             ]);
             setMetrics(metricsRes.data);
             setProfessionals(listRes.data.results || listRes.data);
@@ -32,6 +32,7 @@ import {
     CheckCircle,
     XCircle,
     AlertTriangle,
+    Eye,
     Image as ImageIcon
 } from 'lucide-react';
 import api from '../../../services/api';
@@ -50,6 +51,7 @@ interface Document {
     description: string;
     uploaded_at: string;
     file_size?: number;
+    variants_status?: 'PENDING' | 'PROCESSING' | 'DONE' | 'SKIPPED' | 'FAILED';
     download_url?: string;
 }
 
@@ -422,6 +424,24 @@ const ProfessionalDetail: React.FC = () => {
                                                     {formatFileSize(doc.file_size)}
                                                 </Typography>
                                             </Box>
+                                            {doc.variants_status === 'DONE' && (
+                                                <IconButton
+                                                    size="small"
+                                                    title="Visualizar"
+                                                    onClick={async () => {
+                                                        // Downscaled copy instead of the full-size photo
+                                                        try {
+                                                            const response = await api.get(`/api/documents/${doc.id}/download/`, { params: { variant: 'preview' } });
+                                                            window.open(response.data.url, '_blank', 'noopener,noreferrer');
+                                                        } catch (error) {
+                                                            console.error("Erro ao visualizar documento", error);
+                                                            alert("Erro ao visualizar documento.");
+                                                        }
+                                                    }}
+                                                >
+                                                    <Eye size={18} />
+                                                </IconButton>
+                                            )}
                                             <IconButton
                                                 size="small"
                                                 onClick={async () => {
@@ -33,6 +33,8 @@ interface Professional {
 const ProfessionalsList: React.FC = () => {
     const [professionals, setProfessionals] = useState<Professional[]>([]);
     const [loading, setLoading] = useState(true);
+    const [nextPage, setNextPage] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [search, setSearch] = useState('');
     const [statusFilter, setStatusFilter] = useState('');
     const navigate = useNavigate();
@@ -46,6 +48,7 @@ const ProfessionalsList: React.FC = () => {
 
             const response = await api.get('/api/professionals/', { params });
             setProfessionals(response.data.results || response.data);
+            setNextPage(response.data.next || null);
         } catch (error) {
             console.error('Error fetching professionals:', error);
         } finally {
@@ -53,6 +56,21 @@ const ProfessionalsList: React.FC = () => {
         }
     };
 
+    const loadMore = async () => {
+        if (!nextPage) return;
+        setLoadingMore(true);
+        try {
+            // Cursor links already carry the current filters
+            const response = await api.get(nextPage);
+            setProfessionals((current) => [...current, ...response.data.results]);
+            setNextPage(response.data.next || null);
+        } catch (error) {
+            console.error('Error fetching professionals:', error);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     useEffect(() => {
         const timer = setTimeout(() => {
             fetchProfessionals();
@@ -199,6 +217,13 @@ const ProfessionalsList: React.FC = () => {
                         </TableBody>
                     </Table>
                 </TableContainer>
+                {!loading && nextPage && (
+                    <Box sx={{ display: 'flex', justifyContent: 'center', p: 2 }}>
+                        <Button variant="outlined" onClick={loadMore} disabled={loadingMore}>
+                            {loadingMore ? <CircularProgress size={20} /> : 'Carregar mais'}
+                        </Button>
+                    </Box>
+                )}
             </Paper>
         </Container>
     );
@@ -210,7 +210,7 @@ export const Register: React.FC = () => {
             const response = await publicApi.post('/api/professionals/', payload);
             const professionalId = response.data.id;
 
-            const fileUploads = files.map(file => {
+            const uploadThroughApi = (file: File) => {
                 const formData = new FormData();
                 formData.append('file', file);
                 formData.append('professional', professionalId);
@@ -218,7 +218,34 @@ export const Register: React.FC = () => {
                 return publicApi.post('/api/documents/', formData, {
                     headers: { 'Content-Type': 'multipart/form-data' }
                 });
-            });
+            };
+
+            // Straight to S3 with a presigned form; the API only records the key.
+            // Falls back to the multipart upload when storage is not S3 (501).
+            const uploadDirect = async (file: File) => {
+                let presigned;
+                try {
+                    presigned = await publicApi.post('/api/documents/presign/', {
+                        professional: professionalId,
+                        filename: file.name,
+                        size: file.size,
+                    });
+                } catch (presignError: any) {
+                    if (presignError.response?.status === 501) return uploadThroughApi(file);
+                    throw presignError;
+                }
+                const form = new FormData();
+                Object.entries(presigned.data.fields).forEach(([key, value]) => form.append(key, value as string));
+                form.append('file', file);
+                await axios.post(presigned.data.url, form);
+                return publicApi.post('/api/documents/finalize/', {
+                    professional: professionalId,
+                    key: presigned.data.key,
+                    description: 'Documento de Habilitação',
+                });
+            };
+
+            const fileUploads = files.map(uploadDirect);
 
             await Promise.all(fileUploads);
 